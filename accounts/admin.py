@@ -1,6 +1,10 @@
+from datetime import timedelta
+from django.conf import settings
 from django.contrib import admin
+from django.db.models import Q
 from django.contrib.auth.admin import UserAdmin
-from .models import User, Profile
+from django.utils import timezone
+from .models import User, Profile, OutboundEmail
 
 
 @admin.register(User)
@@ -23,3 +27,28 @@ class ProfileAdmin(admin.ModelAdmin):
     list_filter = ('created_at',)
     search_fields = ('user__email', 'first_name', 'last_name')
     ordering = ('-created_at',)
+
+
+@admin.register(OutboundEmail)
+class OutboundEmailAdmin(admin.ModelAdmin):
+    """Outbound email queue admin"""
+    list_display = ('subject', 'recipients', 'status', 'attempts', 'next_attempt_at', 'sent_at')
+    list_filter = ('status',)
+    search_fields = ('subject', 'to')
+    ordering = ('-created_at',)
+    readonly_fields = ('attempts', 'last_error', 'created_at', 'claimed_at', 'sent_at')
+    actions = ['retry_now']
+
+    @admin.display(description='To')
+    def recipients(self, obj):
+        return ', '.join(obj.to)
+
+    @admin.action(description='Retry selected emails now')
+    def retry_now(self, request, queryset):
+        # A message being sent is only retried once its claim is stale, or it would go out twice
+        stale = timezone.now() - timedelta(seconds=settings.EMAIL_OUTBOX_STALE_AFTER)
+        updated = queryset.filter(
+            Q(status__in=[OutboundEmail.STATUS_PENDING, OutboundEmail.STATUS_FAILED])
+            | Q(status=OutboundEmail.STATUS_SENDING, claimed_at__lt=stale)
+        ).update(status=OutboundEmail.STATUS_PENDING, next_attempt_at=timezone.now(), claimed_at=None)
+        self.message_user(request, f'{updated} email(s) queued for delivery.')
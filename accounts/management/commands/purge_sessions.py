@@ -0,0 +1,45 @@
+import time
+from importlib import import_module
+from django.conf import settings
+from django.contrib.sessions.backends.db import SessionStore as DBStore
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from django.utils import timezone
+
+
+class Command(BaseCommand):
+    help = (
+        'Delete expired sessions in bounded batches. Like clearsessions, but never holds the '
+        'write lock for more than one batch; run it periodically, e.g. hourly from cron.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch', type=int, default=1000, help='Sessions deleted per transaction')
+        parser.add_argument('--max-batches', type=int, default=0, help='Stop after this many batches (0: until done)')
+        parser.add_argument('--pause', type=float, default=0.1, help='Seconds to sleep between batches')
+
+    def handle(self, *args, **options):
+        store = import_module(settings.SESSION_ENGINE).SessionStore
+        if not issubclass(store, DBStore):
+            # Cookie sessions have nothing to purge; cache sessions expire on their own
+            store.clear_expired()
+            self.stdout.write(f'{settings.SESSION_ENGINE} keeps no session table; nothing to purge')
+            return
+
+        model = store.get_model_class()
+        now = timezone.now()
+        deleted = batches = 0
+        while not options['max_batches'] or batches < options['max_batches']:
+            close_old_connections()
+            keys = list(
+                model.objects.filter(expire_date__lt=now)
+                .values_list('session_key', flat=True)[:options['batch']]
+            )
+            if not keys:
+                break
+            deleted += model.objects.filter(session_key__in=keys).delete()[0]
+            batches += 1
+            if len(keys) < options['batch']:
+                break
+            time.sleep(options['pause'])
+        self.stdout.write(f'Deleted {deleted} expired sessions in {batches} batches')
@@ -0,0 +1,30 @@
+import time
+from datetime import timedelta
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from accounts.outbox import claim_emails, requeue_stale_emails, send_batch
+
+
+class Command(BaseCommand):
+    help = 'Deliver queued outbound emails, one backend connection per batch'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch', type=int, default=50, help='Messages sent per connection')
+        parser.add_argument('--poll-interval', type=float, default=5.0, help='Seconds to sleep when the outbox is empty')
+        parser.add_argument('--stale-after', type=int, default=settings.EMAIL_OUTBOX_STALE_AFTER,
+                            help='Requeue sending messages older than this many seconds')
+        parser.add_argument('--once', action='store_true', help='Drain the due messages once and exit')
+
+    def handle(self, *args, **options):
+        requeue_stale_emails(timedelta(seconds=options['stale_after']))
+        while True:
+            close_old_connections()
+            emails = claim_emails(options['batch'])
+            if not emails:
+                if options['once']:
+                    break
+                time.sleep(options['poll_interval'])
+                continue
+            sent = send_batch(emails)
+            self.stdout.write(f'Sent {sent}/{len(emails)} emails')
@@ -0,0 +1,105 @@
+"""
+DB-backed outbound email queue.
+
+Views call queue_email() and return immediately; the send_emails management command
+claims due messages and delivers each batch over a single backend connection, retrying
+failures with exponential backoff. Delivery goes through get_connection(), so any
+EMAIL_BACKEND works, including the locmem backend used by tests.
+"""
+from datetime import timedelta
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.utils import timezone
+from .models import OutboundEmail
+
+
+def queue_email(subject, body, to, from_email=None):
+    """Persist a message to the outbox; it is sent by the next send_emails run"""
+    return OutboundEmail.objects.create(
+        subject=subject,
+        body=body,
+        from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+        to=list(to),
+    )
+
+
+def retry_delay(attempts):
+    """Backoff before the next attempt: doubles per failure, capped at EMAIL_OUTBOX_MAX_DELAY"""
+    delay = settings.EMAIL_OUTBOX_RETRY_DELAY * 2 ** max(attempts - 1, 0)
+    return timedelta(seconds=min(delay, settings.EMAIL_OUTBOX_MAX_DELAY))
+
+
+def claim_emails(limit):
+    """Atomically move up to `limit` due messages to sending and return them"""
+    claimed = []
+    candidates = OutboundEmail.objects.filter(
+        status=OutboundEmail.STATUS_PENDING, next_attempt_at__lte=timezone.now(),
+    ).order_by('next_attempt_at').values_list('pk', flat=True)[:limit]
+    for pk in list(candidates):
+        # The conditional update only succeeds for one sender, so no message goes out twice
+        updated = OutboundEmail.objects.filter(pk=pk, status=OutboundEmail.STATUS_PENDING).update(
+            status=OutboundEmail.STATUS_SENDING, claimed_at=timezone.now(),
+        )
+        if updated:
+            claimed.append(pk)
+    return list(OutboundEmail.objects.filter(pk__in=claimed))
+
+
+def mark_sent(email):
+    email.status = OutboundEmail.STATUS_SENT
+    email.attempts += 1
+    email.last_error = ''
+    email.sent_at = timezone.now()
+    email.save(update_fields=['status', 'attempts', 'last_error', 'sent_at'])
+
+
+def mark_failed(email, error):
+    """Schedule a retry, or give up once EMAIL_OUTBOX_MAX_ATTEMPTS is reached"""
+    email.attempts += 1
+    email.last_error = error
+    if email.attempts >= settings.EMAIL_OUTBOX_MAX_ATTEMPTS:
+        email.status = OutboundEmail.STATUS_FAILED
+    else:
+        email.status = OutboundEmail.STATUS_PENDING
+        email.next_attempt_at = timezone.now() + retry_delay(email.attempts)
+    email.save(update_fields=['status', 'attempts', 'last_error', 'next_attempt_at'])
+
+
+def send_batch(emails, connection=None):
+    """
+    Deliver `emails` over one backend connection.
+
+    Returns the number of messages sent. A message the backend rejects is rescheduled on
+    its own; if the connection cannot be opened at all, the whole batch is rescheduled.
+    """
+    connection = connection or get_connection(fail_silently=False)
+    try:
+        connection.open()
+    except Exception as exc:
+        for email in emails:
+            mark_failed(email, f'Could not connect: {exc}')
+        return 0
+
+    sent = 0
+    try:
+        for email in emails:
+            message = EmailMessage(
+                email.subject, email.body, email.from_email, email.to, connection=connection,
+            )
+            try:
+                message.send()
+            except Exception as exc:
+                mark_failed(email, str(exc))
+            else:
+                mark_sent(email)
+                sent += 1
+    finally:
+        connection.close()
+    return sent
+
+
+def requeue_stale_emails(older_than):
+    """Put messages left in sending by a crashed sender back on the queue"""
+    return OutboundEmail.objects.filter(
+        status=OutboundEmail.STATUS_SENDING, claimed_at__lt=timezone.now() - older_than,
+    ).update(status=OutboundEmail.STATUS_PENDING, claimed_at=None)
@@ -2,12 +2,11 @@ from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth import login, logout, authenticate
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.core.mail import send_mail
-from django.conf import settings
 from django.urls import reverse
 from django.http import HttpRequest
 from .models import User, Profile
 from .forms import UserRegistrationForm, UserLoginForm, ProfileForm
+from .outbox import queue_email
 import uuid
 
 
@@ -107,7 +106,7 @@ def resend_verification(request):
 
 
 def send_verification_email(request, user):
-    """Send email verification email"""
+    """Queue the email verification email; delivered by the send_emails command"""
     verification_url = request.build_absolute_uri(
         reverse('accounts:verify_email', kwargs={'token': user.email_verification_token})
     )
@@ -127,13 +126,4 @@ def send_verification_email(request, user):
     RojgarPatra Team
     """
     
-    try:
-        send_mail(
-            subject,
-            message,
-            settings.DEFAULT_FROM_EMAIL,
-            [user.email],
-            fail_silently=False,
-        )
-    except Exception:
-        messages.warning(request, 'Verification email could not be sent. Please check email settings.')
+    queue_email(subject, message, [user.email])
@@ -4,3 +4,12 @@ from django.apps import AppConfig
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
+
+    def ready(self):
+        from django.conf import settings
+        from django.db.backends.signals import connection_created
+        from .db import configure_sqlite
+        from .metrics import install_query_timer
+        connection_created.connect(configure_sqlite, dispatch_uid='configure_sqlite')
+        if settings.METRICS_ENABLED:
+            connection_created.connect(install_query_timer, dispatch_uid='metrics_query_timer')
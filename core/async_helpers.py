@@ -0,0 +1,54 @@
+"""
+Helpers for async views.
+
+Django 4.2's auth decorators and shortcuts are synchronous, and resolving the lazy
+request.user from inside the event loop raises SynchronousOnlyOperation. These helpers
+load the user (and with it the session) in a worker thread once per request, after which
+views, templates and middleware can read both without touching the database.
+"""
+from functools import wraps
+from asgiref.sync import sync_to_async
+from django.contrib.auth.views import redirect_to_login
+from django.http import Http404
+
+
+async def aget_user(request):
+    """Resolve request.user off the event loop and return it"""
+    await sync_to_async(lambda: request.user.is_authenticated)()
+    return request.user
+
+
+def async_login_required(view):
+    """login_required for `async def` views"""
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        user = await aget_user(request)
+        if not user.is_authenticated:
+            return redirect_to_login(request.get_full_path())
+        return await view(request, *args, **kwargs)
+    return wrapper
+
+
+async def aiterate(iterator):
+    """
+    Async iterator over a blocking one, advanced an item at a time off the event loop.
+
+    Under ASGI, Django buffers a StreamingHttpResponse over a sync iterator in full before
+    sending anything. Wrapping it keeps the response streaming; each step runs in the
+    request's sync thread, so database cursors opened by a sync view keep working.
+    """
+    iterator = iter(iterator)
+    done = object()
+    try:
+        while (item := await sync_to_async(next)(iterator, done)) is not done:
+            yield item
+    finally:
+        if hasattr(iterator, 'close'):
+            await sync_to_async(iterator.close)()
+
+
+async def aget_object_or_404(queryset, **kwargs):
+    try:
+        return await queryset.aget(**kwargs)
+    except queryset.model.DoesNotExist:
+        raise Http404(f'No {queryset.model._meta.object_name} matches the given query.')
@@ -0,0 +1,375 @@
+"""
+Benchmark suite for the rendering and CRUD hot paths.
+
+Scenarios drive the real views through django.test.Client against synthetic users and
+resumes with realistic section sizes, and report latency percentiles, query counts and
+peak memory. Run it with `python manage.py benchmark`; results can be written as JSON
+and compared across commits.
+"""
+import datetime
+import gc
+import itertools
+import platform
+import statistics
+import subprocess
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+import django
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connection, connections
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from accounts.models import User
+from resumes.models import (
+    Resume, Education, WorkExperience, ExtracurricularActivity, Certification, Project,
+)
+from resumes.skills import sync_project_technologies, sync_resume_skills
+
+# Rows per section for a "realistic" resume
+SECTION_SIZES = {
+    'education': 3,
+    'work_experience': 5,
+    'extracurricular_activities': 2,
+    'certifications': 3,
+    'projects': 4,
+}
+DASHBOARD_SIZES = (1, 50, 500)
+
+
+@dataclass
+class Result:
+    name: str
+    iterations: int
+    mean_ms: float
+    p50_ms: float
+    p90_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+    queries: int
+    peak_memory_kb: float
+    extra: dict = field(default_factory=dict)
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+# Synthetic data
+
+def make_user(label):
+    return User.objects.create_user(username=f'bench-{label}', email=f'bench-{label}@example.com', password=None)
+
+
+def make_resumes(user, count, sections=True):
+    """Create `count` resumes for a user, with SECTION_SIZES rows each, using bulk inserts"""
+    resumes = Resume.objects.bulk_create([
+        Resume(
+            user=user, title=f'Resume {n}', full_name='Bench Mark', email='bench@example.com',
+            phone='9800000000', address='Kathmandu, Nepal',
+            skills='Python, Django, PostgreSQL, Docker, React, TypeScript, AWS',
+        )
+        for n in range(count)
+    ])
+    sync_resume_skills(*resumes)
+    if not sections:
+        return resumes
+    start = datetime.date(2015, 1, 1)
+    education, work, activities, certs, projects = [], [], [], [], []
+    for resume in resumes:
+        for i in range(SECTION_SIZES['education']):
+            education.append(Education(
+                resume=resume, institution=f'University {i}', degree='Bachelor of Science',
+                field_of_study='Computer Science', start_date=start, end_date=start, grade='3.8', order=i,
+            ))
+        for i in range(SECTION_SIZES['work_experience']):
+            work.append(WorkExperience(
+                resume=resume, company=f'Company {i}', position='Software Engineer', location='Remote',
+                start_date=start, end_date=start, order=i,
+                description='Designed and shipped features\nMentored engineers\nImproved latency by 40%',
+            ))
+        for i in range(SECTION_SIZES['extracurricular_activities']):
+            activities.append(ExtracurricularActivity(
+                resume=resume, title=f'Activity {i}', organization='Club', start_date=start,
+                description='Organised events', order=i,
+            ))
+        for i in range(SECTION_SIZES['certifications']):
+            certs.append(Certification(
+                resume=resume, title=f'Certification {i}', issuer='Issuer', issue_date=start,
+                credential_id=f'ID-{i}', order=i,
+            ))
+        for i in range(SECTION_SIZES['projects']):
+            projects.append(Project(
+                resume=resume, name=f'Project {i}', role='Lead', start_date=start,
+                description='Built a thing', technologies='Python, Django', order=i,
+            ))
+    for model, rows in (
+        (Education, education), (WorkExperience, work), (ExtracurricularActivity, activities),
+        (Certification, certs), (Project, projects),
+    ):
+        model.objects.bulk_create(rows)
+    sync_project_technologies(*projects)
+    return resumes
+
+
+def _date(value):
+    return value.isoformat() if value else ''
+
+
+SECTION_FIELDS = {
+    'education': ('institution', 'degree', 'field_of_study', 'start_date', 'end_date', 'is_current', 'grade', 'description'),
+    'work_experience': ('company', 'position', 'location', 'start_date', 'end_date', 'is_current', 'description'),
+    'extracurricular_activities': ('title', 'organization', 'start_date', 'end_date', 'is_current', 'description'),
+    'certifications': ('title', 'issuer', 'issue_date', 'expiration_date', 'credential_id', 'credential_url', 'description'),
+    'projects': ('name', 'role', 'link', 'start_date', 'end_date', 'description', 'technologies'),
+}
+
+
+def resume_post_data(resume, include_ids=True):
+    """Build the POST body create_edit.html would submit for a resume and all its formsets"""
+    data = {
+        'title': resume.title, 'full_name': resume.full_name, 'email': resume.email,
+        'phone': resume.phone, 'address': resume.address, 'linkedin_url': resume.linkedin_url,
+        'github_url': resume.github_url, 'portfolio_url': resume.portfolio_url, 'skills': resume.skills,
+    }
+    for prefix, fields in SECTION_FIELDS.items():
+        rows = list(getattr(resume, prefix).all())
+        data[f'{prefix}-TOTAL_FORMS'] = str(len(rows))
+        data[f'{prefix}-INITIAL_FORMS'] = str(len(rows)) if include_ids else '0'
+        data[f'{prefix}-MIN_NUM_FORMS'] = '0'
+        data[f'{prefix}-MAX_NUM_FORMS'] = '1000'
+        for i, row in enumerate(rows):
+            if include_ids:
+                data[f'{prefix}-{i}-id'] = str(row.pk)
+                data[f'{prefix}-{i}-resume'] = str(resume.pk)
+            for name in fields:
+                value = getattr(row, name)
+                if isinstance(value, bool):
+                    if value:
+                        data[f'{prefix}-{i}-{name}'] = 'on'
+                    continue
+                if isinstance(value, datetime.date):
+                    value = _date(value)
+                data[f'{prefix}-{i}-{name}'] = value or ''
+    return data
+
+
+# Runner
+
+class Suite:
+    def __init__(self, iterations=30, stdout=None):
+        self.iterations = iterations
+        self.stdout = stdout
+        self.results = []
+
+    def log(self, message):
+        if self.stdout is not None:
+            self.stdout.write(message)
+
+    def measure(self, name, request, iterations=None, before=None, extra=None, expected_status=200):
+        """
+        Time `request` (a callable returning a response) over N iterations.
+
+        `before` runs ahead of each iteration outside the timed region, e.g. to clear a cache.
+        Latency runs without tracemalloc; one extra traced run records peak memory.
+        """
+        iterations = iterations or self.iterations
+        timings, query_counts = [], []
+        if before:
+            before()
+        request()  # warm-up
+        for _ in range(iterations):
+            if before:
+                before()
+            with CaptureQueriesContext(connection) as ctx:
+                start = time.perf_counter()
+                response = request()
+                if getattr(response, 'streaming', False):
+                    b''.join(response.streaming_content)
+                timings.append((time.perf_counter() - start) * 1000)
+            if response.status_code != expected_status:
+                raise RuntimeError(f'{name}: expected HTTP {expected_status}, got {response.status_code}')
+            query_counts.append(len(ctx.captured_queries))
+
+        if before:
+            before()
+        gc.collect()
+        tracemalloc.start()
+        request()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        timings.sort()
+        result = Result(
+            name=name, iterations=iterations,
+            mean_ms=round(statistics.mean(timings), 3),
+            p50_ms=round(percentile(timings, 50), 3), p90_ms=round(percentile(timings, 90), 3),
+            p95_ms=round(percentile(timings, 95), 3), p99_ms=round(percentile(timings, 99), 3),
+            max_ms=round(timings[-1], 3), queries=int(statistics.median(query_counts)),
+            peak_memory_kb=round(peak / 1024, 1), extra=extra or {},
+        )
+        self.results.append(result)
+        self.log(
+            f'{name:<36} p50 {result.p50_ms:>9.2f}ms  p95 {result.p95_ms:>9.2f}ms  '
+            f'queries {result.queries:>4}  peak {result.peak_memory_kb:>9.1f}KB'
+        )
+        return result
+
+    def measure_concurrent(self, name, make_request, threads, iterations=None):
+        """
+        Run `iterations` requests in each of `threads` threads at once.
+
+        `make_request(n)` is called once per thread, before timing starts, and returns that
+        thread's request callable. Reports per-request latency, overall throughput and the
+        number of failed requests (e.g. "database is locked").
+        """
+        iterations = iterations or self.iterations
+        requests = [make_request(n) for n in range(threads)]
+        barrier = threading.Barrier(threads)
+
+        def worker(request):
+            timings, errors = [], 0
+            try:
+                barrier.wait()
+                for _ in range(iterations):
+                    start = time.perf_counter()
+                    try:
+                        ok = request().status_code < 400
+                    except Exception:
+                        ok = False
+                    timings.append((time.perf_counter() - start) * 1000)
+                    errors += not ok
+            finally:
+                connections.close_all()
+            return timings, errors
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            outcomes = list(pool.map(worker, requests))
+        elapsed = time.perf_counter() - started
+
+        timings = sorted(t for thread_timings, _ in outcomes for t in thread_timings)
+        errors = sum(thread_errors for _, thread_errors in outcomes)
+        result = Result(
+            name=name, iterations=len(timings),
+            mean_ms=round(statistics.mean(timings), 3),
+            p50_ms=round(percentile(timings, 50), 3), p90_ms=round(percentile(timings, 90), 3),
+            p95_ms=round(percentile(timings, 95), 3), p99_ms=round(percentile(timings, 99), 3),
+            max_ms=round(timings[-1], 3), queries=0, peak_memory_kb=0.0,
+            extra={'threads': threads, 'throughput_rps': round(len(timings) / elapsed, 1), 'errors': errors},
+        )
+        self.results.append(result)
+        self.log(
+            f'{name:<36} p50 {result.p50_ms:>9.2f}ms  p95 {result.p95_ms:>9.2f}ms  '
+            f'{result.extra["throughput_rps"]:>7.1f} req/s  errors {errors}'
+        )
+        return result
+
+    def run(self, only=None):
+        scenarios = [
+            ('resume_detail', self.bench_resume_views),
+            ('crud', self.bench_crud),
+            ('dashboard', self.bench_dashboard),
+            ('concurrent_edit', self.bench_concurrent_edit),
+        ]
+        for key, scenario in scenarios:
+            if only and key not in only:
+                continue
+            scenario()
+        return self.results
+
+    def bench_resume_views(self):
+        user = make_user('views')
+        resume = make_resumes(user, 1)[0]
+        client = Client()
+        client.force_login(user)
+        pdf_cache = caches[settings.PDF_CACHE_ALIAS]
+        self.measure('resumes:detail', lambda: client.get(reverse('resumes:detail', args=[resume.pk])))
+        self.measure('resumes:preview', lambda: client.get(reverse('resumes:preview', args=[resume.pk])))
+        url = reverse('resumes:download_pdf', args=[resume.pk])
+        self.measure('resumes:download_pdf (uncached)', lambda: client.get(url), before=pdf_cache.clear)
+        self.measure('resumes:download_pdf (cached)', lambda: client.get(url))
+
+    def bench_crud(self):
+        user = make_user('crud')
+        template = make_resumes(user, 1)[0]
+        client = Client()
+        client.force_login(user)
+        create_data = resume_post_data(template, include_ids=False)
+        rows = sum(SECTION_SIZES.values())
+        self.measure(
+            'resumes:create POST', lambda: client.post(reverse('resumes:create'), create_data),
+            extra={'section_rows': rows}, expected_status=302,
+        )
+        edit_data = resume_post_data(template)
+        self.measure(
+            'resumes:edit POST', lambda: client.post(reverse('resumes:edit', args=[template.pk]), edit_data),
+            extra={'section_rows': rows}, expected_status=302,
+        )
+        self.measure(
+            'resumes:clone POST', lambda: client.post(reverse('resumes:clone', args=[template.pk])),
+            extra={'section_rows': rows}, expected_status=302,
+        )
+
+    def bench_dashboard(self):
+        for size in DASHBOARD_SIZES:
+            user = make_user(f'dashboard-{size}')
+            make_resumes(user, size, sections=False)
+            client = Client()
+            client.force_login(user)
+            self.measure(
+                f'core:dashboard ({size} resumes)', lambda: client.get(reverse('core:dashboard')),
+                extra={'resumes': size},
+            )
+
+    def bench_concurrent_edit(self, threads=8):
+        """Several users saving their own resume at the same time (write lock contention)"""
+        if connection.vendor == 'sqlite' and connection.is_in_memory_db():
+            self.log('concurrent_edit: skipped, needs a file-backed SQLite test database')
+            return
+
+        def make_request(n):
+            user = make_user(f'concurrent-{n}')
+            resume = make_resumes(user, 1)[0]
+            client = Client()
+            client.force_login(user)
+            url = reverse('resumes:edit', args=[resume.pk])
+            payloads = []
+            for variant in ('A', 'B'):
+                data = resume_post_data(resume)
+                data['title'] = f'Resume {variant}'
+                data['work_experience-0-company'] = f'Company {variant}'
+                payloads.append(data)
+            counter = itertools.count()
+            return lambda: client.post(url, payloads[next(counter) % 2])
+
+        self.measure_concurrent(f'resumes:edit POST x{threads} threads', make_request, threads)
+
+
+def environment():
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, cwd=settings.BASE_DIR,
+        ).stdout.strip()
+    except OSError:
+        commit = ''
+    return {
+        'commit': commit,
+        'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'database': connection.vendor,
+        'debug': settings.DEBUG,
+    }
+
+
+def report(results):
+    return {'environment': environment(), 'results': [asdict(result) for result in results]}
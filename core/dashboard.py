@@ -0,0 +1,85 @@
+"""
+Data layer for the dashboard's resume list.
+
+Resumes are listed newest first with keyset pagination on (updated_at, id), so a page
+costs the same however deep the user goes. Only the columns the dashboard shows are
+loaded (never the address or skills text), and the row counts of the sections the list
+shows come from correlated subqueries in the same SELECT.
+"""
+from dataclasses import dataclass
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from resumes.models import Resume, Education, WorkExperience, Certification, Project
+from resumes.pagination import after_cursor, decode_cursor, encode_cursor
+
+PAGE_SIZE = 24
+LIST_FIELDS = ('id', 'title', 'full_name', 'created_at', 'updated_at')
+SECTION_COUNTS = {
+    'education_count': Education,
+    'work_count': WorkExperience,
+    'certification_count': Certification,
+    'project_count': Project,
+}
+
+
+@dataclass
+class DashboardPage:
+    resumes: list
+    total: int
+    next_cursor: str | None
+    is_first_page: bool
+
+
+def _section_count(model):
+    counts = (
+        model.objects.filter(resume=OuterRef('pk'))
+        .order_by()
+        .values('resume')
+        .annotate(n=Count('pk'))
+        .values('n')
+    )
+    return Coalesce(Subquery(counts, output_field=IntegerField()), Value(0))
+
+
+def dashboard_resumes(user):
+    return (
+        Resume.objects.filter(user=user)
+        .only(*LIST_FIELDS)
+        .annotate(**{name: _section_count(model) for name, model in SECTION_COUNTS.items()})
+        .order_by('-updated_at', '-id')
+    )
+
+
+def _page_queryset(user, cursor):
+    queryset = dashboard_resumes(user)
+    position = decode_cursor(cursor) if cursor else None
+    if position is not None:
+        queryset = after_cursor(queryset, position)
+    return queryset, position
+
+
+def _build_page(resumes, total, position, page_size):
+    # One extra row tells us whether there is a next page without a second query
+    next_cursor = None
+    if len(resumes) > page_size:
+        resumes = resumes[:page_size]
+        next_cursor = encode_cursor(resumes[-1])
+
+    return DashboardPage(
+        resumes=resumes,
+        total=total,
+        next_cursor=next_cursor,
+        is_first_page=position is None,
+    )
+
+
+def get_dashboard_page(user, cursor=None, page_size=PAGE_SIZE):
+    queryset, position = _page_queryset(user, cursor)
+    resumes = list(queryset[:page_size + 1])
+    return _build_page(resumes, user.resumes.count(), position, page_size)
+
+
+async def aget_dashboard_page(user, cursor=None, page_size=PAGE_SIZE):
+    queryset, position = _page_queryset(user, cursor)
+    resumes = [resume async for resume in queryset[:page_size + 1]]
+    return _build_page(resumes, await user.resumes.acount(), position, page_size)
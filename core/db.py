@@ -0,0 +1,20 @@
+"""
+Per-connection database tuning.
+
+SQLite defaults to a rollback journal and fails a writer immediately when another holds
+the lock, so concurrent edits error out. Each new SQLite connection is switched to WAL
+(readers no longer block the writer), waits up to SQLITE_BUSY_TIMEOUT for the write lock,
+and uses synchronous=NORMAL, which is durable against application crashes in WAL mode and
+skips an fsync per commit.
+"""
+from django.conf import settings
+
+
+def configure_sqlite(sender, connection, **kwargs):
+    """connection_created receiver"""
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute('PRAGMA journal_mode=WAL')
+        cursor.execute(f'PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT)}')
+        cursor.execute('PRAGMA synchronous=NORMAL')
@@ -0,0 +1,91 @@
+"""
+Concurrent HTTP load test for the read paths.
+
+Unlike core.benchmarks, which calls views in-process one request at a time, this drives a
+running server (e.g. `uvicorn rojgarpatra.asgi:application`) over real sockets with many
+requests in flight, so it shows how the server and the sync or async views behave under
+concurrency. Run it with `python manage.py loadtest`.
+"""
+import http.client
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from urllib.parse import urlsplit
+from django.conf import settings
+from django.test import Client
+from django.urls import reverse
+from .benchmarks import make_resumes, make_user, percentile
+
+SCENARIOS = ('dashboard', 'detail', 'preview', 'download_pdf', 'home', 'privacy_policy')
+# Requested without the session cookie
+ANONYMOUS_SCENARIOS = {'home', 'privacy_policy'}
+
+
+@dataclass
+class LoadResult:
+    name: str
+    requests: int
+    errors: int
+    seconds: float
+    throughput: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+
+
+def prepare(label='loadtest', resumes=24):
+    """
+    Create a user with `resumes` resumes in the configured database and log it in.
+
+    Returns (user, scenario paths, session cookie header).
+    """
+    user = make_user(label)
+    resume = make_resumes(user, resumes)[0]
+    client = Client()
+    client.force_login(user)
+    cookie = f'{settings.SESSION_COOKIE_NAME}={client.cookies[settings.SESSION_COOKIE_NAME].value}'
+    paths = {
+        'dashboard': reverse('core:dashboard'),
+        'detail': reverse('resumes:detail', args=[resume.pk]),
+        'preview': reverse('resumes:preview', args=[resume.pk]),
+        'download_pdf': reverse('resumes:download_pdf', args=[resume.pk]),
+        'home': reverse('core:home'),
+        'privacy_policy': reverse('core:privacy_policy'),
+    }
+    return user, paths, cookie
+
+
+def run(base_url, name, path, cookie, total, concurrency):
+    """Send `total` GETs for `path` from `concurrency` keep-alive connections (anonymously without `cookie`)"""
+    parts = urlsplit(base_url)
+    local = threading.local()
+    headers = {'Cookie': cookie} if cookie else {}
+
+    def fetch(_):
+        if not hasattr(local, 'conn'):
+            local.conn = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=60)
+        start = time.perf_counter()
+        try:
+            local.conn.request('GET', path, headers=headers)
+            response = local.conn.getresponse()
+            response.read()
+            ok = response.status == 200
+        except (OSError, http.client.HTTPException):
+            local.conn.close()
+            del local.conn
+            ok = False
+        return (time.perf_counter() - start) * 1000, ok
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        outcomes = list(pool.map(fetch, range(total)))
+    elapsed = time.perf_counter() - started
+
+    timings = sorted(ms for ms, _ in outcomes)
+    return LoadResult(
+        name=name, requests=total, errors=sum(1 for _, ok in outcomes if not ok),
+        seconds=round(elapsed, 3), throughput=round(total / elapsed, 1),
+        p50_ms=round(percentile(timings, 50), 2), p95_ms=round(percentile(timings, 95), 2),
+        p99_ms=round(percentile(timings, 99), 2),
+    )
@@ -0,0 +1,43 @@
+import json
+import os
+import tempfile
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+from core.benchmarks import Suite, report
+
+
+class Command(BaseCommand):
+    help = 'Benchmark resume rendering, CRUD, dashboard and concurrent edit views against a throwaway test database'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=30, help='Timed requests per scenario')
+        parser.add_argument(
+            '--only', action='append', choices=['resume_detail', 'crud', 'dashboard', 'concurrent_edit'],
+            help='Run only the given scenario group (repeatable)',
+        )
+        parser.add_argument('--json', dest='json_path', help='Write results as JSON to this path ("-" for stdout)')
+        parser.add_argument('--keepdb', action='store_true', help='Reuse the test database between runs')
+
+    def handle(self, *args, **options):
+        if connection.vendor == 'sqlite' and not connection.settings_dict['TEST']['NAME']:
+            # A file rather than the default in-memory test database, so locking, WAL and
+            # concurrent writers behave as they do in production
+            connection.settings_dict['TEST']['NAME'] = os.path.join(tempfile.gettempdir(), 'rojgarpatra-benchmark.sqlite3')
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, keepdb=options['keepdb'])
+        try:
+            suite = Suite(iterations=options['iterations'], stdout=self.stderr if options['json_path'] == '-' else self.stdout)
+            results = suite.run(only=options['only'])
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=options['keepdb'])
+            teardown_test_environment()
+
+        if options['json_path']:
+            payload = json.dumps(report(results), indent=2)
+            if options['json_path'] == '-':
+                self.stdout.write(payload)
+            else:
+                with open(options['json_path'], 'w') as fh:
+                    fh.write(payload + '\n')
+                self.stdout.write(f"Wrote {options['json_path']}")
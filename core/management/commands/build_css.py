@@ -0,0 +1,50 @@
+from pathlib import Path
+from django.apps import apps
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.template.utils import get_app_template_dirs
+from core.tailwind import build
+
+
+class Command(BaseCommand):
+    help = 'Generate static/css/app.css from the utility classes used in the templates, scripts and forms'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output', default=str(settings.BASE_DIR / 'static' / 'css' / 'app.css'),
+            help='Stylesheet to write (default: static/css/app.css)',
+        )
+        parser.add_argument(
+            '--check', action='store_true',
+            help='Exit with an error if the stylesheet is out of date instead of writing it',
+        )
+
+    def source_files(self):
+        template_dirs = [Path(d) for engine in settings.TEMPLATES for d in engine.get('DIRS', [])]
+        # Only this project's apps; django.contrib templates are styled by their own CSS
+        template_dirs += [
+            Path(d) for d in get_app_template_dirs('templates') if Path(settings.BASE_DIR) in Path(d).parents
+        ]
+        for directory in template_dirs:
+            yield from sorted(directory.rglob('*.html'))
+        for directory in settings.STATICFILES_DIRS:
+            yield from sorted(Path(directory).rglob('*.js'))
+        # Widget attrs in the project's form classes
+        for app in apps.get_app_configs():
+            forms = Path(app.path) / 'forms.py'
+            if Path(settings.BASE_DIR) in forms.parents and forms.exists():
+                yield forms
+
+    def handle(self, *args, **options):
+        css, unknown = build(self.source_files())
+        for name in unknown:
+            self.stderr.write(self.style.WARNING(f'Unsupported utility class: {name}'))
+
+        output = Path(options['output'])
+        if options['check']:
+            if not output.exists() or output.read_text(encoding='utf-8') != css:
+                raise CommandError(f'{output} is out of date; run `manage.py build_css`.')
+            self.stdout.write(f'{output} is up to date')
+            return
+        output.write_text(css, encoding='utf-8')
+        self.stdout.write(self.style.SUCCESS(f'Wrote {output} ({len(css.encode()):,} bytes)'))
@@ -0,0 +1,44 @@
+import json
+from dataclasses import asdict
+from django.core.management.base import BaseCommand
+from core.benchmarks import environment
+from core.loadtest import ANONYMOUS_SCENARIOS, SCENARIOS, prepare, run
+
+
+class Command(BaseCommand):
+    help = 'Load test the resume, dashboard and marketing page read paths against a running server'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default='http://127.0.0.1:8000', help='Base URL of the running server')
+        parser.add_argument('--concurrency', type=int, default=20, help='Requests in flight')
+        parser.add_argument('--requests', type=int, default=500, help='Requests per scenario')
+        parser.add_argument('--only', action='append', choices=SCENARIOS, help='Run only the given scenario (repeatable)')
+        parser.add_argument('--label', default='', help='Free-form label stored in the JSON report, e.g. "async"')
+        parser.add_argument('--json', dest='json_path', help='Write results as JSON to this path')
+
+    def handle(self, *args, **options):
+        # The server reads the same database, so the test user is created there and removed afterwards
+        user, paths, cookie = prepare()
+        results = []
+        try:
+            for name in options['only'] or SCENARIOS:
+                session = None if name in ANONYMOUS_SCENARIOS else cookie
+                result = run(options['url'], name, paths[name], session, options['requests'], options['concurrency'])
+                results.append(result)
+                self.stdout.write(
+                    f'{name:<14} {result.throughput:>8.1f} req/s  p50 {result.p50_ms:>8.2f}ms  '
+                    f'p95 {result.p95_ms:>8.2f}ms  p99 {result.p99_ms:>8.2f}ms  errors {result.errors}'
+                )
+        finally:
+            user.delete()
+
+        if options['json_path']:
+            payload = {
+                'environment': environment(),
+                'label': options['label'],
+                'concurrency': options['concurrency'],
+                'results': [asdict(result) for result in results],
+            }
+            with open(options['json_path'], 'w') as fh:
+                fh.write(json.dumps(payload, indent=2) + '\n')
+            self.stdout.write(f"Wrote {options['json_path']}")
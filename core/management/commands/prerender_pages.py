@@ -0,0 +1,27 @@
+import gzip
+from pathlib import Path
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.urls import reverse
+from core.pages import PAGES, render_page
+
+
+class Command(BaseCommand):
+    help = 'Render the marketing pages for anonymous visitors to static HTML files'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output', default=str(settings.PRERENDER_ROOT),
+            help='Directory to write to (default: PRERENDER_ROOT)',
+        )
+
+    def handle(self, *args, **options):
+        root = Path(options['output'])
+        for name in PAGES:
+            # /privacy-policy/ -> <root>/privacy-policy/index.html
+            target = root / reverse(f'core:{name}').strip('/') / 'index.html'
+            target.parent.mkdir(parents=True, exist_ok=True)
+            content = render_page(name).content
+            target.write_bytes(content)
+            target.with_name('index.html.gz').write_bytes(gzip.compress(content, compresslevel=9, mtime=0))
+            self.stdout.write(f'{name:<18} {target} ({len(content):,} bytes)')
@@ -0,0 +1,186 @@
+"""
+In-process request metrics.
+
+MetricsMiddleware opens a RequestMetrics record for each sampled request. While the record
+is current, database queries (through an execute wrapper on every connection), template
+renders (through InstrumentedDjangoTemplates) and the two halves of PDF generation (through
+timed() in resumes.utils) add to it. When the response is ready the record goes into
+per-view histograms, which the admin-only /metrics/ endpoint exposes in Prometheus text
+format. Each process keeps its own histograms, so scrape every worker.
+"""
+import random
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from django.conf import settings
+from django.template import TemplateDoesNotExist
+from django.template.backends.django import DjangoTemplates, Template, reraise
+
+SECONDS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+# name: (help text, buckets, RequestMetrics attribute)
+METRICS = {
+    'request_duration_seconds': ('Wall time spent in the view and middleware', SECONDS_BUCKETS, 'duration'),
+    'db_queries': ('Database queries per request', COUNT_BUCKETS, 'queries'),
+    'db_query_duration_seconds': ('Time spent in database queries per request', SECONDS_BUCKETS, 'query_seconds'),
+    'template_render_seconds': ('Time spent rendering templates per request', SECONDS_BUCKETS, 'template'),
+    'pdf_html_render_seconds': ('Time spent rendering the PDF template to HTML', SECONDS_BUCKETS, 'pdf_html'),
+    'pdf_convert_seconds': ('Time spent converting HTML to PDF with xhtml2pdf', SECONDS_BUCKETS, 'pdf_convert'),
+}
+# Only observed on requests that actually did this work
+OPTIONAL_METRICS = {'template_render_seconds', 'pdf_html_render_seconds', 'pdf_convert_seconds'}
+
+
+@dataclass
+class RequestMetrics:
+    started: float = field(default_factory=time.perf_counter)
+    duration: float = 0.0
+    queries: int = 0
+    query_seconds: float = 0.0
+    template: float = 0.0
+    pdf_html: float = 0.0
+    pdf_convert: float = 0.0
+    # Nested renders ({% include %}, the PDF template inside a view) are only timed once
+    template_depth: int = 0
+
+
+_current = ContextVar('request_metrics', default=None)
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+
+class Registry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms = {}
+
+    def observe(self, view, record):
+        with self._lock:
+            for name, (_, buckets, attr) in METRICS.items():
+                value = getattr(record, attr)
+                if name in OPTIONAL_METRICS and not value:
+                    continue
+                key = (name, view)
+                histogram = self._histograms.get(key)
+                if histogram is None:
+                    histogram = self._histograms[key] = Histogram(buckets)
+                histogram.observe(value)
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+
+    def render(self, prefix='rojgarpatra_'):
+        """Prometheus text exposition format (version 0.0.4)"""
+        with self._lock:
+            snapshot = {key: (list(h.counts), h.sum, h.buckets) for key, h in self._histograms.items()}
+        lines = []
+        for name, (help_text, _, _) in METRICS.items():
+            metric = prefix + name
+            lines.append(f'# HELP {metric} {help_text}')
+            lines.append(f'# TYPE {metric} histogram')
+            for (hist_name, view), (counts, total, buckets) in sorted(snapshot.items()):
+                if hist_name != name:
+                    continue
+                label = view.replace('\\', '\\\\').replace('"', '\\"')
+                cumulative = 0
+                for bound, count in zip((*buckets, '+Inf'), counts):
+                    cumulative += count
+                    lines.append(f'{metric}_bucket{{view="{label}",le="{bound}"}} {cumulative}')
+                lines.append(f'{metric}_sum{{view="{label}"}} {total:.6f}')
+                lines.append(f'{metric}_count{{view="{label}"}} {cumulative}')
+        return '\n'.join(lines) + '\n'
+
+
+registry = Registry()
+
+
+def start_request():
+    """Open a record for the current request, or return None when it is not sampled"""
+    if random.random() >= settings.METRICS_SAMPLE_RATE:
+        return None
+    record = RequestMetrics()
+    return record, _current.set(record)
+
+
+def finish_request(started, request):
+    if started is None:
+        return
+    record, token = started
+    _current.reset(token)
+    record.duration = time.perf_counter() - record.started
+    match = getattr(request, 'resolver_match', None)
+    registry.observe(match.view_name if match else '<unresolved>', record)
+
+
+@contextmanager
+def timed(attr):
+    """Add the block's wall time to `attr` of the current request's record, if any"""
+    record = _current.get()
+    if record is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        setattr(record, attr, getattr(record, attr) + time.perf_counter() - start)
+
+
+def query_timer(execute, sql, params, many, context):
+    """Database execute wrapper counting and timing queries for the current request"""
+    record = _current.get()
+    if record is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        record.queries += 1
+        record.query_seconds += time.perf_counter() - start
+
+
+def install_query_timer(sender, connection, **kwargs):
+    """connection_created receiver: wrap every new database connection once"""
+    if query_timer not in connection.execute_wrappers:
+        connection.execute_wrappers.append(query_timer)
+
+
+class TimedTemplate(Template):
+    def render(self, context=None, request=None):
+        record = _current.get()
+        if record is None or record.template_depth:
+            return super().render(context, request)
+        record.template_depth += 1
+        start = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            record.template_depth -= 1
+            record.template += time.perf_counter() - start
+
+
+class InstrumentedDjangoTemplates(DjangoTemplates):
+    """The Django template backend, with render time added to the request's metrics"""
+
+    def from_string(self, template_code):
+        return TimedTemplate(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        try:
+            return TimedTemplate(self.engine.get_template(template_name), self)
+        except TemplateDoesNotExist as exc:
+            reraise(exc, self)
@@ -0,0 +1,39 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from . import metrics
+
+
+class MetricsMiddleware:
+    """
+    Record per-view wall time, query and render metrics (see core.metrics).
+
+    Place it first in MIDDLEWARE so the timing covers the rest of the stack. Streaming
+    responses are timed up to the point the response is returned, not until the last chunk.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.METRICS_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        started = metrics.start_request()
+        try:
+            return self.get_response(request)
+        finally:
+            metrics.finish_request(started, request)
+
+    async def __acall__(self, request):
+        started = metrics.start_request()
+        try:
+            return await self.get_response(request)
+        finally:
+            metrics.finish_request(started, request)
@@ -0,0 +1,96 @@
+"""
+Cached marketing pages.
+
+The home, privacy policy and terms pages are the same for every anonymous visitor, so
+they are rendered once per process and language and kept in the 'pages' cache. Anonymous
+GETs are answered from there with an ETag and Last-Modified, and revalidations get a 304.
+Signed-in visitors, and anyone with a flash message waiting, still get a fresh render.
+
+`manage.py prerender_pages` writes the same renderings to PRERENDER_ROOT so the web server
+can send them to anonymous visitors without calling Django at all (see the README).
+"""
+import hashlib
+import time
+from dataclasses import dataclass
+from functools import wraps
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.contrib.messages import get_messages
+from django.core.cache import caches
+from django.http import HttpRequest, HttpResponse
+from django.template.loader import render_to_string
+from django.urls import reverse
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+from django.utils.translation import get_language
+
+# URL name in the core namespace: template
+PAGES = {
+    'home': 'core/home.html',
+    'privacy_policy': 'core/privacy_policy.html',
+    'terms_conditions': 'core/terms_conditions.html',
+}
+
+
+@dataclass(frozen=True)
+class RenderedPage:
+    content: bytes
+    etag: str
+    last_modified: int
+
+
+def page_cache():
+    return caches[settings.PAGE_CACHE_ALIAS]
+
+
+def anonymous_request(path):
+    """A bare GET for `path` from a visitor who is not signed in"""
+    request = HttpRequest()
+    request.method = 'GET'
+    request.path = request.path_info = path
+    request.user = AnonymousUser()
+    return request
+
+
+def render_page(name):
+    """Render a marketing page as an anonymous visitor sees it"""
+    request = anonymous_request(reverse(f'core:{name}'))
+    content = render_to_string(PAGES[name], request=request).encode()
+    etag = quote_etag(hashlib.sha256(content).hexdigest()[:32])
+    return RenderedPage(content, etag, int(time.time()))
+
+
+def get_page(name):
+    key = f'page:{name}:{get_language()}'
+    cache = page_cache()
+    page = cache.get(key)
+    if page is None:
+        page = render_page(name)
+        cache.set(key, page)
+    return page
+
+
+def is_anonymous_visit(request):
+    # len() loads pending messages without marking them as read
+    return not request.user.is_authenticated and not len(get_messages(request))
+
+
+def cached_page(name):
+    """Serve anonymous GETs of a marketing page view from the page cache"""
+    def decorator(view):
+        @wraps(view)
+        def inner(request, *args, **kwargs):
+            if settings.DEBUG or request.method not in ('GET', 'HEAD') or not is_anonymous_visit(request):
+                return view(request, *args, **kwargs)
+            page = get_page(name)
+            response = get_conditional_response(request, etag=page.etag, last_modified=page.last_modified)
+            if response is None:
+                response = HttpResponse(page.content)
+            response.headers['ETag'] = page.etag
+            response.headers['Last-Modified'] = http_date(page.last_modified)
+            patch_cache_control(response, public=True, max_age=settings.PAGE_MAX_AGE)
+            # Signed-in visitors see a different navigation bar
+            patch_vary_headers(response, ['Cookie'])
+            return response
+        return inner
+    return decorator
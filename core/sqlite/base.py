@@ -0,0 +1,15 @@
+"""
+SQLite backend that opens transactions with BEGIN IMMEDIATE.
+
+Django 4.2 starts atomic blocks with a plain (deferred) BEGIN. Under concurrent writers a
+deferred transaction that reads first and then writes can fail straight away with
+"database is locked", because SQLite cannot upgrade a stale read snapshot, and
+busy_timeout does not help. Taking the write lock up front makes writers queue on
+busy_timeout instead. This is what Django 5.1's "transaction_mode": "IMMEDIATE" option does.
+"""
+from django.db.backends.sqlite3 import base
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    def _start_transaction_under_autocommit(self):
+        self.cursor().execute('BEGIN IMMEDIATE')
@@ -0,0 +1,160 @@
+"""
+Static file storage and serving.
+
+collectstatic copies every file to a content-hashed name (main.3f2a9c1e.css) through
+ManifestStaticFilesStorage, so a file's URL changes whenever its content does and browsers
+can cache it for good. Text files are also written precompressed next to the hashed copy
+(.gz always, .br when the optional `brotli` package is installed) for the web server to
+send as-is, e.g. nginx's gzip_static / brotli_static.
+
+Deployments without a web server in front can set SERVE_STATIC to have serve_static hand
+out STATIC_ROOT with the same precompressed variants and far-future cache headers.
+"""
+import gzip
+import mimetypes
+import os
+import posixpath
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage, staticfiles_storage
+from django.http import FileResponse, Http404, HttpResponseNotModified
+from django.utils._os import safe_join
+from django.utils.cache import patch_vary_headers
+from django.utils.http import http_date
+from django.views.static import was_modified_since
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_EXTENSIONS = ('.css', '.js', '.svg', '.json', '.map', '.txt', '.html', '.xml')
+# Below this size the compressed copy saves less than a network packet
+MIN_COMPRESS_SIZE = 512
+
+# (Accept-Encoding token, file suffix), preferred first when q-values tie
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """ManifestStaticFilesStorage that also writes .gz and .br copies of hashed text files"""
+
+    def post_process(self, paths, dry_run=False, **options):
+        hashed = {}
+        for name, hashed_name, processed in super().post_process(paths, dry_run, **options):
+            if hashed_name and not isinstance(processed, Exception):
+                hashed[name] = hashed_name
+            yield name, hashed_name, processed
+        if not dry_run:
+            for hashed_name in hashed.values():
+                self.compress(hashed_name)
+
+    def compress(self, name):
+        if not name.endswith(COMPRESSIBLE_EXTENSIONS):
+            return
+        path = self.path(name)
+        with open(path, 'rb') as f:
+            content = f.read()
+        if len(content) < MIN_COMPRESS_SIZE:
+            return
+        variants = {'.gz': gzip.compress(content, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            variants['.br'] = brotli.compress(content, quality=11)
+        for suffix, compressed in variants.items():
+            if len(compressed) < len(content):
+                with open(path + suffix, 'wb') as f:
+                    f.write(compressed)
+
+    def stored_name(self, name):
+        # Before the first collectstatic (development, the test runner) there is no manifest
+        # at all; link the plain file names instead of failing every {% static %}
+        if not self.hashed_files:
+            return name
+        return super().stored_name(name)
+
+
+# (manifest, set of its hashed names), rebuilt when the storage loads another manifest
+_hashed_names = (None, frozenset())
+
+
+def is_hashed(name):
+    """Whether `name` is a content-hashed copy written by collectstatic"""
+    global _hashed_names
+    storage = staticfiles_storage
+    if not isinstance(storage, ManifestStaticFilesStorage):
+        return False
+    manifest, names = _hashed_names
+    if manifest is not storage.hashed_files:
+        names = frozenset(storage.hashed_files.values())
+        _hashed_names = (storage.hashed_files, names)
+    return name in names
+
+
+def accepted_encodings(header):
+    """Map each content coding of an Accept-Encoding header to its q-value"""
+    qualities = {}
+    for item in header.split(','):
+        token, *params = item.split(';')
+        token = token.strip().lower()
+        if not token:
+            continue
+        quality = 1.0
+        for param in params:
+            key, _, value = param.strip().partition('=')
+            if key.lower() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[token] = quality
+    return qualities
+
+
+def pick_encoding(header, fullpath):
+    """The best precompressed variant of `fullpath` the client accepts, as (token, suffix)"""
+    qualities = accepted_encodings(header)
+    best, best_quality = (None, ''), 0.0
+    for token, suffix in ENCODINGS:
+        # Unlisted codings take the q-value of "*" when there is one
+        quality = qualities.get(token, qualities.get('*', 0.0))
+        if quality > best_quality and os.path.isfile(fullpath + suffix):
+            best, best_quality = (token, suffix), quality
+    return best
+
+
+def serve_static(request, path):
+    """
+    Serve a file from STATIC_ROOT, precompressed when the client accepts it.
+
+    Hashed files never change, so they are cached for STATIC_MAX_AGE and marked immutable;
+    anything else is revalidated against its modification time.
+    """
+    name = posixpath.normpath(path).lstrip('/')
+    try:
+        fullpath = safe_join(settings.STATIC_ROOT, name)
+    except ValueError:
+        raise Http404
+    if not os.path.isfile(fullpath):
+        raise Http404
+
+    encoding, suffix = pick_encoding(request.headers.get('Accept-Encoding', ''), fullpath)
+    fullpath += suffix
+
+    stat = os.stat(fullpath)
+    hashed = is_hashed(name)
+    if not hashed and not was_modified_since(request.headers.get('If-Modified-Since'), stat.st_mtime):
+        return HttpResponseNotModified()
+
+    content_type = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+    response = FileResponse(open(fullpath, 'rb'), content_type=content_type)
+    del response['Content-Disposition']
+    response['Content-Length'] = stat.st_size
+    response['Last-Modified'] = http_date(stat.st_mtime)
+    if encoding:
+        response['Content-Encoding'] = encoding
+    if name.endswith(COMPRESSIBLE_EXTENSIONS):
+        patch_vary_headers(response, ['Accept-Encoding'])
+    if hashed:
+        response['Cache-Control'] = f'public, max-age={settings.STATIC_MAX_AGE}, immutable'
+    else:
+        response['Cache-Control'] = 'public, max-age=0, must-revalidate'
+    return response
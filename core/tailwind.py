@@ -0,0 +1,547 @@
+"""
+Build-free utility stylesheet.
+
+The templates are styled with Tailwind CSS class names. Rather than loading the Tailwind
+CDN script, which compiles CSS in the browser on every page view, `manage.py build_css`
+scans the templates, scripts and forms for class names and writes only the rules they use to
+static/css/app.css, following Tailwind v3's default theme (plus the site colors below).
+
+Only the utilities and variants this site uses are implemented. Class names that look like
+utilities but are not recognised are reported by the command so they can be added here.
+This is kept in-tree instead of pinning the Tailwind standalone CLI because that is a
+per-platform binary fetched at build time, which the deploy and CI machines (no Node, no
+outbound network) cannot do; the subset here is a few hundred lines of lookup tables, and
+`build_css --check` catches a stylesheet that has drifted from the templates.
+"""
+import re
+from pathlib import Path
+
+COLORS = {
+    'white': '#fff',
+    'black': '#000',
+    'transparent': 'transparent',
+    'current': 'currentColor',
+    # Site colors (formerly the inline tailwind.config)
+    'primary': '#4f46e5',
+    'secondary': '#6b7280',
+    'accent': '#10b981',
+}
+PALETTE = {
+    'gray': ('#f9fafb', '#f3f4f6', '#e5e7eb', '#d1d5db', '#9ca3af', '#6b7280', '#4b5563', '#374151', '#1f2937', '#111827'),
+    'red': ('#fef2f2', '#fee2e2', '#fecaca', '#fca5a5', '#f87171', '#ef4444', '#dc2626', '#b91c1c', '#991b1b', '#7f1d1d'),
+    'yellow': ('#fefce8', '#fef9c3', '#fef08a', '#fde047', '#facc15', '#eab308', '#ca8a04', '#a16207', '#854d0e', '#713f12'),
+    'green': ('#f0fdf4', '#dcfce7', '#bbf7d0', '#86efac', '#4ade80', '#22c55e', '#16a34a', '#15803d', '#166534', '#14532d'),
+    'blue': ('#eff6ff', '#dbeafe', '#bfdbfe', '#93c5fd', '#60a5fa', '#3b82f6', '#2563eb', '#1d4ed8', '#1e40af', '#1e3a8a'),
+    'indigo': ('#eef2ff', '#e0e7ff', '#c7d2fe', '#a5b4fc', '#818cf8', '#6366f1', '#4f46e5', '#4338ca', '#3730a3', '#312e81'),
+}
+for _name, _shades in PALETTE.items():
+    for _shade, _hex in zip((50, 100, 200, 300, 400, 500, 600, 700, 800, 900), _shades):
+        COLORS[f'{_name}-{_shade}'] = _hex
+
+SPACING = {'0': '0px', 'px': '1px'}
+for _n in (0.5, 1, 1.5, 2, 2.5, 3, 3.5, 4, 5, 6, 7, 8, 9, 10, 11, 12, 14, 16, 20, 24, 28, 32, 36, 40, 44, 48, 52, 56, 60, 64, 72, 80, 96):
+    SPACING[f'{_n:g}'] = f'{_n / 4:g}rem'
+
+SCREENS = {'sm': '640px', 'md': '768px', 'lg': '1024px', 'xl': '1280px', '2xl': '1536px'}
+PSEUDO_VARIANTS = {
+    'first': ':first-child', 'last': ':last-child', 'hover': ':hover', 'focus-within': ':focus-within',
+    'focus': ':focus', 'focus-visible': ':focus-visible', 'active': ':active', 'disabled': ':disabled',
+}
+
+FONT_SIZES = {
+    'xs': ('0.75rem', '1rem'), 'sm': ('0.875rem', '1.25rem'), 'base': ('1rem', '1.5rem'),
+    'lg': ('1.125rem', '1.75rem'), 'xl': ('1.25rem', '1.75rem'), '2xl': ('1.5rem', '2rem'),
+    '3xl': ('1.875rem', '2.25rem'), '4xl': ('2.25rem', '2.5rem'), '5xl': ('3rem', '1'), '6xl': ('3.75rem', '1'),
+}
+FONT_WEIGHTS = {
+    'thin': 100, 'extralight': 200, 'light': 300, 'normal': 400, 'medium': 500,
+    'semibold': 600, 'bold': 700, 'extrabold': 800, 'black': 900,
+}
+MAX_WIDTHS = {
+    'none': 'none', 'xs': '20rem', 'sm': '24rem', 'md': '28rem', 'lg': '32rem', 'xl': '36rem',
+    '2xl': '42rem', '3xl': '48rem', '4xl': '56rem', '5xl': '64rem', '6xl': '72rem', '7xl': '80rem',
+    'full': '100%', 'prose': '65ch',
+}
+RADII = {
+    'none': '0px', 'sm': '0.125rem', '': '0.25rem', 'md': '0.375rem', 'lg': '0.5rem',
+    'xl': '0.75rem', '2xl': '1rem', '3xl': '1.5rem', 'full': '9999px',
+}
+SHADOWS = {
+    'sm': '0 1px 2px 0 rgb(0 0 0 / 0.05)',
+    '': '0 1px 3px 0 rgb(0 0 0 / 0.1), 0 1px 2px -1px rgb(0 0 0 / 0.1)',
+    'md': '0 4px 6px -1px rgb(0 0 0 / 0.1), 0 2px 4px -2px rgb(0 0 0 / 0.1)',
+    'lg': '0 10px 15px -3px rgb(0 0 0 / 0.1), 0 4px 6px -4px rgb(0 0 0 / 0.1)',
+    'xl': '0 20px 25px -5px rgb(0 0 0 / 0.1), 0 8px 10px -6px rgb(0 0 0 / 0.1)',
+    'none': '0 0 #0000',
+}
+LEADING = {'none': '1', 'tight': '1.25', 'snug': '1.375', 'normal': '1.5', 'relaxed': '1.625', 'loose': '2'}
+TRACKING = {'tighter': '-0.05em', 'tight': '-0.025em', 'normal': '0em', 'wide': '0.025em', 'wider': '0.05em', 'widest': '0.1em'}
+GRADIENT_DIRECTIONS = {
+    't': 'top', 'tr': 'top right', 'r': 'right', 'br': 'bottom right',
+    'b': 'bottom', 'bl': 'bottom left', 'l': 'left', 'tl': 'top left',
+}
+TRANSITIONS = {
+    '': 'color, background-color, border-color, text-decoration-color, fill, stroke, opacity, box-shadow, transform, filter, backdrop-filter',
+    'colors': 'color, background-color, border-color, text-decoration-color, fill, stroke',
+    'opacity': 'opacity',
+    'shadow': 'box-shadow',
+    'transform': 'transform',
+}
+
+STATIC = {
+    'sr-only': 'position: absolute; width: 1px; height: 1px; padding: 0; margin: -1px; overflow: hidden; '
+               'clip: rect(0, 0, 0, 0); white-space: nowrap; border-width: 0',
+    'static': 'position: static', 'fixed': 'position: fixed', 'absolute': 'position: absolute',
+    'relative': 'position: relative', 'sticky': 'position: sticky',
+    'float-right': 'float: right', 'float-left': 'float: left', 'float-none': 'float: none',
+    'block': 'display: block', 'inline-block': 'display: inline-block', 'inline': 'display: inline',
+    'flex': 'display: flex', 'inline-flex': 'display: inline-flex', 'table': 'display: table',
+    'table-cell': 'display: table-cell', 'table-row': 'display: table-row', 'grid': 'display: grid',
+    'hidden': 'display: none',
+    'flex-1': 'flex: 1 1 0%', 'flex-auto': 'flex: 1 1 auto', 'flex-none': 'flex: none',
+    'flex-shrink-0': 'flex-shrink: 0', 'shrink-0': 'flex-shrink: 0', 'flex-grow': 'flex-grow: 1', 'grow': 'flex-grow: 1',
+    'border-collapse': 'border-collapse: collapse',
+    'cursor-pointer': 'cursor: pointer', 'cursor-not-allowed': 'cursor: not-allowed',
+    'list-inside': 'list-style-position: inside', 'list-disc': 'list-style-type: disc',
+    'list-decimal': 'list-style-type: decimal', 'list-none': 'list-style-type: none',
+    'flex-row': 'flex-direction: row', 'flex-col': 'flex-direction: column', 'flex-wrap': 'flex-wrap: wrap',
+    'items-start': 'align-items: flex-start', 'items-end': 'align-items: flex-end',
+    'items-center': 'align-items: center', 'items-baseline': 'align-items: baseline', 'items-stretch': 'align-items: stretch',
+    'justify-start': 'justify-content: flex-start', 'justify-end': 'justify-content: flex-end',
+    'justify-center': 'justify-content: center', 'justify-between': 'justify-content: space-between',
+    'justify-around': 'justify-content: space-around',
+    'self-auto': 'align-self: auto', 'self-start': 'align-self: flex-start', 'self-end': 'align-self: flex-end',
+    'self-center': 'align-self: center', 'self-stretch': 'align-self: stretch',
+    'overflow-hidden': 'overflow: hidden', 'overflow-auto': 'overflow: auto',
+    'overflow-x-auto': 'overflow-x: auto', 'overflow-y-auto': 'overflow-y: auto',
+    'truncate': 'overflow: hidden; text-overflow: ellipsis; white-space: nowrap',
+    'whitespace-nowrap': 'white-space: nowrap', 'whitespace-pre-line': 'white-space: pre-line',
+    'break-words': 'overflow-wrap: break-word', 'break-all': 'word-break: break-all',
+    'text-left': 'text-align: left', 'text-center': 'text-align: center', 'text-right': 'text-align: right',
+    'align-top': 'vertical-align: top', 'align-middle': 'vertical-align: middle',
+    'uppercase': 'text-transform: uppercase', 'lowercase': 'text-transform: lowercase',
+    'capitalize': 'text-transform: capitalize', 'italic': 'font-style: italic',
+    'underline': 'text-decoration-line: underline', 'no-underline': 'text-decoration-line: none',
+    'outline-none': 'outline: 2px solid transparent; outline-offset: 2px',
+}
+
+
+def _color(key):
+    return COLORS.get(key)
+
+
+def _spacing(key, negative=False, extra=()):
+    value = SPACING.get(key) or dict(extra).get(key)
+    if value is None:
+        return None
+    return f'-{value}' if negative and value not in ('0px', 'auto') else value
+
+
+def _fraction(key):
+    if re.fullmatch(r'\d+/\d+', key):
+        num, den = map(int, key.split('/'))
+        return f'{num / den * 100:g}%'
+    return None
+
+
+def _sides(prop, sides, value):
+    names = {
+        '': [prop], 'x': [f'{prop}-left', f'{prop}-right'], 'y': [f'{prop}-top', f'{prop}-bottom'],
+        't': [f'{prop}-top'], 'r': [f'{prop}-right'], 'b': [f'{prop}-bottom'], 'l': [f'{prop}-left'],
+    }[sides]
+    return '; '.join(f'{name}: {value}' for name in names)
+
+
+# Each rule: (pattern, handler). handler(match, negative) returns declarations, or a
+# (selector suffix, declarations) pair, or None when the value is not in the theme. Rules
+# are listed in Tailwind's output order, so later rules win over earlier ones as they do there.
+
+def _static(m, neg):
+    return None if neg else STATIC.get(m.group(0))
+
+
+def _inset(m, neg):
+    value = _spacing(m.group(2), neg, {'auto': 'auto', 'full': '100%'}) or _fraction(m.group(2))
+    if value is None:
+        return None
+    side = m.group(1)
+    props = {'inset': ['top', 'right', 'bottom', 'left'], 'inset-x': ['left', 'right'], 'inset-y': ['top', 'bottom']}
+    return '; '.join(f'{p}: {value}' for p in props.get(side, [side]))
+
+
+def _z(m, neg):
+    return f'z-index: {"-" if neg else ""}{m.group(1)}'
+
+
+def _col_span(m, neg):
+    return None if neg else f'grid-column: span {m.group(1)} / span {m.group(1)}'
+
+
+def _margin(m, neg):
+    value = _spacing(m.group(2), neg, {'auto': 'auto'})
+    return value and _sides('margin', m.group(1), value)
+
+
+def _size(prop, extra):
+    def handler(m, neg):
+        value = None if neg else (_spacing(m.group(1), extra=extra) or _fraction(m.group(1)))
+        return value and f'{prop}: {value}'
+    return handler
+
+
+def _max_width(m, neg):
+    value = None if neg else MAX_WIDTHS.get(m.group(1))
+    return value and f'max-width: {value}'
+
+
+def _grid_cols(m, neg):
+    return None if neg else f'grid-template-columns: repeat({m.group(1)}, minmax(0, 1fr))'
+
+
+def _gap(m, neg):
+    value = None if neg else _spacing(m.group(2))
+    prop = {'': 'gap', '-x': 'column-gap', '-y': 'row-gap'}[m.group(1)]
+    return value and f'{prop}: {value}'
+
+
+def _space(m, neg):
+    value = _spacing(m.group(2), neg)
+    if value is None:
+        return None
+    prop = 'margin-left' if m.group(1) == 'x' else 'margin-top'
+    return ' > :not([hidden]) ~ :not([hidden])', f'{prop}: {value}'
+
+
+def _divide_width(m, neg):
+    width = f'{m.group(2) or 1}px'
+    if neg:
+        return None
+    if m.group(1) == 'y':
+        return ' > :not([hidden]) ~ :not([hidden])', f'border-top-width: {width}; border-bottom-width: 0px'
+    return ' > :not([hidden]) ~ :not([hidden])', f'border-left-width: {width}; border-right-width: 0px'
+
+
+def _divide_color(m, neg):
+    color = _color(m.group(1))
+    return color and (' > :not([hidden]) ~ :not([hidden])', f'border-color: {color}')
+
+
+def _rounded(m, neg):
+    value = None if neg else RADII.get(m.group(1) or '')
+    return value and f'border-radius: {value}'
+
+
+def _border_width(m, neg):
+    if neg:
+        return None
+    width = f'{m.group(2) or 1}px'
+    sides = {'': [''], 't': ['-top'], 'r': ['-right'], 'b': ['-bottom'], 'l': ['-left'],
+             'x': ['-left', '-right'], 'y': ['-top', '-bottom']}[m.group(1) or '']
+    return '; '.join(f'border{side}-width: {width}' for side in sides)
+
+
+def _color_prop(prop):
+    def handler(m, neg):
+        color = None if neg else _color(m.group(1))
+        return color and f'{prop}: {color}'
+    return handler
+
+
+def _gradient(m, neg):
+    direction = GRADIENT_DIRECTIONS.get(m.group(1))
+    return direction and f'background-image: linear-gradient(to {direction}, var(--tw-gradient-stops))'
+
+
+def _gradient_from(m, neg):
+    color = _color(m.group(1))
+    return color and (
+        f'--tw-gradient-from: {color}; --tw-gradient-to: {_transparent(color)}; '
+        '--tw-gradient-stops: var(--tw-gradient-from), var(--tw-gradient-to)'
+    )
+
+
+def _gradient_via(m, neg):
+    color = _color(m.group(1))
+    return color and (
+        f'--tw-gradient-to: {_transparent(color)}; '
+        f'--tw-gradient-stops: var(--tw-gradient-from), {color}, var(--tw-gradient-to)'
+    )
+
+
+def _gradient_to(m, neg):
+    color = _color(m.group(1))
+    return color and f'--tw-gradient-to: {color}'
+
+
+def _transparent(color):
+    if not color.startswith('#'):
+        return 'transparent'
+    digits = color[1:] if len(color) == 7 else ''.join(c * 2 for c in color[1:])
+    r, g, b = (int(digits[i:i + 2], 16) for i in (0, 2, 4))
+    return f'rgb({r} {g} {b} / 0)'
+
+
+def _padding(m, neg):
+    value = None if neg else _spacing(m.group(2))
+    return value and _sides('padding', m.group(1), value)
+
+
+def _font_size(m, neg):
+    size = None if neg else FONT_SIZES.get(m.group(1))
+    return size and f'font-size: {size[0]}; line-height: {size[1]}'
+
+
+def _font_weight(m, neg):
+    weight = None if neg else FONT_WEIGHTS.get(m.group(1))
+    return weight and f'font-weight: {weight}'
+
+
+def _leading(m, neg):
+    key = m.group(1)
+    value = LEADING.get(key) or (f'{int(key) / 4:g}rem' if key.isdigit() else None)
+    return None if neg or value is None else f'line-height: {value}'
+
+
+def _tracking(m, neg):
+    value = TRACKING.get(m.group(1))
+    return None if neg or value is None else f'letter-spacing: {value}'
+
+
+def _opacity(m, neg):
+    return None if neg else f'opacity: {int(m.group(1)) / 100:g}'
+
+
+def _shadow(m, neg):
+    value = None if neg else SHADOWS.get(m.group(1) or '')
+    return value and (
+        f'--tw-shadow: {value}; '
+        'box-shadow: var(--tw-ring-offset-shadow, 0 0 #0000), var(--tw-ring-shadow, 0 0 #0000), var(--tw-shadow)'
+    )
+
+
+def _ring_width(m, neg):
+    if neg:
+        return None
+    width = m.group(1) or '3'
+    return (
+        '--tw-ring-offset-shadow: var(--tw-ring-inset) 0 0 0 var(--tw-ring-offset-width) var(--tw-ring-offset-color); '
+        f'--tw-ring-shadow: var(--tw-ring-inset) 0 0 0 calc({width}px + var(--tw-ring-offset-width)) var(--tw-ring-color); '
+        'box-shadow: var(--tw-ring-offset-shadow), var(--tw-ring-shadow), var(--tw-shadow, 0 0 #0000)'
+    )
+
+
+def _transition(m, neg):
+    props = None if neg else TRANSITIONS.get(m.group(1) or '')
+    return props and (
+        f'transition-property: {props}; '
+        'transition-timing-function: cubic-bezier(0.4, 0, 0.2, 1); transition-duration: 150ms'
+    )
+
+
+def _duration(m, neg):
+    return None if neg else f'transition-duration: {m.group(1)}ms'
+
+
+RULES = [
+    (r'sr-only', _static),
+    (r'static|fixed|absolute|relative|sticky', _static),
+    (r'(inset|inset-x|inset-y|top|right|bottom|left)-(.+)', _inset),
+    (r'z-(\d+)', _z),
+    (r'col-span-(\d+)', _col_span),
+    (r'float-(right|left|none)', _static),
+    (r'm()-(.+)', _margin),
+    (r'm([xy])-(.+)', _margin),
+    (r'm([trbl])-(.+)', _margin),
+    (r'block|inline-block|inline|flex|inline-flex|table|table-cell|table-row|grid|hidden', _static),
+    (r'h-(.+)', _size('height', {'auto': 'auto', 'full': '100%', 'screen': '100vh'})),
+    (r'min-h-(.+)', _size('min-height', {'full': '100%', 'screen': '100vh'})),
+    (r'w-(.+)', _size('width', {'auto': 'auto', 'full': '100%', 'screen': '100vw'})),
+    (r'min-w-(.+)', _size('min-width', {'full': '100%'})),
+    (r'max-w-(.+)', _max_width),
+    (r'flex-(1|auto|none)', _static),
+    (r'(flex-)?shrink-0', _static),
+    (r'(flex-)?grow', _static),
+    (r'border-collapse', _static),
+    (r'cursor-(pointer|not-allowed)', _static),
+    (r'list-(inside|disc|decimal|none)', _static),
+    (r'grid-cols-(\d+)', _grid_cols),
+    (r'flex-(row|col|wrap)', _static),
+    (r'items-(start|end|center|baseline|stretch)', _static),
+    (r'justify-(start|end|center|between|around)', _static),
+    (r'gap(|-x|-y)-(.+)', _gap),
+    (r'space-([xy])-(.+)', _space),
+    (r'divide-([xy])(?:-(\d+))?', _divide_width),
+    (r'divide-(.+)', _divide_color),
+    (r'self-(auto|start|end|center|stretch)', _static),
+    (r'overflow-(hidden|auto|x-auto|y-auto)', _static),
+    (r'truncate', _static),
+    (r'whitespace-(nowrap|pre-line)', _static),
+    (r'break-(words|all)', _static),
+    (r'rounded(?:-(.+))?', _rounded),
+    (r'border(?:-([trblxy]))?(?:-(\d+))?', _border_width),
+    (r'border-(.+)', _color_prop('border-color')),
+    (r'bg-(.+)', _color_prop('background-color')),
+    (r'bg-gradient-to-(.+)', _gradient),
+    (r'from-(.+)', _gradient_from),
+    (r'via-(.+)', _gradient_via),
+    (r'to-(.+)', _gradient_to),
+    (r'p()-(.+)', _padding),
+    (r'p([xy])-(.+)', _padding),
+    (r'p([trbl])-(.+)', _padding),
+    (r'text-(left|center|right)', _static),
+    (r'align-(top|middle)', _static),
+    (r'text-(.+)', _font_size),
+    (r'font-(.+)', _font_weight),
+    (r'uppercase|lowercase|capitalize|italic', _static),
+    (r'leading-(.+)', _leading),
+    (r'tracking-(.+)', _tracking),
+    (r'text-(.+)', _color_prop('color')),
+    (r'underline|no-underline', _static),
+    (r'opacity-(\d+)', _opacity),
+    (r'shadow(?:-(.+))?', _shadow),
+    (r'outline-none', _static),
+    (r'ring(?:-(\d+))?', _ring_width),
+    (r'ring-(.+)', _color_prop('--tw-ring-color')),
+    (r'transition(?:-(.+))?', _transition),
+    (r'duration-(\d+)', _duration),
+]
+_COMPILED = [(re.compile(pattern), handler) for pattern, handler in RULES]
+
+PREFLIGHT = """\
+*, ::before, ::after { box-sizing: border-box; border-width: 0; border-style: solid; border-color: #e5e7eb; }
+*, ::before, ::after { --tw-ring-inset: ; --tw-ring-offset-width: 0px; --tw-ring-offset-color: #fff; --tw-ring-color: rgb(59 130 246 / 0.5); --tw-ring-offset-shadow: 0 0 #0000; --tw-ring-shadow: 0 0 #0000; --tw-shadow: 0 0 #0000; }
+html { line-height: 1.5; -webkit-text-size-adjust: 100%; tab-size: 4; font-family: ui-sans-serif, system-ui, sans-serif, "Apple Color Emoji", "Segoe UI Emoji", "Segoe UI Symbol", "Noto Color Emoji"; }
+body { margin: 0; line-height: inherit; }
+hr { height: 0; color: inherit; border-top-width: 1px; }
+h1, h2, h3, h4, h5, h6 { font-size: inherit; font-weight: inherit; }
+a { color: inherit; text-decoration: inherit; }
+b, strong { font-weight: bolder; }
+code, kbd, samp, pre { font-family: ui-monospace, SFMono-Regular, Menlo, Monaco, Consolas, "Liberation Mono", "Courier New", monospace; font-size: 1em; }
+small { font-size: 80%; }
+table { text-indent: 0; border-color: inherit; border-collapse: collapse; }
+button, input, optgroup, select, textarea { font-family: inherit; font-size: 100%; font-weight: inherit; line-height: inherit; color: inherit; margin: 0; padding: 0; }
+button, select { text-transform: none; }
+button, [type='button'], [type='reset'], [type='submit'] { -webkit-appearance: button; background-color: transparent; background-image: none; }
+:-moz-focusring { outline: auto; }
+progress { vertical-align: baseline; }
+summary { display: list-item; }
+blockquote, dl, dd, h1, h2, h3, h4, h5, h6, hr, figure, p, pre { margin: 0; }
+fieldset { margin: 0; padding: 0; }
+legend { padding: 0; }
+ol, ul, menu { list-style: none; margin: 0; padding: 0; }
+textarea { resize: vertical; }
+input::placeholder, textarea::placeholder { opacity: 1; color: #9ca3af; }
+button, [role="button"] { cursor: pointer; }
+:disabled { cursor: default; }
+img, svg, video, canvas, audio, iframe, embed, object { display: block; vertical-align: middle; }
+img, video { max-width: 100%; height: auto; }
+[hidden] { display: none; }
+"""
+
+CONTAINER = '.container { width: 100%; }\n' + ''.join(
+    f'@media (min-width: {width}) {{ .container {{ max-width: {width}; }} }}\n' for width in SCREENS.values()
+)
+
+
+def escape(name):
+    return re.sub(r'([^\w-])', r'\\\1', name)
+
+
+def compile_class(name):
+    """
+    Compile one class name to (sort key, css), or None if it is not a known utility.
+    """
+    *variants, utility = name.split(':')
+    screen = 0
+    pseudo = []
+    for variant in variants:
+        if variant in SCREENS and not screen and not pseudo:
+            screen = list(SCREENS).index(variant) + 1
+        elif variant in PSEUDO_VARIANTS:
+            pseudo.append(variant)
+        else:
+            return None
+    negative = utility.startswith('-')
+    if negative:
+        utility = utility[1:]
+    for index, (pattern, handler) in enumerate(_COMPILED):
+        match = pattern.fullmatch(utility)
+        if not match:
+            continue
+        result = handler(match, negative)
+        if not result:
+            continue
+        suffix, declarations = result if isinstance(result, tuple) else ('', result)
+        selector = '.' + escape(name) + ''.join(PSEUDO_VARIANTS[v] for v in pseudo) + suffix
+        css = f'{selector} {{ {declarations}; }}'
+        if screen:
+            css = f'@media (min-width: {SCREENS[variants[0]]}) {{ {css} }}'
+        pseudo_rank = max((list(PSEUDO_VARIANTS).index(v) + 1 for v in pseudo), default=0)
+        return (screen, pseudo_rank, index, name), css
+    return None
+
+
+# Class names are only read from places that hold classes: class="..." attributes, widget
+# attrs {'class': '...'} in forms, className / classList in scripts, and safelist comments
+# ({# tw: ... #} in templates, /* tw: ... */ in scripts) for names put together at
+# runtime. Template tags and ${} interpolations inside a class list are dropped, keeping
+# the literal class names of every {% if %} branch.
+_TEMPLATE_TAG = re.compile(r'{%.*?%}|{{.*?}}', re.S)
+_INTERPOLATION = re.compile(r'\$\{.*?\}', re.S)
+_SAFELIST = re.compile(r'{#\s*tw:(.*?)#}|/\*\s*tw:(.*?)\*/', re.S)
+_CLASS_ATTRIBUTE = re.compile(r'\bclass\s*=\s*(["\'])(.*?)\1', re.S)
+_WIDGET_CLASS = re.compile(r'["\']class["\']\s*:\s*(["\'])(.*?)\1', re.S)
+_CLASS_NAME = re.compile(r'\bclassName\s*=\s*(["\'`])(.*?)\1', re.S)
+_CLASS_LIST = re.compile(r'\bclassList\.(?:add|remove|toggle|replace)\(([^)]*)\)')
+_STRING = re.compile(r'(["\'`])(.*?)\1')
+_LOOKS_LIKE_UTILITY = re.compile(
+    r'^(?:[\w-]+:)*-?(?:bg|text|font|border|rounded|shadow|ring|divide|space|gap|grid-cols|col-span|'
+    r'p[xytrbl]?|m[xytrbl]?|w|h|min-[wh]|max-w|z|opacity|leading|tracking|from|to|via|duration)-[\w./-]+$'
+)
+
+
+def class_lists(text):
+    """The class list strings in a template, script or Python module"""
+    for match in _SAFELIST.finditer(text):
+        yield match.group(1) or match.group(2)
+    text = _TEMPLATE_TAG.sub(' ', _SAFELIST.sub(' ', text))
+    for pattern in (_CLASS_ATTRIBUTE, _WIDGET_CLASS, _CLASS_NAME):
+        for match in pattern.finditer(text):
+            yield _INTERPOLATION.sub(' ', match.group(2))
+    for match in _CLASS_LIST.finditer(text):
+        for string in _STRING.finditer(match.group(1)):
+            yield string.group(2)
+
+
+def scan(paths):
+    """Candidate class names in the given files"""
+    candidates = set()
+    for path in paths:
+        text = Path(path).read_text(encoding='utf-8', errors='ignore')
+        for classes in class_lists(text):
+            candidates.update(classes.split())
+    return candidates
+
+
+def build(paths):
+    """
+    Stylesheet for the utilities used in `paths`.
+
+    Returns (css, unknown), where `unknown` lists class names that look like utilities but
+    are not implemented here.
+    """
+    compiled = []
+    unknown = []
+    candidates = scan(paths)
+    for name in candidates:
+        result = compile_class(name)
+        if result:
+            compiled.append(result)
+        elif _LOOKS_LIKE_UTILITY.match(name):
+            unknown.append(name)
+    compiled.sort()
+    parts = ['/* Generated by `manage.py build_css` from the templates; do not edit. */\n', PREFLIGHT]
+    if 'container' in candidates:
+        parts.append(CONTAINER)
+    parts.extend(css + '\n' for _, css in compiled)
+    return ''.join(parts), sorted(unknown)
@@ -1,33 +1,51 @@
+from asgiref.sync import sync_to_async
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import HttpResponse
 from django.shortcuts import render
-from django.contrib.auth.decorators import login_required
-from resumes.models import Resume
+from accounts.models import Profile
+from .async_helpers import async_login_required
+from .dashboard import aget_dashboard_page
+from .metrics import registry
+from .pages import cached_page
 
 
+@cached_page('home')
 def home(request):
     """Home page view"""
     return render(request, 'core/home.html')
 
 
-@login_required
-def dashboard(request):
+@async_login_required
+async def dashboard(request):
     """User dashboard view"""
-    resumes = Resume.objects.filter(user=request.user).order_by('-updated_at')
+    page = await aget_dashboard_page(request.user, cursor=request.GET.get('cursor'))
     
     # Get user profile for completion status
-    profile = getattr(request.user, 'profile', None)
+    profile = await Profile.objects.filter(user=request.user).afirst()
     
     context = {
-        'resumes': resumes,
+        'resumes': page.resumes,
+        'total_resumes': page.total,
+        'page': page,
         'profile': profile,
     }
-    return render(request, 'core/dashboard.html', context)
+    # Rendering blocks, so it runs in a thread rather than on the event loop
+    return await sync_to_async(render)(request, 'core/dashboard.html', context)
 
 
+@cached_page('privacy_policy')
 def privacy_policy(request):
     """Privacy policy page"""
     return render(request, 'core/privacy_policy.html')
 
 
+@cached_page('terms_conditions')
 def terms_conditions(request):
     """Terms and conditions page"""
     return render(request, 'core/terms_conditions.html')
+
+
+@staff_member_required
+def metrics(request):
+    """Per-view request metrics of this process in Prometheus text format"""
+    return HttpResponse(registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
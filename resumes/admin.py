@@ -1,5 +1,16 @@
-from django.contrib import admin
-from .models import Resume, Education, WorkExperience, ExtracurricularActivity, Certification, Project
+import io
+from django import forms
+from django.contrib import admin, messages
+from django.contrib.admin.views.main import ORDER_VAR, ChangeList
+from django.contrib.auth import get_user_model
+from django.core.exceptions import PermissionDenied
+from django.db.models import Case, Count, IntegerField, Q, Value, When
+from django.template.response import TemplateResponse
+from django.urls import path
+from .importer import detect_format, import_resumes, iter_records
+from .models import Resume, Education, WorkExperience, ExtracurricularActivity, Certification, Project, RenderJob, Skill
+from .search import search_resumes
+from .skills import sync_project_technologies, sync_resume_skills
 
 
 class EducationInline(admin.TabularInline):
@@ -32,13 +43,37 @@ class ProjectInline(admin.TabularInline):
     ordering = ['order', '-start_date']
 
 
+class ResumeImportForm(forms.Form):
+    file = forms.FileField(help_text='JSON Resume (one object, an array or JSON Lines) or CSV.')
+    format = forms.ChoiceField(choices=[('auto', 'Detect from file name'), ('json', 'JSON Resume'), ('csv', 'CSV')])
+    owner = forms.EmailField(help_text='Email address of the account that will own the imported resumes.')
+    dry_run = forms.BooleanField(required=False, help_text='Only validate the file.')
+
+    def clean_owner(self):
+        try:
+            return get_user_model().objects.get(email=self.cleaned_data['owner'])
+        except get_user_model().DoesNotExist:
+            raise forms.ValidationError('No user with this email address.')
+
+
+class ResumeChangeList(ChangeList):
+    def get_ordering(self, request, queryset):
+        # Full-text results are listed by relevance unless a column is sorted
+        if 'search_rank' in queryset.query.annotations and ORDER_VAR not in self.params:
+            return ['search_rank', '-pk']
+        return super().get_ordering(request, queryset)
+
+
 @admin.register(Resume)
 class ResumeAdmin(admin.ModelAdmin):
     list_display = ('title', 'full_name', 'user', 'created_at', 'updated_at')
     list_filter = ('created_at', 'updated_at')
     search_fields = ('title', 'full_name', 'user__email')
+    search_help_text = 'Full-text search over all sections, or "skill:python" to find resumes listing a skill.'
+    search_result_limit = 200
     readonly_fields = ('id', 'created_at', 'updated_at')
     inlines = [EducationInline, WorkExperienceInline, ExtracurricularActivityInline, CertificationInline, ProjectInline]
+    change_list_template = 'admin/resumes/resume/change_list.html'
     
     fieldsets = (
         ('Basic Information', {
@@ -55,6 +90,65 @@ class ResumeAdmin(admin.ModelAdmin):
         }),
     )
 
+    def get_search_results(self, request, queryset, search_term):
+        if search_term.startswith('skill:'):
+            return queryset.with_skill(search_term[len('skill:'):].strip()), True
+        if not search_term.strip():
+            return queryset, False
+        ranked = [resume.pk for resume, _ in search_resumes(search_term, limit=self.search_result_limit)]
+        # Position in the ranked list, so get_ordering can keep the best matches first
+        rank = Case(
+            *(When(pk=pk, then=Value(position)) for position, pk in enumerate(ranked)),
+            default=Value(len(ranked)), output_field=IntegerField(),
+        )
+        queryset = queryset.filter(Q(pk__in=ranked) | Q(user__email__iexact=search_term.strip()))
+        return queryset.annotate(search_rank=rank), False
+
+    def get_changelist(self, request, **kwargs):
+        return ResumeChangeList
+
+    def save_related(self, request, form, formsets, change):
+        super().save_related(request, form, formsets, change)
+        resume = form.instance
+        sync_resume_skills(resume)
+        sync_project_technologies(*resume.projects.all())
+
+    def get_urls(self):
+        return [
+            path('import/', self.admin_site.admin_view(self.import_view), name='resumes_resume_import'),
+            *super().get_urls(),
+        ]
+
+    def import_view(self, request):
+        """Upload a JSON Resume or CSV file and import it with resumes.importer"""
+        if not self.has_add_permission(request):
+            raise PermissionDenied
+        report = None
+        form = ResumeImportForm(request.POST or None, request.FILES or None)
+        if form.is_valid():
+            upload = form.cleaned_data['file']
+            fmt = form.cleaned_data['format']
+            if fmt == 'auto':
+                fmt = detect_format(upload.name)
+            # Large uploads are already spooled to a temporary file; read it as a stream
+            with io.TextIOWrapper(upload.file, encoding='utf-8-sig', newline='') as fh:
+                report = import_resumes(
+                    iter_records(fh, fmt), form.cleaned_data['owner'], dry_run=form.cleaned_data['dry_run'],
+                )
+            verb = 'Validated' if report.dry_run else 'Imported'
+            level = messages.ERROR if report.fatal else messages.WARNING if report.failed else messages.SUCCESS
+            self.message_user(
+                request, f'{verb} {report.imported} of {report.read} resumes; {report.failed} rejected.', level,
+            )
+        context = {
+            **self.admin_site.each_context(request),
+            'opts': self.model._meta,
+            'title': 'Import resumes',
+            'form': form,
+            'report': report,
+        }
+        return TemplateResponse(request, 'admin/resumes/resume/import.html', context)
+
 
 @admin.register(Education)
 class EducationAdmin(admin.ModelAdmin):
@@ -75,3 +169,26 @@ class ExtracurricularActivityAdmin(admin.ModelAdmin):
     list_display = ('title', 'organization', 'resume', 'start_date', 'end_date')
     list_filter = ('start_date', 'is_current')
     search_fields = ('title', 'organization', 'resume__full_name')
+
+
+@admin.register(RenderJob)
+class RenderJobAdmin(admin.ModelAdmin):
+    list_display = ('resume', 'status', 'attempts', 'created_at', 'finished_at')
+    list_filter = ('status', 'created_at')
+    search_fields = ('resume__title', 'resume__full_name')
+    readonly_fields = ('id', 'resume', 'version', 'attempts', 'error', 'created_at', 'started_at', 'finished_at')
+    exclude = ('pdf',)
+
+
+@admin.register(Skill)
+class SkillAdmin(admin.ModelAdmin):
+    list_display = ('name', 'resume_count')
+    search_fields = ('name',)
+    readonly_fields = ('normalized_name',)
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(resume_count=Count('resume_skills'))
+
+    @admin.display(ordering='resume_count', description='Resumes')
+    def resume_count(self, obj):
+        return obj.resume_count
@@ -0,0 +1,148 @@
+"""
+Read-only JSON API for resumes.
+
+Responses carry strong ETags and Last-Modified derived from Resume.updated_at, which is
+bumped whenever the resume or any of its section rows changes (see resumes.signals). A
+conditional request is answered with 304 after a single indexed lookup, without loading
+sections or serializing anything. List pages use the same keyset cursor as the dashboard
+and are streamed item by item. Unauthenticated requests get a 401 JSON error rather than
+a redirect to the login page.
+"""
+import hashlib
+import json
+from functools import wraps
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Count, Max
+from django.http import HttpResponseBadRequest, JsonResponse, StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.views.decorators.http import condition, require_GET
+from .conditional import resume_condition, revalidate_privately
+from .models import Resume
+from .pagination import after_cursor, decode_cursor, encode_cursor
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+RESUME_FIELDS = (
+    'title', 'full_name', 'email', 'phone', 'address', 'linkedin_url', 'github_url',
+    'portfolio_url', 'created_at', 'updated_at',
+)
+SECTION_FIELDS = {
+    'education': ('institution', 'degree', 'field_of_study', 'start_date', 'end_date', 'is_current', 'grade', 'description'),
+    'work_experience': ('company', 'position', 'location', 'start_date', 'end_date', 'is_current', 'description'),
+    'extracurricular_activities': ('title', 'organization', 'start_date', 'end_date', 'is_current', 'description'),
+    'certifications': ('title', 'issuer', 'issue_date', 'expiration_date', 'credential_id', 'credential_url', 'description'),
+    'projects': ('name', 'role', 'link', 'start_date', 'end_date', 'description', 'technologies'),
+}
+
+
+def serialize_resume(resume):
+    data = {'id': resume.id}
+    data.update((name, getattr(resume, name)) for name in RESUME_FIELDS)
+    data['skills'] = resume.skills_list
+    for relation, fields in SECTION_FIELDS.items():
+        data[relation] = [
+            {'id': row.pk, **{name: getattr(row, name) for name in fields}}
+            for row in getattr(resume, relation).all()
+        ]
+    return data
+
+
+def visible_resumes(user):
+    """Staff can read every resume through the API, everyone else only their own"""
+    return Resume.objects.all() if user.is_staff else Resume.objects.filter(user=user)
+
+
+def api_login_required(view):
+    """login_required for API views: answer with a 401 JSON error instead of a redirect"""
+    @wraps(view)
+    def inner(request, *args, **kwargs):
+        if not request.user.is_authenticated:
+            return JsonResponse({'error': 'Authentication required.'}, status=401)
+        return view(request, *args, **kwargs)
+    return inner
+
+
+def private(view):
+    """Mark every response of `view` private, including the 304s condition() answers itself"""
+    @wraps(view)
+    def inner(request, *args, **kwargs):
+        return revalidate_privately(view(request, *args, **kwargs))
+    return inner
+
+
+# Detail
+
+@api_login_required
+@require_GET
+@resume_condition('json', scope=visible_resumes)
+def resume_detail(request, resume_id):
+    resume = get_object_or_404(visible_resumes(request.user).with_sections(), pk=resume_id)
+    return revalidate_privately(JsonResponse(serialize_resume(resume), encoder=DjangoJSONEncoder))
+
+
+# List
+
+def _page_params(request):
+    try:
+        limit = min(max(int(request.GET.get('limit', DEFAULT_PAGE_SIZE)), 1), MAX_PAGE_SIZE)
+    except ValueError:
+        limit = DEFAULT_PAGE_SIZE
+    return request.GET.get('cursor', ''), limit
+
+
+def _list_stamp(request):
+    if not hasattr(request, '_resume_list_stamp'):
+        request._resume_list_stamp = visible_resumes(request.user).aggregate(
+            count=Count('pk'), latest=Max('updated_at'),
+        )
+    return request._resume_list_stamp
+
+
+def _list_etag(request):
+    stamp = _list_stamp(request)
+    cursor, limit = _page_params(request)
+    latest = stamp['latest'].isoformat() if stamp['latest'] else ''
+    raw = f"{request.user.pk}:{request.user.is_staff}:{stamp['count']}:{latest}:{cursor}:{limit}"
+    return hashlib.sha256(raw.encode()).hexdigest()[:32]
+
+
+def _list_last_modified(request):
+    return _list_stamp(request)['latest']
+
+
+def _stream_page(resumes, limit, next_url):
+    encoder = DjangoJSONEncoder()
+    yield '{"results": ['
+    last = None
+    for count, resume in enumerate(resumes):
+        if count == limit:
+            # The extra row only tells us there is another page
+            yield '], "next": ' + json.dumps(next_url(last)) + '}'
+            return
+        yield (',' if count else '') + encoder.encode(serialize_resume(resume))
+        last = resume
+    yield '], "next": null}'
+
+
+@api_login_required
+@require_GET
+@private
+@condition(etag_func=_list_etag, last_modified_func=_list_last_modified)
+def resume_list(request):
+    cursor, limit = _page_params(request)
+    queryset = visible_resumes(request.user).with_sections().order_by('-updated_at', '-id')
+    if cursor:
+        position = decode_cursor(cursor)
+        if position is None:
+            return HttpResponseBadRequest('Invalid cursor.')
+        queryset = after_cursor(queryset, position)
+
+    def next_url(last):
+        params = request.GET.copy()
+        params['cursor'] = encode_cursor(last)
+        params['limit'] = str(limit)
+        return request.build_absolute_uri(f"{request.path}?{params.urlencode()}")
+
+    resumes = queryset[:limit + 1].iterator(chunk_size=min(limit + 1, 100))
+    return StreamingHttpResponse(_stream_page(resumes, limit, next_url), content_type='application/json')
@@ -0,0 +1,109 @@
+"""
+Resolution of static and media URIs for xhtml2pdf.
+
+xhtml2pdf calls link_callback for every image, font and stylesheet on every render. The
+resolver below memoizes the URI -> path mapping for the life of the process and keeps
+small stylesheets in memory as data: URIs so they are not re-read from disk per document.
+"""
+import base64
+import logging
+import mimetypes
+import os
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from django.conf import settings
+from django.contrib.staticfiles import finders
+
+logger = logging.getLogger(__name__)
+
+# Stylesheets up to this size are inlined from memory instead of being read per render
+PRELOAD_EXTENSIONS = {'.css'}
+PRELOAD_MAX_BYTES = 256 * 1024
+
+
+@dataclass(frozen=True)
+class AssetMiss:
+    """A URI that pointed into STATIC_URL or MEDIA_URL but matched no file"""
+    uri: str
+    path: str
+    reason: str
+
+
+@dataclass
+class _Resolved:
+    target: str          # what link_callback returns: a filesystem path or a data: URI
+    path: str
+    mtime: float
+
+
+class AssetResolver:
+    def __init__(self):
+        self._resolved = {}
+        self._lock = threading.Lock()
+        self.misses = Counter()
+        self.last_miss = None
+
+    def clear(self):
+        with self._lock:
+            self._resolved.clear()
+            self.misses.clear()
+            self.last_miss = None
+
+    def resolve(self, uri, rel=None):
+        entry = self._resolved.get(uri)
+        if entry is not None and not (settings.DEBUG and self._is_stale(entry)):
+            return entry.target
+
+        path = self._find(uri)
+        if path is None:
+            # Not a local asset (e.g. http://some.tld/foo.png), let xhtml2pdf fetch it
+            return uri
+        if not os.path.isfile(path):
+            self._record_miss(AssetMiss(uri=uri, path=path, reason='file not found'))
+            return uri
+
+        entry = _Resolved(target=self._target_for(path), path=path, mtime=os.path.getmtime(path))
+        with self._lock:
+            self._resolved[uri] = entry
+        return entry.target
+
+    def _find(self, uri):
+        s_url, m_url = settings.STATIC_URL, settings.MEDIA_URL
+        if uri.startswith(m_url):
+            return os.path.join(settings.MEDIA_ROOT, uri[len(m_url):])
+        if uri.startswith(s_url):
+            relative = uri[len(s_url):]
+            path = os.path.join(settings.STATIC_ROOT, relative)
+            if not os.path.isfile(path):
+                # collectstatic may not have run (e.g. in development), try the app/static dirs
+                path = finders.find(relative) or path
+            return path
+        return None
+
+    def _target_for(self, path):
+        ext = os.path.splitext(path)[1].lower()
+        if ext in PRELOAD_EXTENSIONS and os.path.getsize(path) <= PRELOAD_MAX_BYTES:
+            with open(path, 'rb') as fh:
+                data = base64.b64encode(fh.read()).decode('ascii')
+            mime = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+            return f'data:{mime};base64,{data}'
+        return path
+
+    def _is_stale(self, entry):
+        try:
+            return os.path.getmtime(entry.path) != entry.mtime
+        except OSError:
+            return True
+
+    def _record_miss(self, miss):
+        with self._lock:
+            self.misses[miss.uri] += 1
+            self.last_miss = miss
+        logger.warning(
+            'PDF asset not found: %s (%s)', miss.uri, miss.reason,
+            extra={'asset_uri': miss.uri, 'asset_path': miss.path, 'misses': self.misses[miss.uri]},
+        )
+
+
+asset_resolver = AssetResolver()
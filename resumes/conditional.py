@@ -0,0 +1,82 @@
+"""
+Conditional-response support for views that render one resume.
+
+A resume's content version is its updated_at, which is bumped whenever the resume or any
+of its section rows changes (see resumes.signals). The precheck below reads just that
+column, so a revalidation that matches is answered with 304 before the view loads
+sections or renders anything. ETags also carry the render version, so clients revalidate
+to a fresh copy after a deploy changes the templates.
+"""
+import asyncio
+import hashlib
+from calendar import timegm
+from functools import wraps
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+from .models import Resume
+from .utils import render_version
+
+
+def resume_etag(resume_id, updated_at, variant=''):
+    """Strong ETag for one representation (`variant`) of a resume version"""
+    raw = f"{render_version()}:{variant}:{resume_id}:{updated_at.isoformat()}"
+    return hashlib.sha256(raw.encode()).hexdigest()[:32]
+
+
+def owned_resumes(user):
+    return Resume.objects.filter(user=user)
+
+
+def resume_condition(variant, scope=owned_resumes):
+    """
+    Conditional GET support for views taking a resume_id, sync or async.
+
+    Works like django.views.decorators.http.condition() (which is sync-only in Django
+    4.2). `scope(user)` returns the resumes the user may see; anything outside it gets no
+    validators, so the view's own 404 handling applies.
+    """
+    def stamp_query(request, resume_id):
+        return scope(request.user).filter(pk=resume_id).values_list('updated_at', flat=True)
+
+    def validators(resume_id, updated_at):
+        if updated_at is None:
+            return None, None
+        return quote_etag(resume_etag(resume_id, updated_at, variant)), timegm(updated_at.utctimetuple())
+
+    def add_validators(request, response, etag, last_modified):
+        if response.status_code == 304:
+            # A 304 must repeat the Cache-Control the 200 would have carried
+            revalidate_privately(response)
+        if request.method in ('GET', 'HEAD'):
+            if last_modified and not response.has_header('Last-Modified'):
+                response.headers['Last-Modified'] = http_date(last_modified)
+            if etag:
+                response.headers.setdefault('ETag', etag)
+        return response
+
+    def decorator(view):
+        if asyncio.iscoroutinefunction(view):
+            @wraps(view)
+            async def inner(request, resume_id, *args, **kwargs):
+                etag, last_modified = validators(resume_id, await stamp_query(request, resume_id).afirst())
+                response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+                if response is None:
+                    response = await view(request, resume_id, *args, **kwargs)
+                return add_validators(request, response, etag, last_modified)
+        else:
+            @wraps(view)
+            def inner(request, resume_id, *args, **kwargs):
+                etag, last_modified = validators(resume_id, stamp_query(request, resume_id).first())
+                response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+                if response is None:
+                    response = view(request, resume_id, *args, **kwargs)
+                return add_validators(request, response, etag, last_modified)
+        return inner
+
+    return decorator
+
+
+def revalidate_privately(response):
+    """Let the browser keep the response but check the validators before reusing it"""
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
@@ -0,0 +1,195 @@
+"""
+Per-section JSON endpoints for the resume editor.
+
+The full edit form posts every formset at once. These endpoints let the editor save one
+piece at a time instead: a partial update of the resume's basic fields or of a single
+section row, adding or deleting one row, or reordering a section. Each request carries a
+small JSON object, only the affected form is validated, and only the changed columns of
+the affected rows are written. The autosave script in resumes/create_edit.html uses the
+PATCH endpoints to send just the fields edited since its last save.
+
+The usual signals still fire for single-row saves and deletes, so the resume's
+updated_at, its cached fragments and its search index entry follow along.
+"""
+import json
+from django.contrib.auth.decorators import login_required
+from django.db import transaction
+from django.db.models import Max
+from django.http import Http404, HttpResponse, JsonResponse
+from django.shortcuts import get_object_or_404
+from django.views.decorators.http import require_http_methods, require_POST
+from .forms import SECTION_FORMS, ResumeForm
+from .models import Project, Resume
+from .services import reorder_section
+from .skills import sync_project_technologies, sync_resume_skills
+
+
+# JSON values a form field can take; lists and objects would be stored as their repr
+SCALAR_TYPES = (str, int, float, bool, type(None))
+
+
+class PayloadError(Exception):
+    pass
+
+
+class FieldValueError(PayloadError):
+    """Payload values of the wrong type, reported per field like form errors"""
+
+    def __init__(self, errors):
+        super().__init__('Invalid field values.')
+        self.errors = errors
+
+
+def _payload(request):
+    """The request body as a JSON object"""
+    try:
+        data = json.loads(request.body or b'{}')
+    except ValueError:
+        raise PayloadError('Request body is not valid JSON.')
+    if not isinstance(data, dict):
+        raise PayloadError('Request body must be a JSON object.')
+    return data
+
+
+def _error(message, status=400):
+    return JsonResponse({'error': message}, status=status)
+
+
+def _payload_error(exc):
+    if isinstance(exc, FieldValueError):
+        return JsonResponse({'errors': exc.errors}, status=400)
+    return _error(str(exc))
+
+
+def _check_values(data):
+    """Raise FieldValueError for values that are not a string, number, boolean or null"""
+    errors = {
+        name: [{'message': 'Expected a string, number, boolean or null.', 'code': 'invalid'}]
+        for name, value in data.items() if not isinstance(value, SCALAR_TYPES)
+    }
+    if errors:
+        raise FieldValueError(errors)
+    return data
+
+
+def _form_errors(form):
+    return JsonResponse({'errors': form.errors.get_json_data()}, status=400)
+
+
+def _section_form(section):
+    try:
+        return SECTION_FORMS[section]
+    except KeyError:
+        raise Http404('Unknown section')
+
+
+def _bind_changes(form_class, instance, changes):
+    """
+    Bind `form_class` to `instance` with `changes` applied over its current values.
+
+    Only the fields in `changes` can differ from the instance, so form.changed_data is
+    exactly the set of columns to write. Raises PayloadError for fields the form lacks and
+    FieldValueError for values of the wrong type.
+    """
+    unknown = sorted(set(changes) - set(form_class.base_fields))
+    if unknown:
+        raise PayloadError(f"Unknown field(s): {', '.join(unknown)}.")
+    _check_values(changes)
+    current = form_class(instance=instance)
+    data = {name: current.initial.get(name) for name in form_class.base_fields}
+    data.update(changes)
+    return form_class(data, instance=instance)
+
+
+# Basics
+
+@login_required
+@require_http_methods(['PATCH'])
+def save_basics(request, resume_id):
+    """Partially update the resume's own fields"""
+    resume = get_object_or_404(Resume, pk=resume_id, user=request.user)
+    try:
+        form = _bind_changes(ResumeForm, resume, _payload(request))
+    except PayloadError as exc:
+        return _payload_error(exc)
+    if not form.is_valid():
+        return _form_errors(form)
+
+    changed = form.changed_data
+    if changed:
+        with transaction.atomic():
+            form.save(commit=False).save(update_fields=[*changed, 'updated_at'])
+            if 'skills' in changed:
+                sync_resume_skills(resume)
+    return JsonResponse({'id': resume.pk, 'saved': changed, 'updated_at': resume.updated_at})
+
+
+# Section rows
+
+@login_required
+@require_POST
+def create_section_row(request, resume_id, section):
+    """Add one row at the end of a section"""
+    resume = get_object_or_404(Resume, pk=resume_id, user=request.user)
+    form_class = _section_form(section)
+    try:
+        form = form_class(_check_values(_payload(request)))
+    except PayloadError as exc:
+        return _payload_error(exc)
+    if not form.is_valid():
+        return _form_errors(form)
+
+    model = form_class._meta.model
+    with transaction.atomic():
+        row = form.save(commit=False)
+        row.resume = resume
+        last = model.objects.filter(resume=resume).aggregate(last=Max('order'))['last']
+        row.order = 0 if last is None else last + 1
+        row.save()
+        if model is Project:
+            sync_project_technologies(row)
+    return JsonResponse({'id': row.pk, 'order': row.order}, status=201)
+
+
+@login_required
+@require_http_methods(['PATCH', 'DELETE'])
+def section_row(request, resume_id, section, row_id):
+    """PATCH: partially update one row of a section. DELETE: remove it."""
+    form_class = _section_form(section)
+    model = form_class._meta.model
+    row = get_object_or_404(model, pk=row_id, resume_id=resume_id, resume__user=request.user)
+
+    if request.method == 'DELETE':
+        row.delete()
+        return HttpResponse(status=204)
+
+    try:
+        form = _bind_changes(form_class, row, _payload(request))
+    except PayloadError as exc:
+        return _payload_error(exc)
+    if not form.is_valid():
+        return _form_errors(form)
+
+    changed = form.changed_data
+    if changed:
+        with transaction.atomic():
+            form.save(commit=False).save(update_fields=changed)
+            if model is Project and 'technologies' in changed:
+                sync_project_technologies(row)
+    return JsonResponse({'id': row.pk, 'saved': changed})
+
+
+@login_required
+@require_POST
+def reorder_section_rows(request, resume_id, section):
+    """Reorder a section from {"order": [row ids, first to last]}"""
+    resume = get_object_or_404(Resume, pk=resume_id, user=request.user)
+    model = _section_form(section)._meta.model
+    try:
+        row_ids = _payload(request).get('order')
+    except PayloadError as exc:
+        return _error(str(exc))
+    if not isinstance(row_ids, list) or not all(type(pk) is int for pk in row_ids):
+        return _error('"order" must be a list of row ids.')
+    moved = reorder_section(resume, model, row_ids)
+    return JsonResponse({'moved': moved})
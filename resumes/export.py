@@ -0,0 +1,130 @@
+"""
+Bulk export of many resumes as a streamed ZIP of PDFs.
+
+HTML is rendered in this process (it needs the database); the xhtml2pdf step runs in a
+process pool and each PDF is written to the archive as soon as it finishes, so only a
+bounded number of documents is ever held in memory. Web requests share one pool per
+process (export_executor); the export_resumes command starts its own.
+"""
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from django.conf import settings
+from .jobs import render_in_worker, worker_init
+from .utils import PDF_TEMPLATE, get_cached_pdf, pdf_cache_key, pdf_filename, render_html
+
+
+def export_filename(resume):
+    """Archive member name, suffixed with the resume id so duplicate names can't collide"""
+    stem = pdf_filename(resume)[:-len('.pdf')]
+    return f"{stem}_{str(resume.id)[:8]}.pdf"
+
+
+_export_executor = None
+
+
+def export_executor():
+    """Process pool of BULK_EXPORT_WORKERS shared by every bulk export in this process"""
+    global _export_executor
+    if _export_executor is None:
+        _export_executor = ProcessPoolExecutor(max_workers=settings.BULK_EXPORT_WORKERS, initializer=worker_init)
+    return _export_executor
+
+
+def iter_resume_pdfs(resumes, workers=2, executor=None):
+    """
+    Yield (resume, pdf_bytes) pairs in completion order.
+
+    Renders run in `executor`, or in a pool of `workers` processes started for this export.
+    At most 2 * workers renders are in flight at once. Resumes whose current version is
+    already in the PDF cache are yielded without rendering; failed renders yield None.
+    """
+    max_in_flight = max(1, workers) * 2
+    pool = executor or ProcessPoolExecutor(max_workers=workers, initializer=worker_init)
+    in_flight = {}
+    try:
+        for resume in resumes:
+            pdf_bytes = get_cached_pdf(pdf_cache_key(PDF_TEMPLATE, resume))
+            if pdf_bytes is not None:
+                yield resume, pdf_bytes
+                continue
+
+            html = render_html(PDF_TEMPLATE, {'resume': resume})
+            in_flight[pool.submit(render_in_worker, html)] = resume
+            if len(in_flight) >= max_in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield in_flight.pop(future), _result_or_none(future)
+
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield in_flight.pop(future), _result_or_none(future)
+    finally:
+        # An abandoned download must not keep a shared pool busy
+        for future in in_flight:
+            future.cancel()
+        if executor is None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _result_or_none(future):
+    try:
+        return future.result()
+    except Exception:
+        return None
+
+
+class _ChunkBuffer:
+    """Write-only file object that hands back whatever was written since the last drain"""
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def stream_zip(entries):
+    """
+    Yield a ZIP archive chunk by chunk from (name, bytes) pairs.
+
+    The output stream is unseekable, so zipfile writes data descriptors after each member
+    and never has to revisit earlier bytes.
+    """
+    buffer = _ChunkBuffer()
+    with zipfile.ZipFile(buffer, mode='w', compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, data in entries:
+            archive.writestr(name, data)
+            yield buffer.drain()
+    yield buffer.drain()
+
+
+def resume_zip_stream(resumes, workers=2, errors=None, executor=None):
+    """
+    Stream a ZIP of PDFs for the given resumes.
+
+    Resumes that fail to render are skipped; if an `errors` list is passed they are
+    appended to it, and a summary is added to the archive as errors.txt.
+    """
+    failed = [] if errors is None else errors
+
+    def entries():
+        for resume, pdf_bytes in iter_resume_pdfs(resumes, workers=workers, executor=executor):
+            if pdf_bytes:
+                yield export_filename(resume), pdf_bytes
+            else:
+                failed.append(resume)
+        if failed:
+            report = '\n'.join(f"{resume.id}\t{resume}" for resume in failed)
+            yield 'errors.txt', f"PDF generation failed for:\n{report}\n".encode()
+
+    return stream_zip(entries())
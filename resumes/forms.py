@@ -1,5 +1,6 @@
 from django import forms
-from django.forms import inlineformset_factory
+from django.core.exceptions import ValidationError
+from django.forms import BaseInlineFormSet, ModelChoiceField, inlineformset_factory
 from .models import Resume, Education, WorkExperience, ExtracurricularActivity, Certification, Project
 
 
@@ -208,23 +209,65 @@ class ProjectForm(forms.ModelForm):
         }
 
 
+class _ExistingRowChoiceField(ModelChoiceField):
+    """Primary key field that resolves rows from the formset's queryset instead of one query per form"""
+
+    def __init__(self, formset, *args, **kwargs):
+        self.formset = formset
+        super().__init__(*args, **kwargs)
+
+    def to_python(self, value):
+        if value in self.empty_values:
+            return None
+        try:
+            pk = self.formset._pk_field.to_python(value)
+        except ValidationError:
+            pk = None
+        obj = self.formset._existing_object(pk) if pk is not None else None
+        if obj is None:
+            raise ValidationError(self.error_messages['invalid_choice'], code='invalid_choice')
+        return obj
+
+
+class SectionInlineFormSet(BaseInlineFormSet):
+    """Inline formset for resume sections that validates existing rows without extra queries"""
+
+    def add_fields(self, form, index):
+        super().add_fields(form, index)
+        name = self._pk_field.name
+        field = form.fields.get(name)
+        if isinstance(field, ModelChoiceField):
+            form.fields[name] = _ExistingRowChoiceField(
+                self, field.queryset, initial=field.initial, required=False, widget=field.widget,
+            )
+
+
 # Formsets for dynamic forms
 EducationFormSet = inlineformset_factory(
-    Resume, Education, form=EducationForm, extra=0, can_delete=True
+    Resume, Education, form=EducationForm, formset=SectionInlineFormSet, extra=0, can_delete=True
 )
 
 WorkExperienceFormSet = inlineformset_factory(
-    Resume, WorkExperience, form=WorkExperienceForm, extra=0, can_delete=True
+    Resume, WorkExperience, form=WorkExperienceForm, formset=SectionInlineFormSet, extra=0, can_delete=True
 )
 
 ExtracurricularActivityFormSet = inlineformset_factory(
-    Resume, ExtracurricularActivity, form=ExtracurricularActivityForm, extra=0, can_delete=True
+    Resume, ExtracurricularActivity, form=ExtracurricularActivityForm, formset=SectionInlineFormSet, extra=0, can_delete=True
 )
 
 CertificationFormSet = inlineformset_factory(
-    Resume, Certification, form=CertificationForm, extra=0, can_delete=True
+    Resume, Certification, form=CertificationForm, formset=SectionInlineFormSet, extra=0, can_delete=True
 )
 
 ProjectFormSet = inlineformset_factory(
-    Resume, Project, form=ProjectForm, extra=0, can_delete=True
+    Resume, Project, form=ProjectForm, formset=SectionInlineFormSet, extra=0, can_delete=True
 )
+
+# Row forms by section (the Resume related_name), for the editor's per-section endpoints
+SECTION_FORMS = {
+    'education': EducationForm,
+    'work_experience': WorkExperienceForm,
+    'extracurricular_activities': ExtracurricularActivityForm,
+    'certifications': CertificationForm,
+    'projects': ProjectForm,
+}
@@ -0,0 +1,66 @@
+"""
+Per-section HTML fragment cache for the resume detail and preview pages.
+
+Each section of a page is wrapped in a {% cache %} block keyed on the resume id, that
+section's version stamp and the render version (see resumes.utils.render_version). Stamps
+live in the same cache and are replaced whenever a row of the section changes (by the
+post_save/post_delete signals, or by save_resume for its bulk writes), so editing one work
+experience re-renders only the work experience fragment.
+
+A stamp is a fresh unique value rather than a counter: if it is evicted, the next reader
+starts a new one instead of counting up from zero again and matching an old fragment.
+"""
+import time
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from .models import SECTION_RELATIONS
+from .utils import render_version
+
+
+def fragment_cache():
+    return caches[settings.FRAGMENT_CACHE_ALIAS]
+
+
+def section_name(model):
+    """The section a child model belongs to, i.e. its related_name on Resume"""
+    return model._meta.get_field('resume').remote_field.related_name
+
+
+def _version_key(resume_id, section):
+    return f'resume-section-version:{resume_id}:{section}'
+
+
+def section_versions(resume_id):
+    """Current version stamp of every section of a resume, starting any that are missing"""
+    cache = fragment_cache()
+    keys = {_version_key(resume_id, section): section for section in SECTION_RELATIONS}
+    found = cache.get_many(keys)
+    versions = {keys[key]: value for key, value in found.items()}
+    for key, section in keys.items():
+        if section not in versions:
+            stamp = time.time_ns()
+            # add() keeps a stamp another request started in the meantime
+            versions[section] = stamp if cache.add(key, stamp, timeout=None) else cache.get(key, stamp)
+    return versions
+
+
+def bump_section_versions(resume_id, *sections):
+    """Invalidate the cached fragments of `sections` once the current transaction commits"""
+    def bump():
+        stamp = time.time_ns()
+        fragment_cache().set_many(
+            {_version_key(resume_id, section): stamp for section in sections}, timeout=None,
+        )
+    # Bumping before commit would let a concurrent reader cache the old rows under the new stamp
+    transaction.on_commit(bump)
+
+
+def fragment_context(resume_id):
+    """Template context for the {% cache %} blocks of the detail and preview pages"""
+    return {
+        'section_versions': section_versions(resume_id),
+        'render_version': render_version(),
+        'fragment_cache': settings.FRAGMENT_CACHE_ALIAS,
+        'fragment_timeout': settings.FRAGMENT_CACHE_TIMEOUT,
+    }
@@ -0,0 +1,401 @@
+"""
+Streaming bulk import of resumes from JSON Resume or CSV files.
+
+Records are read one at a time by generators and validated with the same model forms as
+the editor (ResumeForm and SECTION_FORMS). Valid resumes are written in chunks: each chunk
+of `batch_size` resumes is one transaction with one bulk_create per model, followed by the
+skill sync and search indexing that a normal save gets from its signals. Only the current
+chunk is held in memory, so memory use does not grow with the file.
+
+Formats:
+
+- JSON Resume (https://jsonresume.org/schema): a single resume object, an array of them,
+  or JSON Lines with one object per line. Scalars are read as text; an object or list
+  where the schema has another type rejects that record.
+- CSV with a header row of field names. A row whose `record` column is empty or "resume"
+  starts a resume (ResumeForm fields); a row whose `record` is a section name (education,
+  work_experience, extracurricular_activities, certifications, projects) adds a row to the
+  resume above it, read from the columns named after that section form's fields (one
+  before the first resume is rejected on its own). Without a `record` column every row is
+  a resume.
+"""
+import csv
+import json
+import time
+from dataclasses import dataclass, field
+from django.db import DatabaseError, transaction
+from .forms import SECTION_FORMS, ResumeForm
+from .models import Project, Resume
+from .search import schedule_index
+from .skills import sync_project_technologies, sync_resume_skills
+
+DEFAULT_BATCH_SIZE = 200
+# A single JSON record larger than this is treated as a malformed file
+MAX_RECORD_BYTES = 10 * 1024 * 1024
+# Errors kept on the report itself; pass on_error to see every one
+MAX_KEPT_ERRORS = 100
+
+
+class ImportFormatError(Exception):
+    """The file cannot be parsed any further"""
+
+
+@dataclass
+class ImportRecord:
+    number: int
+    resume: dict = field(default_factory=dict)
+    sections: dict = field(default_factory=dict)
+    # Set when the record was rejected while parsing
+    errors: dict = field(default_factory=dict)
+
+
+@dataclass
+class ImportReport:
+    read: int = 0
+    imported: int = 0
+    failed: int = 0
+    batches: int = 0
+    seconds: float = 0.0
+    dry_run: bool = False
+    fatal: str = ''
+    errors: list = field(default_factory=list)
+
+    @property
+    def rate(self):
+        return self.read / self.seconds if self.seconds else 0.0
+
+
+# Parsing
+
+def iter_json_documents(fh, chunk_size=1 << 16):
+    """
+    Yield the JSON values of a text file one by one: a single value, the items of a
+    top-level array, or one value per line (JSON Lines). Only the value being decoded is
+    buffered.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ''
+    eof = False
+    in_array = None
+    count = 0
+    while True:
+        buffer = buffer.lstrip(' \t\r\n,' if in_array else ' \t\r\n')
+        if not buffer:
+            if eof:
+                return
+            chunk = fh.read(chunk_size)
+            eof = not chunk
+            buffer += chunk
+            continue
+        if in_array is None:
+            in_array = buffer.startswith('[')
+            if in_array:
+                buffer = buffer[1:]
+            continue
+        if in_array and buffer.startswith(']'):
+            return
+        try:
+            value, end = decoder.raw_decode(buffer)
+        except json.JSONDecodeError as exc:
+            # Most likely the value continues in the next chunk
+            if eof or len(buffer) > MAX_RECORD_BYTES:
+                raise ImportFormatError(f'Invalid JSON after value {count}: {exc.msg}') from None
+            chunk = fh.read(chunk_size)
+            eof = not chunk
+            buffer += chunk
+            continue
+        count += 1
+        yield value
+        buffer = buffer[end:]
+
+
+class _WrongType(Exception):
+    """A JSON Resume value has the wrong type; the record is rejected"""
+
+    def __init__(self, name, expected):
+        super().__init__(f'Expected {expected}.')
+        self.name = name
+
+
+def _object(value, name):
+    if value is None:
+        return {}
+    if not isinstance(value, dict):
+        raise _WrongType(name, 'an object')
+    return value
+
+
+def _list(value, name):
+    if value is None:
+        return []
+    if not isinstance(value, list):
+        raise _WrongType(name, 'a list')
+    return value
+
+
+def _entries(doc, name):
+    """The objects of a section list"""
+    return [_object(entry, f'{name}[{index}]') for index, entry in enumerate(_list(doc.get(name), name))]
+
+
+def _text(value, name):
+    """A scalar as text; None is empty"""
+    if value is None:
+        return ''
+    if isinstance(value, (dict, list)):
+        raise _WrongType(name, 'a string')
+    return str(value)
+
+
+def _date(value, name):
+    """JSON Resume dates may be YYYY, YYYY-MM or YYYY-MM-DD"""
+    value = _text(value, name).strip()
+    if len(value) == 4 and value.isdigit():
+        return f'{value}-01-01'
+    if len(value) == 7 and value[4] == '-':
+        return f'{value}-01'
+    return value
+
+
+def _lines(entry, *keys):
+    lines = []
+    for key in keys:
+        part = entry.get(key)
+        if isinstance(part, list):
+            lines.extend(_text(item, key) for item in part if item)
+        elif part:
+            lines.append(_text(part, key))
+    return '\n'.join(lines)
+
+
+def _names(items, name):
+    names = (_text(item.get('name') if isinstance(item, dict) else item, name) for item in _list(items, name))
+    return ', '.join(value for value in names if value)
+
+
+def _period(entry):
+    end = _date(entry.get('endDate'), 'endDate')
+    return {
+        'start_date': _date(entry.get('startDate'), 'startDate'),
+        'end_date': end,
+        'is_current': bool(entry.get('startDate')) and not end,
+    }
+
+
+def from_json_resume(number, doc):
+    """Map one JSON Resume document to an ImportRecord, rejecting it when a value has the wrong type"""
+    try:
+        return _map_json_resume(number, doc)
+    except _WrongType as exc:
+        return ImportRecord(number, resume=None, errors={exc.name: [str(exc)]})
+
+
+def _map_json_resume(number, doc):
+    basics = _object(doc.get('basics'), 'basics')
+    location = _object(basics.get('location'), 'location')
+    profiles = {
+        _text(profile.get('network'), 'network').lower(): _text(profile.get('url'), 'url')
+        for profile in _list(basics.get('profiles'), 'profiles') if isinstance(profile, dict)
+    }
+    address = ', '.join(
+        _text(location[key], key) for key in ('address', 'city', 'region', 'postalCode', 'countryCode')
+        if location.get(key)
+    )
+    record = ImportRecord(number, resume={
+        'title': _text(basics.get('label'), 'label') or Resume._meta.get_field('title').default,
+        'full_name': _text(basics.get('name'), 'name'),
+        'email': _text(basics.get('email'), 'email'),
+        'phone': _text(basics.get('phone'), 'phone'),
+        'address': address,
+        'linkedin_url': profiles.get('linkedin', ''),
+        'github_url': profiles.get('github', ''),
+        'portfolio_url': _text(basics.get('url'), 'url'),
+        'skills': _names(doc.get('skills'), 'skills'),
+    })
+    record.sections['education'] = [{
+        'institution': _text(entry.get('institution'), 'institution'),
+        'degree': _text(entry.get('studyType'), 'studyType'),
+        'field_of_study': _text(entry.get('area'), 'area'),
+        'grade': _text(entry.get('score'), 'score'),
+        'description': _lines(entry, 'courses'),
+        **_period(entry),
+    } for entry in _entries(doc, 'education')]
+    record.sections['work_experience'] = [{
+        'company': _text(entry.get('name') or entry.get('company'), 'name'),
+        'position': _text(entry.get('position'), 'position'),
+        'location': _text(entry.get('location'), 'location'),
+        'description': _lines(entry, 'summary', 'highlights'),
+        **_period(entry),
+    } for entry in _entries(doc, 'work')]
+    record.sections['extracurricular_activities'] = [{
+        'title': _text(entry.get('position'), 'position'),
+        'organization': _text(entry.get('organization'), 'organization'),
+        'description': _lines(entry, 'summary', 'highlights'),
+        **_period(entry),
+    } for entry in _entries(doc, 'volunteer')]
+    record.sections['certifications'] = [{
+        'title': _text(entry.get('name'), 'name'),
+        'issuer': _text(entry.get('issuer'), 'issuer'),
+        'issue_date': _date(entry.get('date'), 'date'),
+        'credential_url': _text(entry.get('url'), 'url'),
+    } for entry in _entries(doc, 'certificates')]
+    record.sections['projects'] = [{
+        'name': _text(entry.get('name'), 'name'),
+        'role': _names(entry.get('roles'), 'roles'),
+        'link': _text(entry.get('url'), 'url'),
+        'start_date': _date(entry.get('startDate'), 'startDate'),
+        'end_date': _date(entry.get('endDate'), 'endDate'),
+        'description': _lines(entry, 'description', 'highlights'),
+        'technologies': _names(entry.get('keywords'), 'keywords'),
+    } for entry in _entries(doc, 'projects')]
+    return record
+
+
+def iter_json_records(fh):
+    for number, doc in enumerate(iter_json_documents(fh), start=1):
+        yield from_json_resume(number, doc) if isinstance(doc, dict) else ImportRecord(number, resume=None)
+
+
+def iter_csv_records(fh):
+    reader = csv.DictReader(fh)
+    record = None
+    number = 0
+    for row in reader:
+        kind = (row.get('record') or 'resume').strip()
+        row = {key: (value or '').strip() for key, value in row.items() if key}
+        if kind == 'resume':
+            if record is not None:
+                yield record
+            number += 1
+            record = ImportRecord(number, resume={name: row[name] for name in ResumeForm.base_fields if name in row})
+            if not record.resume.get('title'):
+                record.resume['title'] = Resume._meta.get_field('title').default
+        elif kind in SECTION_FORMS and record is not None:
+            fields = SECTION_FORMS[kind].base_fields
+            record.sections.setdefault(kind, []).append({name: row[name] for name in fields if name in row})
+        elif kind in SECTION_FORMS:
+            # No resume to add it to; reject the row and keep reading
+            number += 1
+            yield ImportRecord(number, resume=None, errors={
+                'record': [f'Line {reader.line_num}: a {kind} row must follow a resume row.'],
+            })
+        else:
+            raise ImportFormatError(f'Line {reader.line_num}: unexpected record type {kind!r}')
+    if record is not None:
+        yield record
+
+
+def iter_records(fh, fmt):
+    """Records of an open text file in `fmt` ('json' or 'csv')"""
+    return iter_csv_records(fh) if fmt == 'csv' else iter_json_records(fh)
+
+
+def detect_format(filename):
+    return 'csv' if filename.lower().endswith('.csv') else 'json'
+
+
+# Validation and saving
+
+def _form_errors(form, prefix=''):
+    return {f'{prefix}{name}': list(messages) for name, messages in form.errors.items()}
+
+
+def validate_record(record):
+    """
+    Validate a record with the editor's forms.
+
+    Returns (resume, {section model: [rows]}, errors); the instances are unsaved and only
+    meaningful when `errors` is empty.
+    """
+    if record.errors:
+        return None, {}, record.errors
+    if record.resume is None:
+        return None, {}, {'__all__': ['Not a JSON object.']}
+    form = ResumeForm(record.resume)
+    errors = {} if form.is_valid() else _form_errors(form)
+    rows = {}
+    for section, items in record.sections.items():
+        form_class = SECTION_FORMS[section]
+        for index, item in enumerate(items):
+            row_form = form_class(item)
+            if row_form.is_valid():
+                row = row_form.save(commit=False)
+                row.order = index
+                rows.setdefault(form_class._meta.model, []).append(row)
+            else:
+                errors.update(_form_errors(row_form, f'{section}[{index}].'))
+    resume = form.save(commit=False) if not errors else None
+    return resume, rows, errors
+
+
+def save_chunk(chunk, user):
+    """Insert a chunk of validated (resume, rows) pairs in one transaction"""
+    resumes = [resume for resume, _ in chunk]
+    by_model = {}
+    for resume, rows in chunk:
+        resume.user = user
+        for model, model_rows in rows.items():
+            for row in model_rows:
+                row.resume = resume
+            by_model.setdefault(model, []).extend(model_rows)
+
+    with transaction.atomic():
+        Resume.objects.bulk_create(resumes)
+        for model, rows in by_model.items():
+            model.objects.bulk_create(rows)
+        # bulk_create sends no signals, so do what they and save_resume would
+        sync_resume_skills(*resumes)
+        sync_project_technologies(*by_model.get(Project, []))
+        schedule_index(*(resume.pk for resume in resumes))
+
+
+def import_resumes(records, user, batch_size=DEFAULT_BATCH_SIZE, dry_run=False, on_error=None, on_progress=None):
+    """
+    Validate and insert `records` (an iterable of ImportRecord) as resumes owned by `user`.
+
+    `on_error(number, errors)` is called for every rejected record and `on_progress(report)`
+    after every chunk. With `dry_run` nothing is written. A file that stops parsing ends
+    the import with `report.fatal` set; the chunks before it stay imported.
+    """
+    report = ImportReport(dry_run=dry_run)
+    started = time.perf_counter()
+    chunk = []
+
+    def reject(number, errors):
+        report.failed += 1
+        if len(report.errors) < MAX_KEPT_ERRORS:
+            report.errors.append((number, errors))
+        if on_error:
+            on_error(number, errors)
+
+    def flush():
+        if chunk:
+            if dry_run:
+                report.imported += len(chunk)
+            else:
+                try:
+                    save_chunk([(resume, rows) for _, resume, rows in chunk], user)
+                    report.imported += len(chunk)
+                except DatabaseError as exc:
+                    for number, _, _ in chunk:
+                        reject(number, {'__all__': [f'Database error: {exc}']})
+            report.batches += 1
+            chunk.clear()
+        report.seconds = time.perf_counter() - started
+        if on_progress:
+            on_progress(report)
+
+    try:
+        for record in records:
+            report.read += 1
+            resume, rows, errors = validate_record(record)
+            if errors:
+                reject(record.number, errors)
+                continue
+            chunk.append((record.number, resume, rows))
+            if len(chunk) >= batch_size:
+                flush()
+    except (ImportFormatError, csv.Error, UnicodeDecodeError) as exc:
+        report.fatal = str(exc)
+    flush()
+    return report
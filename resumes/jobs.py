@@ -0,0 +1,111 @@
+"""
+DB-backed PDF render queue.
+
+Views enqueue a RenderJob and return immediately; the render_pdfs management command
+claims pending jobs, renders the HTML in-process and hands the CPU-bound xhtml2pdf step
+to a process pool. No external broker is needed.
+
+Finished PDFs are also written to the PDF cache under the job's version, so the download
+view serves them without rendering again; finished jobs are pruned after a while.
+"""
+from django.conf import settings
+from django.core.cache import caches
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from .models import RenderJob
+from .utils import PDF_TEMPLATE, render_html, html_to_pdf, pdf_cache_key
+
+
+def enqueue_render(resume):
+    """
+    Queue a PDF render for the current version of a resume.
+
+    Jobs are deduplicated on (resume, version): asking twice for the same version returns
+    the existing job, and a previously failed job is put back on the queue.
+    """
+    version = pdf_cache_key(PDF_TEMPLATE, resume)
+    try:
+        with transaction.atomic():
+            job, created = RenderJob.objects.get_or_create(resume=resume, version=version)
+    except IntegrityError:
+        # Lost a race with a concurrent enqueue of the same version
+        job = RenderJob.objects.get(resume=resume, version=version)
+    if job.status == RenderJob.STATUS_FAILED:
+        RenderJob.objects.filter(pk=job.pk, status=RenderJob.STATUS_FAILED).update(
+            status=RenderJob.STATUS_PENDING, error='', finished_at=None,
+        )
+        job.refresh_from_db()
+    return job
+
+
+def claim_jobs(limit):
+    """Atomically move up to `limit` pending jobs to running and return them"""
+    claimed = []
+    candidates = RenderJob.objects.filter(status=RenderJob.STATUS_PENDING).values_list('pk', flat=True)[:limit]
+    for pk in list(candidates):
+        # The conditional update only succeeds for one worker, so no row is rendered twice
+        updated = RenderJob.objects.filter(pk=pk, status=RenderJob.STATUS_PENDING).update(
+            status=RenderJob.STATUS_RUNNING, started_at=timezone.now(),
+        )
+        if updated:
+            claimed.append(pk)
+    return list(RenderJob.objects.filter(pk__in=claimed).select_related('resume').defer('pdf'))
+
+
+def is_superseded(job):
+    """Whether the resume changed after the job was queued, so its version is out of date"""
+    return pdf_cache_key(PDF_TEMPLATE, job.resume) != job.version
+
+
+def supersede_job(job):
+    job.status = RenderJob.STATUS_SUPERSEDED
+    job.error = 'The resume changed after this render was queued.'
+    job.finished_at = timezone.now()
+    job.save(update_fields=['status', 'error', 'finished_at'])
+
+
+def render_job_html(job):
+    return render_html(PDF_TEMPLATE, {'resume': job.resume.prefetch_sections()})
+
+
+def finish_job(job, pdf_bytes, error=''):
+    if pdf_bytes:
+        job.pdf = pdf_bytes
+        job.status = RenderJob.STATUS_DONE
+        job.error = ''
+        caches[settings.PDF_CACHE_ALIAS].set(job.version, pdf_bytes)
+    else:
+        job.status = RenderJob.STATUS_FAILED
+        job.error = error or 'PDF generation failed with xhtml2pdf.'
+    job.attempts += 1
+    job.finished_at = timezone.now()
+    job.save(update_fields=['pdf', 'status', 'error', 'attempts', 'finished_at'])
+
+
+def requeue_stale_jobs(older_than):
+    """Put jobs left running by a crashed worker back on the queue"""
+    return RenderJob.objects.filter(
+        status=RenderJob.STATUS_RUNNING, started_at__lt=timezone.now() - older_than,
+    ).update(status=RenderJob.STATUS_PENDING, started_at=None)
+
+
+def prune_finished_jobs(older_than):
+    """Delete jobs, and the PDFs stored on them, that finished more than `older_than` ago"""
+    deleted, _ = RenderJob.objects.filter(
+        status__in=RenderJob.FINISHED_STATUSES, finished_at__lt=timezone.now() - older_than,
+    ).delete()
+    return deleted
+
+
+def worker_init():
+    """Process pool initializer: make Django usable in spawned workers"""
+    import django
+    from django.apps import apps
+    if not apps.ready:
+        django.setup()
+    from .pdf_engine import get_engine
+    get_engine(PDF_TEMPLATE).warm()
+
+
+def render_in_worker(html):
+    return html_to_pdf(html)
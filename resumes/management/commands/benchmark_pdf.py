@@ -0,0 +1,72 @@
+import statistics
+import time
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.template.loader import get_template
+from accounts.models import User
+from resumes.models import Resume, Education, WorkExperience, Certification, Project
+from resumes.pdf_engine import get_engine
+from resumes.utils import PDF_TEMPLATE, html_to_pdf
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Render the same resume repeatedly, with and without the cached PDF engine'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=500)
+        parser.add_argument('--resume', help='Id of an existing resume (a synthetic one is used by default)')
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                resume = self._resume(options['resume'])
+                self._run(resume, options['iterations'])
+                raise Rollback
+        except Rollback:
+            pass
+
+    def _resume(self, resume_id):
+        if resume_id:
+            return Resume.objects.with_sections().get(pk=resume_id)
+        user = User.objects.create_user(username='pdf-bench', email='pdf-bench@example.com', password=None)
+        resume = Resume.objects.create(
+            user=user, full_name='Bench Mark', email='bench@example.com', phone='9800000000',
+            address='Kathmandu', skills='Python, Django, SQL, Docker, React',
+        )
+        for i in range(4):
+            Education.objects.create(resume=resume, institution=f'University {i}', degree='BSc', order=i)
+            WorkExperience.objects.create(
+                resume=resume, company=f'Company {i}', position='Engineer', order=i,
+                description='Built things\nShipped things\nFixed things',
+            )
+            Certification.objects.create(resume=resume, title=f'Certification {i}', order=i)
+            Project.objects.create(resume=resume, name=f'Project {i}', technologies='Python, Django', order=i)
+        return Resume.objects.with_sections().get(pk=resume.pk)
+
+    def _run(self, resume, iterations):
+        context = {'resume': resume}
+
+        def legacy():
+            html_to_pdf(get_template(PDF_TEMPLATE).render(context))
+
+        engine = get_engine(PDF_TEMPLATE)
+
+        def cached():
+            html_to_pdf(engine.warm().render_html(context))
+
+        for label, fn in (('get_template per render', legacy), ('cached PDFEngine', cached)):
+            timings = []
+            for _ in range(iterations):
+                start = time.perf_counter()
+                fn()
+                timings.append((time.perf_counter() - start) * 1000)
+            timings.sort()
+            self.stdout.write(
+                f'{label}: n={iterations} total={sum(timings) / 1000:.2f}s '
+                f'mean={statistics.mean(timings):.2f}ms p50={timings[len(timings) // 2]:.2f}ms '
+                f'p95={timings[int(len(timings) * 0.95) - 1]:.2f}ms'
+            )
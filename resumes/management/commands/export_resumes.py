@@ -0,0 +1,38 @@
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from resumes.export import resume_zip_stream
+from resumes.models import Resume
+
+
+class Command(BaseCommand):
+    help = 'Export resumes as a ZIP archive of PDFs rendered in parallel'
+
+    def add_arguments(self, parser):
+        parser.add_argument('ids', nargs='*', help='Resume ids to export')
+        parser.add_argument('--user', help='Export every resume belonging to this email address')
+        parser.add_argument('--output', '-o', default='resumes.zip', help='Path of the ZIP file to write')
+        parser.add_argument('--workers', type=int, default=2, help='Number of render processes')
+
+    def handle(self, *args, **options):
+        resumes = Resume.objects.all()
+        if options['ids']:
+            resumes = resumes.filter(id__in=options['ids'])
+        if options['user']:
+            resumes = resumes.filter(user__email=options['user'])
+        if not options['ids'] and not options['user']:
+            raise CommandError('Pass resume ids or --user.')
+
+        try:
+            resumes = resumes.with_sections().iterator(chunk_size=50)
+            failed = []
+            written = 0
+            with open(options['output'], 'wb') as fh:
+                for chunk in resume_zip_stream(resumes, workers=options['workers'], errors=failed):
+                    fh.write(chunk)
+                    written += len(chunk)
+        except ValidationError as exc:
+            raise CommandError(f'Invalid resume id: {exc}')
+
+        self.stdout.write(f"Wrote {written} bytes to {options['output']}")
+        for resume in failed:
+            self.stderr.write(f'Failed: {resume.id} ({resume})')
@@ -0,0 +1,68 @@
+import csv
+import json
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from resumes.importer import DEFAULT_BATCH_SIZE, detect_format, import_resumes, iter_records
+
+
+class Command(BaseCommand):
+    help = 'Import resumes from a JSON Resume (object, array or JSON Lines) or CSV file in batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='File to import')
+        parser.add_argument('--user', required=True, help='Email address of the account that will own the resumes')
+        parser.add_argument('--format', choices=['auto', 'json', 'csv'], default='auto',
+                            help='File format; auto picks csv for .csv files and json otherwise')
+        parser.add_argument('--batch', type=int, default=DEFAULT_BATCH_SIZE, help='Resumes per transaction')
+        parser.add_argument('--dry-run', action='store_true', help='Validate the file without writing anything')
+        parser.add_argument('--errors', help='Write every rejected record to this CSV file (record, field, message)')
+
+    def handle(self, *args, **options):
+        try:
+            user = get_user_model().objects.get(email=options['user'])
+        except get_user_model().DoesNotExist:
+            raise CommandError(f"No user with email {options['user']}.")
+        if options['batch'] < 1:
+            raise CommandError('--batch must be at least 1.')
+        fmt = options['format']
+        if fmt == 'auto':
+            fmt = detect_format(options['path'])
+
+        error_file = open(options['errors'], 'w', newline='', encoding='utf-8') if options['errors'] else None
+        error_writer = csv.writer(error_file) if error_file else None
+        if error_writer:
+            error_writer.writerow(['record', 'field', 'message'])
+
+        def on_error(number, errors):
+            if error_writer:
+                for name, messages in errors.items():
+                    for message in messages:
+                        error_writer.writerow([number, name, message])
+            else:
+                self.stderr.write(f'Record {number}: {json.dumps(errors)}')
+
+        def on_progress(report):
+            self.stdout.write(
+                f'{report.read} read, {report.imported} imported, {report.failed} failed '
+                f'({report.rate:.0f} records/s)'
+            )
+
+        try:
+            with open(options['path'], newline='', encoding='utf-8-sig') as fh:
+                report = import_resumes(
+                    iter_records(fh, fmt), user, batch_size=options['batch'], dry_run=options['dry_run'],
+                    on_error=on_error, on_progress=on_progress,
+                )
+        except OSError as exc:
+            raise CommandError(str(exc))
+        finally:
+            if error_file:
+                error_file.close()
+
+        verb = 'Validated' if report.dry_run else 'Imported'
+        self.stdout.write(self.style.SUCCESS(
+            f'{verb} {report.imported} of {report.read} resumes in {report.batches} batches '
+            f'({report.seconds:.1f}s); {report.failed} rejected.'
+        ))
+        if report.fatal:
+            raise CommandError(f'Stopped after record {report.read}: {report.fatal}')
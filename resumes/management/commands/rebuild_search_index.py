@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+from resumes.search import fts_available, rebuild_index
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the full-text resume search index from scratch'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch', type=int, default=500, help='Resume ids fetched per query')
+
+    def handle(self, *args, **options):
+        backend = 'SQLite FTS5' if fts_available() else 'token index'
+        count = rebuild_index(batch_size=options['batch'])
+        self.stdout.write(f'Indexed {count} resumes ({backend})')
@@ -0,0 +1,68 @@
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import timedelta
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connections
+from resumes.jobs import (
+    claim_jobs, finish_job, is_superseded, prune_finished_jobs, render_job_html, render_in_worker,
+    requeue_stale_jobs, supersede_job, worker_init,
+)
+
+# Seconds between prunes of finished jobs while the worker runs
+PRUNE_INTERVAL = 300
+
+
+class Command(BaseCommand):
+    help = 'Process queued resume PDF render jobs using a pool of worker processes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=2, help='Number of render processes')
+        parser.add_argument('--batch', type=int, default=10, help='Jobs claimed per poll')
+        parser.add_argument('--poll-interval', type=float, default=1.0, help='Seconds to sleep when the queue is empty')
+        parser.add_argument('--stale-after', type=int, default=300, help='Requeue running jobs older than this many seconds')
+        parser.add_argument('--keep-finished', type=int, default=86400,
+                            help='Delete finished jobs and their PDFs this many seconds after they finish (0 keeps them)')
+        parser.add_argument('--once', action='store_true', help='Drain the queue once and exit')
+
+    def handle(self, *args, **options):
+        stale_after = timedelta(seconds=options['stale_after'])
+        keep_finished = timedelta(seconds=options['keep_finished'])
+        next_prune = 0
+        # Worker processes never touch the database, so drop connections before forking
+        connections.close_all()
+        with ProcessPoolExecutor(max_workers=options['workers'], initializer=worker_init) as pool:
+            requeue_stale_jobs(stale_after)
+            while True:
+                close_old_connections()
+                if keep_finished and time.monotonic() >= next_prune:
+                    pruned = prune_finished_jobs(keep_finished)
+                    if pruned:
+                        self.stdout.write(f'Pruned {pruned} finished jobs')
+                    next_prune = time.monotonic() + PRUNE_INTERVAL
+                jobs = claim_jobs(options['batch'])
+                if not jobs:
+                    if options['once']:
+                        break
+                    time.sleep(options['poll_interval'])
+                    continue
+
+                futures = {}
+                for job in jobs:
+                    if is_superseded(job):
+                        # The resume changed since it was queued; enqueue_render makes a job for the new version
+                        supersede_job(job)
+                        self.stdout.write(f'{job.pk}: {job.status}')
+                        continue
+                    try:
+                        html = render_job_html(job)
+                    except Exception as exc:
+                        finish_job(job, None, error=str(exc))
+                        continue
+                    futures[job] = pool.submit(render_in_worker, html)
+
+                for job, future in futures.items():
+                    try:
+                        finish_job(job, future.result())
+                    except Exception as exc:
+                        finish_job(job, None, error=str(exc))
+                    self.stdout.write(f'{job.pk}: {job.status}')
@@ -0,0 +1,38 @@
+# Generated by Django 4.2.7 on 2026-10-17 17:10
+
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resumes', '0004_project_certification'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RenderJob',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('version', models.CharField(help_text='PDF cache key of the resume version being rendered', max_length=100)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('done', 'Done'), ('failed', 'Failed')], default='pending', max_length=10)),
+                ('pdf', models.BinaryField(blank=True, null=True)),
+                ('error', models.TextField(blank=True)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('resume', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='render_jobs', to='resumes.resume')),
+            ],
+            options={
+                'ordering': ['created_at'],
+                'indexes': [models.Index(fields=['status', 'created_at'], name='renderjob_status_created_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='renderjob',
+            constraint=models.UniqueConstraint(fields=('resume', 'version'), name='unique_render_job_per_resume_version'),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 4.2.7 on 2026-10-17 17:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resumes', '0005_renderjob'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='certification',
+            index=models.Index(fields=['resume', 'order', '-issue_date'], name='certification_resume_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='education',
+            index=models.Index(fields=['resume', 'order', '-start_date'], name='education_resume_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='extracurricularactivity',
+            index=models.Index(fields=['resume', 'order', '-start_date'], name='activity_resume_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['resume', 'order', '-start_date'], name='project_resume_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='resume',
+            index=models.Index(fields=['user', '-updated_at', '-id'], include=('title', 'full_name', 'created_at'), name='resume_user_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='workexperience',
+            index=models.Index(fields=['resume', 'order', '-start_date'], name='workexp_resume_order_idx'),
+        ),
+    ]
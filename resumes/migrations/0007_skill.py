@@ -0,0 +1,78 @@
+# Generated by Django 4.2.7 on 2026-10-17 17:21
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resumes', '0006_ordered_lookup_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Skill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('normalized_name', models.CharField(editable=False, max_length=100, unique=True)),
+            ],
+            options={
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ResumeSkill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('label', models.CharField(help_text='Skill as written on this resume', max_length=100)),
+                ('order', models.PositiveIntegerField(default=0)),
+                ('resume', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='resume_skills', to='resumes.resume')),
+                ('skill', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='resume_skills', to='resumes.skill')),
+            ],
+            options={
+                'ordering': ['order'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ProjectTechnology',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('label', models.CharField(help_text='Technology as written on this project', max_length=100)),
+                ('order', models.PositiveIntegerField(default=0)),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='project_technologies', to='resumes.project')),
+                ('skill', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='project_technologies', to='resumes.skill')),
+            ],
+            options={
+                'verbose_name_plural': 'project technologies',
+                'ordering': ['order'],
+            },
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='technology_tags',
+            field=models.ManyToManyField(blank=True, help_text='Normalized copy of technologies, kept in sync on save', related_name='projects', through='resumes.ProjectTechnology', to='resumes.skill'),
+        ),
+        migrations.AddField(
+            model_name='resume',
+            name='skill_tags',
+            field=models.ManyToManyField(blank=True, help_text='Normalized copy of skills, kept in sync on save', related_name='resumes', through='resumes.ResumeSkill', to='resumes.skill'),
+        ),
+        migrations.AddIndex(
+            model_name='resumeskill',
+            index=models.Index(fields=['skill', 'resume'], name='resumeskill_skill_resume_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='resumeskill',
+            constraint=models.UniqueConstraint(fields=('resume', 'skill'), name='unique_resume_skill'),
+        ),
+        migrations.AddIndex(
+            model_name='projecttechnology',
+            index=models.Index(fields=['skill', 'project'], name='projecttech_skill_project_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='projecttechnology',
+            constraint=models.UniqueConstraint(fields=('project', 'skill'), name='unique_project_technology'),
+        ),
+    ]
@@ -0,0 +1,60 @@
+from django.db import migrations
+
+BATCH_SIZE = 500
+
+
+def _normalize(name):
+    # Copy of Skill.normalize; migrations must not import app code
+    return ' '.join(name.split()).casefold()[:100]
+
+
+def _parse(text):
+    # Same names and keys as resumes.skills.parse_skills
+    names, seen = [], set()
+    for part in (text or '').split(','):
+        name = ' '.join(part.split())[:100].rstrip()
+        key = _normalize(name)
+        if name and key not in seen:
+            seen.add(key)
+            names.append((key, name))
+    return names
+
+
+def _populate(apps, owner_model, text_field, link_model, owner_field):
+    Skill = apps.get_model('resumes', 'Skill')
+    Owner = apps.get_model('resumes', owner_model)
+    Link = apps.get_model('resumes', link_model)
+    skills = {skill.normalized_name: skill for skill in Skill.objects.all()}
+    links = []
+    for owner in Owner.objects.only('pk', text_field).iterator(chunk_size=BATCH_SIZE):
+        for position, (key, name) in enumerate(_parse(getattr(owner, text_field))):
+            skill = skills.get(key)
+            if skill is None:
+                skill = skills[key] = Skill.objects.create(name=name, normalized_name=key)
+            links.append(Link(**{f'{owner_field}_id': owner.pk}, skill=skill, label=name, order=position))
+        if len(links) >= BATCH_SIZE:
+            Link.objects.bulk_create(links, ignore_conflicts=True)
+            links = []
+    Link.objects.bulk_create(links, ignore_conflicts=True)
+
+
+def populate_skills(apps, schema_editor):
+    _populate(apps, 'Resume', 'skills', 'ResumeSkill', 'resume')
+    _populate(apps, 'Project', 'technologies', 'ProjectTechnology', 'project')
+
+
+def clear_skills(apps, schema_editor):
+    apps.get_model('resumes', 'ResumeSkill').objects.all().delete()
+    apps.get_model('resumes', 'ProjectTechnology').objects.all().delete()
+    apps.get_model('resumes', 'Skill').objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resumes', '0007_skill'),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_skills, clear_skills),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 4.2.7 on 2026-10-17 17:22
+
+from django.db import migrations, models
+from django.db.utils import OperationalError
+import django.db.models.deletion
+
+FTS_TABLE = 'resumes_resume_fts'
+
+
+def create_fts_table(apps, schema_editor):
+    """Create the FTS5 index on SQLite builds that have it; other setups use ResumeSearchToken"""
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    try:
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+            "resume_id UNINDEXED, title, full_name, skills, body, tokenize='porter unicode61')"
+        )
+    except OperationalError:
+        pass
+
+
+def drop_fts_table(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resumes', '0008_populate_skills'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResumeSearchToken',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('token', models.CharField(max_length=64)),
+                ('weight', models.PositiveIntegerField(default=1)),
+                ('resume', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_tokens', to='resumes.resume')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='resumesearchtoken',
+            constraint=models.UniqueConstraint(fields=('token', 'resume'), name='unique_search_token_per_resume'),
+        ),
+        migrations.RunPython(create_fts_table, drop_fts_table),
+    ]
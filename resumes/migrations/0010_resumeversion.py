@@ -0,0 +1,33 @@
+# Generated by Django 4.2.7 on 2026-10-17 17:40
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resumes', '0009_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResumeVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('number', models.PositiveIntegerField()),
+                ('label', models.CharField(blank=True, max_length=100)),
+                ('is_keyframe', models.BooleanField(default=False)),
+                ('data', models.JSONField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('resume', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='versions', to='resumes.resume')),
+            ],
+            options={
+                'ordering': ['-number'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='resumeversion',
+            constraint=models.UniqueConstraint(fields=('resume', 'number'), name='unique_resume_version_number'),
+        ),
+    ]
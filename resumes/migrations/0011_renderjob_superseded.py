@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-17 18:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resumes', '0010_resumeversion'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='renderjob',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('done', 'Done'), ('failed', 'Failed'), ('superseded', 'Superseded')], default='pending', max_length=10),
+        ),
+    ]
@@ -4,6 +4,22 @@ import uuid
 
 User = get_user_model()
 
+# Reverse relations holding a resume's sections, in display order
+SECTION_RELATIONS = ('education', 'work_experience', 'extracurricular_activities', 'certifications', 'projects')
+
+
+class ResumeQuerySet(models.QuerySet):
+    def with_sections(self):
+        """Prefetch every section so rendering a resume costs one query per relation"""
+        return self.prefetch_related(
+            *SECTION_RELATIONS,
+            'resume_skills',
+        )
+
+    def with_skill(self, name):
+        """Resumes listing the given skill (case-insensitive), via the skill index"""
+        return self.filter(resume_skills__skill__normalized_name=Skill.normalize(name)).distinct()
+
 
 class Resume(models.Model):
     """Main resume model"""
@@ -22,20 +38,44 @@ class Resume(models.Model):
     
     # Skills
     skills = models.TextField(help_text="Enter skills separated by commas")
+    skill_tags = models.ManyToManyField(
+        'Skill', through='ResumeSkill', related_name='resumes', blank=True,
+        help_text="Normalized copy of skills, kept in sync on save",
+    )
     
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = ResumeQuerySet.as_manager()
+    
     class Meta:
         ordering = ['-updated_at']
+        indexes = [
+            # Dashboard listing: a user's resumes newest first, keyset-paginated on (updated_at, id)
+            models.Index(
+                fields=['user', '-updated_at', '-id'],
+                include=['title', 'full_name', 'created_at'],
+                name='resume_user_updated_idx',
+            ),
+        ]
     
     def __str__(self):
         return f"{self.title} - {self.full_name}"
     
+    def prefetch_sections(self):
+        """Load every section of an already fetched resume in one query per relation"""
+        models.prefetch_related_objects(
+            [self], *SECTION_RELATIONS, 'resume_skills',
+        )
+        return self
+    
     @property
     def skills_list(self):
-        """Return skills as a list"""
+        """Return skills as a list, from the prefetched skill rows when available"""
+        prefetched = getattr(self, '_prefetched_objects_cache', {}).get('resume_skills')
+        if prefetched:
+            return [link.label for link in prefetched]
         return [skill.strip() for skill in self.skills.split(',') if skill.strip()]
 
 
@@ -54,6 +94,9 @@ class Education(models.Model):
     
     class Meta:
         ordering = ['order', '-start_date']
+        indexes = [
+            models.Index(fields=['resume', 'order', '-start_date'], name='education_resume_order_idx'),
+        ]
     
     def __str__(self):
         return f"{self.degree} at {self.institution}"
@@ -73,6 +116,9 @@ class WorkExperience(models.Model):
     
     class Meta:
         ordering = ['order', '-start_date']
+        indexes = [
+            models.Index(fields=['resume', 'order', '-start_date'], name='workexp_resume_order_idx'),
+        ]
     
     def __str__(self):
         return f"{self.position} at {self.company}"
@@ -91,6 +137,9 @@ class ExtracurricularActivity(models.Model):
     
     class Meta:
         ordering = ['order', '-start_date']
+        indexes = [
+            models.Index(fields=['resume', 'order', '-start_date'], name='activity_resume_order_idx'),
+        ]
     
     def __str__(self):
         return self.title
@@ -110,6 +159,9 @@ class Certification(models.Model):
 
     class Meta:
         ordering = ['order', '-issue_date']
+        indexes = [
+            models.Index(fields=['resume', 'order', '-issue_date'], name='certification_resume_order_idx'),
+        ]
 
     def __str__(self):
         return self.title
@@ -125,10 +177,161 @@ class Project(models.Model):
     end_date = models.DateField(null=True, blank=True)
     description = models.TextField(blank=True)
     technologies = models.TextField(blank=True, help_text="Comma-separated technologies")
+    technology_tags = models.ManyToManyField(
+        'Skill', through='ProjectTechnology', related_name='projects', blank=True,
+        help_text="Normalized copy of technologies, kept in sync on save",
+    )
     order = models.PositiveIntegerField(default=0)
 
     class Meta:
         ordering = ['order', '-start_date']
+        indexes = [
+            models.Index(fields=['resume', 'order', '-start_date'], name='project_resume_order_idx'),
+        ]
+
+    def __str__(self):
+        return self.name
+
+
+class Skill(models.Model):
+    """A distinct skill or technology, shared by every resume and project that lists it"""
+    name = models.CharField(max_length=100)
+    normalized_name = models.CharField(max_length=100, unique=True, editable=False)
+
+    class Meta:
+        ordering = ['name']
 
     def __str__(self):
         return self.name
+
+    @staticmethod
+    def normalize(name):
+        return ' '.join(name.split()).casefold()[:100]
+
+    def save(self, *args, **kwargs):
+        self.normalized_name = self.normalize(self.name)
+        super().save(*args, **kwargs)
+
+
+class ResumeSkill(models.Model):
+    """Position of a skill within a resume's skill list"""
+    resume = models.ForeignKey(Resume, on_delete=models.CASCADE, related_name='resume_skills')
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name='resume_skills')
+    label = models.CharField(max_length=100, help_text="Skill as written on this resume")
+    order = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ['order']
+        constraints = [
+            models.UniqueConstraint(fields=['resume', 'skill'], name='unique_resume_skill'),
+        ]
+        indexes = [
+            models.Index(fields=['skill', 'resume'], name='resumeskill_skill_resume_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.label} ({self.resume_id})"
+
+
+class ProjectTechnology(models.Model):
+    """Position of a technology within a project's technology list"""
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='project_technologies')
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name='project_technologies')
+    label = models.CharField(max_length=100, help_text="Technology as written on this project")
+    order = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ['order']
+        verbose_name_plural = 'project technologies'
+        constraints = [
+            models.UniqueConstraint(fields=['project', 'skill'], name='unique_project_technology'),
+        ]
+        indexes = [
+            models.Index(fields=['skill', 'project'], name='projecttech_skill_project_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.label} ({self.project_id})"
+
+
+class ResumeSearchToken(models.Model):
+    """Posting in the portable inverted index, used when SQLite FTS5 is not available"""
+    resume = models.ForeignKey(Resume, on_delete=models.CASCADE, related_name='search_tokens')
+    token = models.CharField(max_length=64)
+    weight = models.PositiveIntegerField(default=1)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['token', 'resume'], name='unique_search_token_per_resume'),
+        ]
+
+    def __str__(self):
+        return f"{self.token} ({self.resume_id})"
+
+
+class RenderJob(models.Model):
+    """A queued PDF render of one version of a resume, processed by the render_pdfs command"""
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+    STATUS_SUPERSEDED = 'superseded'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_DONE, 'Done'),
+        (STATUS_FAILED, 'Failed'),
+        (STATUS_SUPERSEDED, 'Superseded'),
+    ]
+    FINISHED_STATUSES = (STATUS_DONE, STATUS_FAILED, STATUS_SUPERSEDED)
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    resume = models.ForeignKey(Resume, on_delete=models.CASCADE, related_name='render_jobs')
+    version = models.CharField(max_length=100, help_text="PDF cache key of the resume version being rendered")
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    pdf = models.BinaryField(null=True, blank=True, editable=False)
+    error = models.TextField(blank=True)
+    attempts = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['created_at']
+        constraints = [
+            models.UniqueConstraint(fields=['resume', 'version'], name='unique_render_job_per_resume_version'),
+        ]
+        indexes = [
+            models.Index(fields=['status', 'created_at'], name='renderjob_status_created_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.resume_id} [{self.status}]"
+
+    @property
+    def is_finished(self):
+        return self.status in self.FINISHED_STATUSES
+
+
+class ResumeVersion(models.Model):
+    """
+    A saved snapshot of a resume and its sections.
+
+    Every `keyframe` version holds the full document in `data`; the versions in between
+    hold a JSON patch against the previous version (see resumes.versions).
+    """
+    resume = models.ForeignKey(Resume, on_delete=models.CASCADE, related_name='versions')
+    number = models.PositiveIntegerField()
+    label = models.CharField(max_length=100, blank=True)
+    is_keyframe = models.BooleanField(default=False)
+    data = models.JSONField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-number']
+        constraints = [
+            models.UniqueConstraint(fields=['resume', 'number'], name='unique_resume_version_number'),
+        ]
+
+    def __str__(self):
+        return f"{self.resume} v{self.number}"
@@ -0,0 +1,27 @@
+"""Opaque keyset cursors over (updated_at, id), shared by the dashboard and the JSON API"""
+import base64
+import binascii
+import uuid
+from datetime import datetime
+from django.db.models import Q
+
+
+def encode_cursor(resume):
+    raw = f"{resume.updated_at.isoformat()}|{resume.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Return (updated_at, id) for a cursor, or None if it is malformed"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+        updated_at, resume_id = raw.split('|', 1)
+        return datetime.fromisoformat(updated_at), uuid.UUID(resume_id)
+    except (ValueError, binascii.Error, UnicodeDecodeError):
+        return None
+
+
+def after_cursor(queryset, position):
+    """Rows after `position` in ('-updated_at', '-id') order"""
+    updated_at, resume_id = position
+    return queryset.filter(Q(updated_at__lt=updated_at) | Q(updated_at=updated_at, id__lt=resume_id))
@@ -0,0 +1,65 @@
+"""
+Per-process PDF rendering engine.
+
+Holds the state that is identical for every resume render so it is built once per process
+instead of once per request: the compiled Django template and a warmed reportlab font
+registry (standard font metrics are otherwise loaded lazily on the first document that
+uses them). Worker processes warm their engine from the pool initializer.
+"""
+import threading
+from django.conf import settings
+from django.template.loader import get_template
+
+try:
+    from reportlab.pdfbase import pdfmetrics
+except Exception:
+    pdfmetrics = None
+
+# Fonts the resume templates resolve to (Arial/Helvetica and xhtml2pdf's serif/mono fallbacks)
+WARM_FONTS = (
+    'Helvetica', 'Helvetica-Bold', 'Helvetica-Oblique', 'Helvetica-BoldOblique',
+    'Times-Roman', 'Times-Bold', 'Courier',
+)
+
+
+class PDFEngine:
+    def __init__(self, template_src):
+        self.template_src = template_src
+        self._template = None
+        self._warmed = False
+
+    @property
+    def template(self):
+        # In DEBUG the template is looked up every time so edits show up without a restart
+        if settings.DEBUG:
+            return get_template(self.template_src)
+        if self._template is None:
+            self._template = get_template(self.template_src)
+        return self._template
+
+    def warm(self):
+        """Compile the template and load font metrics ahead of the first render"""
+        if self._warmed:
+            return self
+        self.template
+        if pdfmetrics is not None:
+            for name in WARM_FONTS:
+                pdfmetrics.getFont(name)
+        self._warmed = True
+        return self
+
+    def render_html(self, context_dict):
+        return self.template.render(context_dict)
+
+
+_engines = {}
+_engines_lock = threading.Lock()
+
+
+def get_engine(template_src):
+    """Return the process-wide engine for a template, creating it on first use"""
+    engine = _engines.get(template_src)
+    if engine is None:
+        with _engines_lock:
+            engine = _engines.setdefault(template_src, PDFEngine(template_src))
+    return engine
@@ -0,0 +1,210 @@
+"""
+Full-text resume search.
+
+Every resume is indexed as one document built from its personal details, skills and all
+five sections. On SQLite builds with FTS5 the document lives in the resumes_resume_fts
+virtual table and is ranked with bm25; everywhere else it is tokenized into
+ResumeSearchToken postings and ranked by matched terms and field weight. The index is
+updated after commit whenever a resume or one of its sections changes (see
+resumes.signals), and can be rebuilt with the rebuild_search_index command.
+"""
+import re
+from collections import Counter
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Count, Sum
+from .models import Resume, ResumeSearchToken
+
+FTS_TABLE = 'resumes_resume_fts'
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+MAX_TOKEN_LENGTH = ResumeSearchToken._meta.get_field('token').max_length
+
+# Field weights, used by both backends (bm25 column weights / posting weights)
+WEIGHTS = {'title': 10, 'full_name': 10, 'skills': 5, 'body': 1}
+
+_fts_available = None
+
+
+def fts_available():
+    global _fts_available
+    if _fts_available is None:
+        _fts_available = (
+            connection.vendor == 'sqlite' and FTS_TABLE in connection.introspection.table_names()
+        )
+    return _fts_available
+
+
+def tokenize(text):
+    return [token[:MAX_TOKEN_LENGTH] for token in TOKEN_RE.findall((text or '').casefold()) if len(token) > 1]
+
+
+def resume_document(resume):
+    """Searchable text of a resume, split into weighted fields"""
+    body = [resume.email, resume.address]
+    for item in resume.education.all():
+        body += [item.institution, item.degree, item.field_of_study, item.description]
+    for item in resume.work_experience.all():
+        body += [item.company, item.position, item.location, item.description]
+    for item in resume.extracurricular_activities.all():
+        body += [item.title, item.organization, item.description]
+    for item in resume.certifications.all():
+        body += [item.title, item.issuer, item.description]
+    for item in resume.projects.all():
+        body += [item.name, item.role, item.description, item.technologies]
+    return {
+        'title': resume.title,
+        'full_name': resume.full_name,
+        'skills': resume.skills,
+        'body': '\n'.join(part for part in body if part),
+    }
+
+
+def index_resume(resume_id):
+    """(Re)index one resume, or drop it from the index if it no longer exists"""
+    index_resumes([resume_id])
+
+
+def index_resumes(resume_ids):
+    """(Re)index several resumes, loading their sections with one query per section"""
+    resume_ids = list(resume_ids)
+    resumes = list(Resume.objects.with_sections().filter(pk__in=resume_ids))
+    found = {str(resume.pk) for resume in resumes}
+    for resume_id in resume_ids:
+        if str(resume_id) not in found:
+            remove_resume(resume_id)
+    if not resumes:
+        return
+    documents = [(resume, resume_document(resume)) for resume in resumes]
+    with transaction.atomic():
+        if fts_available():
+            with connection.cursor() as cursor:
+                # resume_id is UNINDEXED, so each DELETE scans the table; do it once per batch
+                placeholders = ', '.join(['%s'] * len(resumes))
+                cursor.execute(
+                    f"DELETE FROM {FTS_TABLE} WHERE resume_id IN ({placeholders})", [resume.pk.hex for resume in resumes]
+                )
+                cursor.executemany(
+                    f"INSERT INTO {FTS_TABLE} (resume_id, title, full_name, skills, body) VALUES (%s, %s, %s, %s, %s)",
+                    [
+                        [resume.pk.hex, document['title'], document['full_name'], document['skills'], document['body']]
+                        for resume, document in documents
+                    ],
+                )
+        else:
+            postings = []
+            for resume, document in documents:
+                weights = Counter()
+                for field, text in document.items():
+                    for token in tokenize(text):
+                        weights[token] += WEIGHTS[field]
+                postings += [ResumeSearchToken(resume=resume, token=token, weight=weight) for token, weight in weights.items()]
+            ResumeSearchToken.objects.filter(resume__in=resumes).delete()
+            ResumeSearchToken.objects.bulk_create(postings)
+
+
+def remove_resume(resume_id):
+    if fts_available():
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE resume_id = %s", [getattr(resume_id, 'hex', resume_id)])
+    else:
+        ResumeSearchToken.objects.filter(resume_id=resume_id).delete()
+
+
+class _IndexBatch:
+    """Commit hook indexing every resume scheduled during one transaction, once each"""
+
+    def __init__(self):
+        self.resume_ids = {}
+
+    def __call__(self):
+        index_resumes(list(self.resume_ids))
+
+
+def schedule_index(*resume_ids):
+    """
+    Reindex resumes once the current transaction commits.
+
+    Within a transaction all calls share one commit hook, so a resume touched by many
+    section saves is indexed once.
+    """
+    if not getattr(settings, 'SEARCH_INDEX_ON_SAVE', True):
+        return
+    conn = transaction.get_connection()
+    if not conn.in_atomic_block:
+        index_resumes(resume_ids)
+        return
+    batch = getattr(conn, 'search_index_batch', None)
+    # A hook that already ran or was rolled back is gone from run_on_commit
+    if batch is None or not any(hook is batch for _, hook, _ in conn.run_on_commit):
+        batch = conn.search_index_batch = _IndexBatch()
+        transaction.on_commit(batch)
+    batch.resume_ids.update(dict.fromkeys(resume_ids))
+
+
+def rebuild_index(batch_size=500):
+    """Index every resume from scratch; returns the number indexed"""
+    if fts_available():
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {FTS_TABLE}")
+    else:
+        ResumeSearchToken.objects.all().delete()
+    count = 0
+    batch = []
+    for resume_id in Resume.objects.order_by().values_list('pk', flat=True).iterator(chunk_size=batch_size):
+        batch.append(resume_id)
+        if len(batch) >= batch_size:
+            index_resumes(batch)
+            count += len(batch)
+            batch = []
+    if batch:
+        index_resumes(batch)
+        count += len(batch)
+    return count
+
+
+def search_resumes(query, limit=20, user=None):
+    """
+    Return up to `limit` (resume, score) pairs best matching `query`, best first.
+
+    Pass `user` to search only that user's resumes.
+    """
+    tokens = tokenize(query)
+    if not tokens:
+        return []
+    ranked = _search_fts(tokens, limit, user) if fts_available() else _search_tokens(tokens, limit, user)
+    resumes = Resume.objects.in_bulk([resume_id for resume_id, _ in ranked])
+    return [(resumes[resume_id], score) for resume_id, score in ranked if resume_id in resumes]
+
+
+def _search_fts(tokens, limit, user):
+    # Quote every token so user input can't inject FTS syntax; trailing * matches prefixes
+    match = ' '.join(f'"{token}"*' for token in tokens)
+    weights = ', '.join(str(WEIGHTS[field]) for field in ('title', 'full_name', 'skills', 'body'))
+    sql = (
+        f"SELECT f.resume_id, bm25({FTS_TABLE}, 0, {weights}) AS rank FROM {FTS_TABLE} f "
+        f"JOIN {Resume._meta.db_table} r ON r.id = f.resume_id "
+        f"WHERE {FTS_TABLE} MATCH %s"
+    )
+    params = [match]
+    if user is not None:
+        sql += " AND r.user_id = %s"
+        params.append(user.pk)
+    sql += " ORDER BY rank LIMIT %s"
+    params.append(limit)
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+    # bm25 is lower-is-better; flip the sign so higher scores are better for callers
+    return [(Resume._meta.pk.to_python(resume_id), -rank) for resume_id, rank in rows]
+
+
+def _search_tokens(tokens, limit, user):
+    postings = ResumeSearchToken.objects.filter(token__in=set(tokens))
+    if user is not None:
+        postings = postings.filter(resume__user=user)
+    rows = (
+        postings.values('resume_id')
+        .annotate(matched=Count('token'), score=Sum('weight'))
+        .order_by('-matched', '-score')[:limit]
+    )
+    return [(row['resume_id'], row['score']) for row in rows]
@@ -0,0 +1,162 @@
+"""
+Persistence for a resume and its section formsets.
+
+Saving each inline formset separately issues one statement per row and leaves a
+half-saved resume behind if anything fails midway. save_resume diffs every formset
+against the existing rows and applies the changes per model with bulk operations inside
+a single transaction, skipping rows that did not change.
+"""
+from dataclasses import dataclass, field
+from django.db import models, transaction
+from .fragments import bump_section_versions, section_name
+from .models import SECTION_RELATIONS, Project, ProjectTechnology, ResumeSkill
+from .signals import suppress_resume_touch, touch_resume
+from .skills import sync_project_technologies, sync_resume_skills
+
+
+@dataclass
+class SectionChanges:
+    created: list = field(default_factory=list)
+    updated: list = field(default_factory=list)
+    update_fields: set = field(default_factory=set)
+    deleted: list = field(default_factory=list)
+
+    def __bool__(self):
+        return bool(self.created or self.updated or self.deleted)
+
+
+def diff_formset(formset, resume):
+    """Split a validated inline formset into new, changed and deleted rows"""
+    changes = SectionChanges()
+    fk_name = formset.fk.name
+    model_fields = {f.name for f in formset.model._meta.concrete_fields}
+    deleted_forms = set(formset.deleted_forms) if formset.can_delete else set()
+    for form in formset.initial_forms:
+        if form.instance.pk is None:
+            continue
+        if form in deleted_forms:
+            changes.deleted.append(form.instance.pk)
+        elif form.has_changed():
+            changes.updated.append(form.instance)
+            changes.update_fields.update(name for name in form.changed_data if name in model_fields)
+    for form in formset.extra_forms:
+        if not form.has_changed() or form in deleted_forms:
+            continue
+        setattr(form.instance, fk_name, resume)
+        changes.created.append(form.instance)
+    return changes
+
+
+def apply_changes(model, changes):
+    if changes.deleted:
+        model.objects.filter(pk__in=changes.deleted).delete()
+    if changes.updated and changes.update_fields:
+        model.objects.bulk_update(changes.updated, sorted(changes.update_fields))
+    if changes.created:
+        model.objects.bulk_create(changes.created)
+
+
+def save_resume(form, formsets, user=None):
+    """
+    Save a validated ResumeForm and its section formsets in one transaction.
+
+    `formsets` are the inline formsets bound to the resume (already validated). Pass
+    `user` when creating a resume. Returns the saved resume.
+    """
+    resume = form.instance
+    creating = resume._state.adding
+    if user is not None:
+        resume.user = user
+
+    with transaction.atomic(), suppress_resume_touch():
+        if creating or form.has_changed():
+            resume = form.save()
+            resume_saved = True
+            if creating or 'skills' in form.changed_data:
+                sync_resume_skills(resume)
+        else:
+            resume_saved = False
+
+        changed_sections = []
+        for formset in formsets:
+            formset.instance = resume
+            changes = diff_formset(formset, resume)
+            if changes:
+                apply_changes(formset.model, changes)
+                changed_sections.append(section_name(formset.model))
+                if formset.model is Project:
+                    sync_project_technologies(*changes.created, *changes.updated)
+
+        # Bulk writes send no signals, so invalidate the cached section fragments here
+        if changed_sections:
+            bump_section_versions(resume.pk, *changed_sections)
+
+        # Section edits still have to invalidate anything keyed on updated_at
+        if changed_sections and not resume_saved:
+            touch_resume(resume.pk)
+    return resume
+
+
+def _copy(obj, **overrides):
+    """Unsaved copy of a model instance's concrete fields, without its primary key"""
+    values = {
+        f.attname: getattr(obj, f.attname)
+        for f in obj._meta.concrete_fields if not f.primary_key
+    }
+    values.update(overrides)
+    return type(obj)(**values)
+
+
+def duplicate_resume(resume, user=None, title=None):
+    """
+    Copy a resume with all of its sections, skills and project technologies.
+
+    Each model is copied with one bulk_create inside a transaction, so the number of
+    queries does not depend on how many rows the resume has. Returns the new resume.
+    """
+    resume.prefetch_sections()
+    models.prefetch_related_objects(list(resume.projects.all()), 'project_technologies')
+
+    with transaction.atomic(), suppress_resume_touch():
+        clone = _copy(
+            resume, user_id=user.pk if user else resume.user_id,
+            title=title or f'{resume.title} (copy)'[:200],
+        )
+        clone.save(force_insert=True)
+        ResumeSkill.objects.bulk_create([
+            _copy(link, resume_id=clone.pk) for link in resume.resume_skills.all()
+        ])
+        for relation in SECTION_RELATIONS:
+            rows = list(getattr(resume, relation).all())
+            copies = type(rows[0]).objects.bulk_create([_copy(row, resume_id=clone.pk) for row in rows]) if rows else []
+            if relation == 'projects':
+                ProjectTechnology.objects.bulk_create([
+                    _copy(link, project_id=copy.pk)
+                    for row, copy in zip(rows, copies)
+                    for link in row.project_technologies.all()
+                ])
+    return clone
+
+
+def reorder_section(resume, model, row_ids):
+    """
+    Put a resume's rows of one section in the order of `row_ids`.
+
+    Rows not listed keep their relative order after the listed ones. Only rows whose
+    position changes are written, in one bulk_update. Returns the number of rows moved.
+    """
+    rows = {row.pk: row for row in model.objects.filter(resume=resume).only('pk', 'order', 'resume_id')}
+    ordered = [rows.pop(pk) for pk in row_ids if pk in rows]
+    ordered += sorted(rows.values(), key=lambda row: row.order)
+    moved = []
+    for position, row in enumerate(ordered):
+        if row.order != position:
+            row.order = position
+            moved.append(row)
+    if moved:
+        with transaction.atomic():
+            model.objects.bulk_update(moved, ['order'])
+            # bulk_update sends no signals
+            bump_section_versions(resume.pk, section_name(model))
+            touch_resume(resume.pk)
+    return len(moved)
@@ -0,0 +1,71 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from django.db.models import QuerySet
+from django.db.models.signals import post_save, post_delete
+from django.utils import timezone
+from django.db import transaction
+from .models import Resume, Education, WorkExperience, ExtracurricularActivity, Certification, Project
+from .fragments import bump_section_versions, section_name
+from .search import remove_resume, schedule_index
+
+
+SECTION_MODELS = (Education, WorkExperience, ExtracurricularActivity, Certification, Project)
+
+# Set while a caller saves many section rows and takes care of touching the resume itself
+_touch_suppressed = ContextVar('resume_touch_suppressed', default=False)
+
+
+def touch_resume(resume_id):
+    """Bump a resume's updated_at so anything keyed on it (e.g. the PDF cache) is invalidated"""
+    Resume.objects.filter(pk=resume_id).update(updated_at=timezone.now())
+    schedule_index(resume_id)
+
+
+@contextmanager
+def suppress_resume_touch():
+    """Skip per-row touch_resume calls inside the block; the caller bumps the resume once"""
+    token = _touch_suppressed.set(True)
+    try:
+        yield
+    finally:
+        _touch_suppressed.reset(token)
+
+
+def _cascaded(sender, origin):
+    """
+    Whether a section row is being deleted because the delete started elsewhere.
+
+    Section rows only cascade from their resume, so the resume (or its owner) is going
+    too and needs no bookkeeping.
+    """
+    if origin is None:
+        return False
+    model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    return model is not sender
+
+
+def section_changed(sender, instance, **kwargs):
+    """Any change to a child section row counts as a change to its resume"""
+    if kwargs.get('raw', False) or _cascaded(sender, kwargs.get('origin')):
+        return
+    bump_section_versions(instance.resume_id, section_name(sender))
+    if not _touch_suppressed.get():
+        touch_resume(instance.resume_id)
+
+
+def resume_saved(sender, instance, raw=False, **kwargs):
+    if not raw:
+        schedule_index(instance.pk)
+
+
+def resume_deleted(sender, instance, **kwargs):
+    resume_id = instance.pk
+    transaction.on_commit(lambda: remove_resume(resume_id))
+
+
+post_save.connect(resume_saved, sender=Resume, dispatch_uid='resume_saved_search_index')
+post_delete.connect(resume_deleted, sender=Resume, dispatch_uid='resume_deleted_search_index')
+
+for _model in SECTION_MODELS:
+    post_save.connect(section_changed, sender=_model, dispatch_uid=f'section_changed_save_{_model.__name__}')
+    post_delete.connect(section_changed, sender=_model, dispatch_uid=f'section_changed_delete_{_model.__name__}')
@@ -0,0 +1,70 @@
+"""
+Normalized skills.
+
+Resume.skills and Project.technologies stay as the comma-separated text users type; on
+save the text is mirrored into Skill rows (one per distinct skill, matched
+case-insensitively) linked through ResumeSkill / ProjectTechnology, which keep the
+spelling used on that resume and its position.
+That makes "resumes having skill X" an indexed join instead of a LIKE scan.
+"""
+from .models import Skill, ResumeSkill, ProjectTechnology
+
+
+def parse_skills(text):
+    """Split comma-separated text into distinct, stripped names, keeping first-seen order"""
+    names, seen = [], set()
+    for part in (text or '').split(','):
+        # Truncate before keying, so two names differing only past the limit are one skill
+        name = ' '.join(part.split())[:Skill._meta.get_field('name').max_length].rstrip()
+        key = Skill.normalize(name)
+        if name and key not in seen:
+            seen.add(key)
+            names.append(name)
+    return names
+
+
+def get_or_create_skills(names):
+    """Return {normalized name: Skill} for the given names, creating missing ones in bulk"""
+    keys = {Skill.normalize(name): name for name in names}
+    if not keys:
+        return {}
+    existing = {skill.normalized_name: skill for skill in Skill.objects.filter(normalized_name__in=keys)}
+    missing = [Skill(name=name, normalized_name=key) for key, name in keys.items() if key not in existing]
+    if missing:
+        Skill.objects.bulk_create(missing, ignore_conflicts=True)
+        # ignore_conflicts doesn't return pks, and a concurrent insert may have won
+        existing.update(
+            (skill.normalized_name, skill)
+            for skill in Skill.objects.filter(normalized_name__in=[s.normalized_name for s in missing])
+        )
+    return existing
+
+
+def _sync(link_model, owner_field, owners_with_text):
+    """Replace the skill links of each (owner, text) pair whose parsed names changed"""
+    owners_with_text = [(owner, parse_skills(text)) for owner, text in owners_with_text]
+    if not owners_with_text:
+        return
+    owner_ids = [owner.pk for owner, _ in owners_with_text]
+    current = {}
+    for link in link_model.objects.filter(**{f'{owner_field}__in': owner_ids}).order_by('order'):
+        current.setdefault(getattr(link, f'{owner_field}_id'), []).append(link.label)
+
+    changed = [(owner, names) for owner, names in owners_with_text if current.get(owner.pk, []) != names]
+    if not changed:
+        return
+    skills = get_or_create_skills([name for _, names in changed for name in names])
+    link_model.objects.filter(**{f'{owner_field}__in': [owner.pk for owner, _ in changed]}).delete()
+    link_model.objects.bulk_create([
+        link_model(**{owner_field: owner}, skill=skills[Skill.normalize(name)], label=name, order=position)
+        for owner, names in changed
+        for position, name in enumerate(names)
+    ])
+
+
+def sync_resume_skills(*resumes):
+    _sync(ResumeSkill, 'resume', [(resume, resume.skills) for resume in resumes])
+
+
+def sync_project_technologies(*projects):
+    _sync(ProjectTechnology, 'project', [(project, project.technologies) for project in projects])
@@ -0,0 +1,446 @@
+import io
+import json
+from datetime import timedelta
+from unittest import mock, skipUnless
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DatabaseError, connection, transaction
+from django.db.models.signals import post_delete
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from core.benchmarks import make_resumes, make_user, resume_post_data
+from core.dashboard import _page_queryset, get_dashboard_page
+from resumes import services, utils
+from resumes.forms import (
+    CertificationFormSet, EducationFormSet, ExtracurricularActivityFormSet, ProjectFormSet, ResumeForm,
+    WorkExperienceFormSet,
+)
+from resumes.importer import import_resumes, iter_csv_records, iter_json_records
+from resumes.jobs import claim_jobs, enqueue_render, finish_job, is_superseded, prune_finished_jobs
+from resumes.models import (
+    Certification, Education, ExtracurricularActivity, Project, RenderJob, Resume, ResumeVersion, WorkExperience,
+)
+from resumes.search import index_resumes, search_resumes
+from resumes.skills import parse_skills
+from resumes.versions import (
+    KEYFRAME_INTERVAL, apply_patch, make_patch, restore_version, resume_document, snapshot_resume, version_document,
+)
+
+
+class ResumeQueryCountTests(TestCase):
+    """
+    Rendering a resume loads its sections with one prefetch query each, so the number of
+    queries must not grow with the number of rows. The counts match `manage.py benchmark`.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = make_user('queries')
+        cls.resume = make_resumes(cls.user, 1)[0]
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def get(self, name):
+        response = self.client.get(reverse(name, args=[self.resume.pk]))
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def assertNumQueriesWarm(self, num, name):
+        # The first request of a session also loads it into the session cache
+        self.get(name)
+        with self.assertNumQueries(num):
+            self.get(name)
+
+    def test_detail(self):
+        self.assertNumQueriesWarm(3, 'resumes:detail')
+
+    def test_preview(self):
+        self.assertNumQueriesWarm(4, 'resumes:preview')
+
+    def test_download_pdf_uncached(self):
+        self.get('resumes:download_pdf')
+        caches[settings.PDF_CACHE_ALIAS].clear()
+        with self.assertNumQueries(9):
+            self.get('resumes:download_pdf')
+
+    def test_download_pdf_cached(self):
+        self.assertNumQueriesWarm(3, 'resumes:download_pdf')
+
+
+@skipUnless(connection.vendor == 'sqlite', 'Query plans are checked on SQLite')
+class IndexUsageTests(TestCase):
+    """The composite indexes must keep serving the dashboard and section lookups without a sort"""
+
+    SECTION_INDEXES = {
+        Education: 'education_resume_order_idx',
+        WorkExperience: 'workexp_resume_order_idx',
+        ExtracurricularActivity: 'activity_resume_order_idx',
+        Certification: 'certification_resume_order_idx',
+        Project: 'project_resume_order_idx',
+    }
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = make_user('plans')
+        cls.resumes = make_resumes(cls.user, 30)
+
+    def assertUsesIndex(self, queryset, index):
+        plan = queryset.explain()
+        self.assertIn(f'USING INDEX {index}', plan.replace('COVERING INDEX', 'INDEX'))
+        self.assertNotIn('TEMP B-TREE', plan)
+
+    def test_dashboard_keyset_page(self):
+        cursor = get_dashboard_page(self.user, page_size=5).next_cursor
+        queryset, _ = _page_queryset(self.user, cursor)
+        self.assertUsesIndex(queryset[:6], 'resume_user_updated_idx')
+
+    def test_section_prefetches(self):
+        # The query prefetch_related runs for one resume's section
+        for model, index in self.SECTION_INDEXES.items():
+            with self.subTest(model=model.__name__):
+                self.assertUsesIndex(model.objects.filter(resume__in=[self.resumes[0].pk]), index)
+
+
+class ConditionalResponseTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = make_user('conditional')
+        cls.resume = make_resumes(cls.user, 1)[0]
+
+    def setUp(self):
+        self.client.force_login(self.user)
+        self.url = reverse('resumes:preview', args=[self.resume.pk])
+        utils.render_version.cache_clear()
+        self.addCleanup(utils.render_version.cache_clear)
+
+    def test_not_modified_keeps_cache_control(self):
+        etag = self.client.get(self.url)['ETag']
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertIn('no-cache', response['Cache-Control'])
+        self.assertIn('private', response['Cache-Control'])
+
+    def test_render_version_changes_etag(self):
+        with override_settings(RENDER_VERSION='one'):
+            etag = self.client.get(self.url)['ETag']
+        utils.render_version.cache_clear()
+        with override_settings(RENDER_VERSION='two'):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+
+class RenderJobTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = make_user('jobs')
+        cls.resume = make_resumes(cls.user, 1)[0]
+
+    def test_edit_after_enqueue_supersedes_job(self):
+        enqueue_render(self.resume)
+        self.resume.save()
+        job, = claim_jobs(1)
+        self.assertTrue(is_superseded(job))
+
+    def test_finished_pdf_is_cached_and_pruned(self):
+        enqueue_render(self.resume)
+        job, = claim_jobs(1)
+        self.assertFalse(is_superseded(job))
+        finish_job(job, b'%PDF-')
+        self.assertEqual(caches[settings.PDF_CACHE_ALIAS].get(job.version), b'%PDF-')
+        self.assertEqual(prune_finished_jobs(timedelta(hours=1)), 0)
+        self.assertEqual(prune_finished_jobs(timedelta(0)), 1)
+        self.assertFalse(RenderJob.objects.exists())
+
+
+class AdminSearchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = make_user('admin-search')
+        cls.user.is_staff = cls.user.is_superuser = True
+        cls.user.save()
+        # The best match is saved first, so the default newest-first order would list it last
+        resumes = make_resumes(cls.user, 4)
+        for count, resume in enumerate(resumes):
+            resume.title = 'python ' * (4 - count) + 'developer'
+            resume.save()
+        # Saves index on commit, which never comes inside a TestCase
+        index_resumes([resume.pk for resume in resumes])
+
+    def test_results_keep_search_ranking(self):
+        self.client.force_login(self.user)
+        response = self.client.get(reverse('admin:resumes_resume_changelist'), {'q': 'python'})
+        ranked = [resume.pk for resume, _ in search_resumes('python', limit=200)]
+        self.assertEqual(len(ranked), 4)
+        self.assertEqual([resume.pk for resume in response.context['cl'].result_list], ranked)
+
+
+class ParseSkillsTests(SimpleTestCase):
+    def test_names_equal_once_truncated_are_one_skill(self):
+        long_name = 'x' * 100
+        self.assertEqual(parse_skills(f'{long_name}1, {long_name}2, Python, python'), [long_name, 'Python'])
+
+
+class CsvImportTests(TestCase):
+    def test_section_row_before_first_resume_is_rejected_alone(self):
+        user = make_user('importer')
+        rows = io.StringIO(
+            'record,title,full_name,email,phone,address,skills,institution,degree\n'
+            'education,,,,,,,Orphan College,BSc\n'
+            'resume,Engineer,Ada Lovelace,ada@example.com,555-0100,London,Python,,\n'
+        )
+        report = import_resumes(iter_csv_records(rows), user)
+        self.assertEqual((report.read, report.imported, report.failed, report.fatal), (2, 1, 1, ''))
+        number, errors = report.errors[0]
+        self.assertEqual(number, 1)
+        self.assertIn('Line 2', errors['record'][0])
+
+
+class JsonImportTests(TestCase):
+    BASICS = {'name': 'Ada Lovelace', 'email': 'ada@example.com', 'phone': '555-0100', 'location': {'city': 'London'}}
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = make_user('json-importer')
+
+    def run_import(self, *docs):
+        return import_resumes(iter_json_records(io.StringIO(json.dumps(list(docs)))), self.user)
+
+    def test_numeric_date_is_read_as_text(self):
+        doc = {'basics': self.BASICS, 'skills': [{'name': 'Python'}], 'work': [
+            {'name': 'Analytical Engines', 'position': 'Engineer', 'startDate': 2020},
+        ]}
+        report = self.run_import(doc)
+        self.assertEqual((report.imported, report.failed, report.fatal), (1, 0, ''))
+        work = WorkExperience.objects.get(resume__user=self.user)
+        self.assertEqual(work.start_date.isoformat(), '2020-01-01')
+
+    def test_wrong_container_type_rejects_only_that_record(self):
+        good = {'basics': self.BASICS, 'skills': ['Python']}
+        report = self.run_import({'basics': 'Ada'}, {'basics': self.BASICS, 'work': [42]}, good)
+        self.assertEqual((report.read, report.imported, report.failed, report.fatal), (3, 1, 2, ''))
+        self.assertEqual(report.errors, [
+            (1, {'basics': ['Expected an object.']}),
+            (2, {'work[0]': ['Expected an object.']}),
+        ])
+
+
+class ApiTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = make_user('api')
+        cls.resume = make_resumes(cls.user, 1)[0]
+
+    def test_anonymous_requests_get_json_401(self):
+        for url in (reverse('resumes:api_list'), reverse('resumes:api_detail', args=[self.resume.pk])):
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, 401)
+                self.assertEqual(response.json(), {'error': 'Authentication required.'})
+
+    def test_list_not_modified_keeps_cache_control(self):
+        self.client.force_login(self.user)
+        url = reverse('resumes:api_list')
+        etag = self.client.get(url)['ETag']
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertIn('private', response['Cache-Control'])
+        self.assertIn('no-cache', response['Cache-Control'])
+
+
+class EditorPayloadTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = make_user('editor')
+        cls.resume = make_resumes(cls.user, 1)[0]
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def test_non_scalar_values_are_rejected(self):
+        row = self.resume.work_experience.first()
+        url = reverse('resumes:section_row', args=[self.resume.pk, 'work_experience', row.pk])
+        for value in (['x'], {'name': 'x'}):
+            with self.subTest(value=value):
+                response = self.client.patch(url, {'company': value}, content_type='application/json')
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(list(response.json()['errors']), ['company'])
+        row.refresh_from_db()
+        self.assertNotIn('[', row.company)
+        url = reverse('resumes:create_section_row', args=[self.resume.pk, 'work_experience'])
+        response = self.client.post(url, {'company': ['x']}, content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+
+
+class PatchTests(SimpleTestCase):
+    def assertRoundTrip(self, old, new):
+        self.assertEqual(apply_patch(old, make_patch(old, new)), new)
+
+    def test_dicts(self):
+        self.assertRoundTrip({'a': 1, 'b': {'c': 2}}, {'a': 1, 'b': {'c': 3}, 'd': [4]})
+        self.assertRoundTrip({'a': 1, 'b': 2}, {'b': 2})
+
+    def test_lists(self):
+        self.assertRoundTrip([{'x': 1}, {'x': 2}], [{'x': 1}, {'x': 5}, {'x': 3}])
+        self.assertRoundTrip([1, 2, 3], [1])
+        self.assertRoundTrip([], [{'x': 1}])
+
+    def test_unchanged_fields_are_not_stored(self):
+        patch = make_patch({'rows': [{'a': 1, 'b': 2}]}, {'rows': [{'a': 1, 'b': 3}]})
+        self.assertEqual(patch, {'keys': {'rows': {'items': {'0': {'keys': {'b': {'value': 3}}}}, 'length': 1}}})
+
+
+class ResumeVersionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = make_user('versions')
+        cls.resume = make_resumes(cls.user, 1)[0]
+
+    def document(self):
+        return resume_document(Resume.objects.get(pk=self.resume.pk))
+
+    def test_documents_round_trip_across_keyframes(self):
+        expected = {}
+        work = self.resume.work_experience.first()
+        for step in range(KEYFRAME_INTERVAL + 3):
+            Resume.objects.filter(pk=self.resume.pk).update(title=f'Title {step}')
+            if step % 4 == 0:
+                WorkExperience.objects.create(resume=self.resume, company=f'Company {step}', position='Engineer',
+                                              start_date='2020-01-01', order=step + 10)
+            elif step % 4 == 2:
+                WorkExperience.objects.filter(pk=work.pk).update(position=f'Position {step}')
+            version = snapshot_resume(Resume.objects.get(pk=self.resume.pk))
+            expected[version.number] = self.document()
+        keyframes = set(ResumeVersion.objects.filter(is_keyframe=True).values_list('number', flat=True))
+        self.assertEqual(keyframes, {0, KEYFRAME_INTERVAL})
+        for version in ResumeVersion.objects.filter(resume=self.resume):
+            with self.subTest(number=version.number):
+                self.assertEqual(version_document(version), expected[version.number])
+
+    def test_restore_round_trips(self):
+        version = snapshot_resume(self.resume)
+        original = self.document()
+        Resume.objects.filter(pk=self.resume.pk).update(title='Changed')
+        self.resume.work_experience.all().delete()
+        restore_version(version)
+        self.assertEqual(self.document(), original)
+
+    def test_failed_restore_leaves_no_snapshot(self):
+        version = snapshot_resume(self.resume)
+        self.resume.work_experience.all().delete()
+        with mock.patch('resumes.versions.sync_resume_skills', side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                restore_version(version)
+        self.assertEqual(ResumeVersion.objects.filter(resume=self.resume).count(), 1)
+        self.assertFalse(self.resume.work_experience.exists())
+
+
+class SaveResumeTests(TestCase):
+    FORMSETS = (EducationFormSet, WorkExperienceFormSet, ExtracurricularActivityFormSet, CertificationFormSet, ProjectFormSet)
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = make_user('services')
+        cls.resume = make_resumes(cls.user, 1)[0]
+
+    def bind(self, data):
+        resume = Resume.objects.get(pk=self.resume.pk)
+        form = ResumeForm(data, instance=resume)
+        formsets = [formset_class(data, instance=resume) for formset_class in self.FORMSETS]
+        self.assertTrue(form.is_valid() and all(formset.is_valid() for formset in formsets))
+        return form, formsets
+
+    def writes(self, queries):
+        return [q['sql'] for q in queries if q['sql'].split(None, 1)[0] in ('INSERT', 'UPDATE', 'DELETE')]
+
+    def test_rows_created_updated_deleted_and_unchanged(self):
+        rows = list(self.resume.work_experience.all())
+        data = resume_post_data(self.resume)
+        data['work_experience-0-position'] = 'Staff Engineer'
+        data['work_experience-1-DELETE'] = 'on'
+        data['work_experience-5-company'] = 'New Company'
+        data['work_experience-5-position'] = 'Engineer'
+        data['work_experience-5-start_date'] = '2024-01-01'
+        data['work_experience-TOTAL_FORMS'] = '6'
+        form, formsets = self.bind(data)
+
+        changes = services.diff_formset(formsets[1], self.resume)
+        self.assertEqual([row.pk for row in changes.updated], [rows[0].pk])
+        self.assertEqual(changes.update_fields, {'position'})
+        self.assertEqual(changes.deleted, [rows[1].pk])
+        self.assertEqual([row.company for row in changes.created], ['New Company'])
+        for formset in formsets[:1] + formsets[2:]:
+            self.assertFalse(services.diff_formset(formset, self.resume))
+
+        with CaptureQueriesContext(connection) as queries:
+            services.save_resume(form, formsets)
+        # Only the work experience table is written; the resume row is just touched
+        self.assertTrue(all('resumes_workexperience' in sql or 'resumes_resume' in sql for sql in self.writes(queries)))
+        saved = {row.pk: row for row in WorkExperience.objects.filter(resume=self.resume)}
+        self.assertEqual(saved[rows[0].pk].position, 'Staff Engineer')
+        self.assertNotIn(rows[1].pk, saved)
+        for row in rows[2:]:
+            self.assertEqual(saved[row.pk].position, row.position)
+        self.assertEqual(len(saved), len(rows))
+        self.assertTrue(any(row.company == 'New Company' for row in saved.values()))
+
+    def test_unchanged_submission_writes_nothing(self):
+        form, formsets = self.bind(resume_post_data(self.resume))
+        with CaptureQueriesContext(connection) as queries:
+            services.save_resume(form, formsets)
+        self.assertEqual(self.writes(queries), [])
+
+    def test_invalid_formset_saves_nothing(self):
+        self.client.force_login(self.user)
+        data = resume_post_data(self.resume)
+        data['title'] = 'Changed'
+        data['work_experience-0-start_date'] = 'not a date'
+        response = self.client.post(reverse('resumes:edit', args=[self.resume.pk]), data)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Resume.objects.get(pk=self.resume.pk).title, self.resume.title)
+
+    def test_failed_write_rolls_back_every_section(self):
+        data = resume_post_data(self.resume)
+        data['title'] = 'Changed'
+        data['work_experience-0-position'] = 'Staff Engineer'
+        data['projects-0-name'] = 'Renamed'
+        form, formsets = self.bind(data)
+        apply_changes = services.apply_changes
+
+        def fail_on_projects(model, changes):
+            if model is Project:
+                raise DatabaseError('disk full')
+            apply_changes(model, changes)
+
+        with mock.patch('resumes.services.apply_changes', side_effect=fail_on_projects):
+            with self.assertRaises(DatabaseError):
+                services.save_resume(form, formsets)
+        self.assertEqual(Resume.objects.get(pk=self.resume.pk).title, self.resume.title)
+        self.assertFalse(WorkExperience.objects.filter(resume=self.resume, position='Staff Engineer').exists())
+
+
+class SectionSignalTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = make_user('signals')
+        cls.resume = make_resumes(cls.user, 1)[0]
+
+    def test_cascade_delete_skips_section_bookkeeping(self):
+        with CaptureQueriesContext(connection) as queries:
+            Resume.objects.get(pk=self.resume.pk).delete()
+        touches = [q['sql'] for q in queries if q['sql'].startswith('UPDATE "resumes_resume"')]
+        self.assertEqual(touches, [])
+
+    def test_failed_delete_does_not_disable_bookkeeping(self):
+        def fail(**kwargs):
+            raise DatabaseError('disk full')
+
+        post_delete.connect(fail, sender=Project, dispatch_uid='test_fail_delete')
+        self.addCleanup(post_delete.disconnect, dispatch_uid='test_fail_delete', sender=Project)
+        with self.assertRaises(DatabaseError), transaction.atomic():
+            Resume.objects.get(pk=self.resume.pk).delete()
+        before = Resume.objects.get(pk=self.resume.pk).updated_at
+        self.resume.work_experience.first().save()
+        self.assertGreater(Resume.objects.get(pk=self.resume.pk).updated_at, before)
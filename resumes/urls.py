@@ -1,13 +1,27 @@
 from django.urls import path
-from . import views
+from . import api, editor, views
 
 app_name = 'resumes'
 
 urlpatterns = [
     path('create/', views.create_resume, name='create'),
+    path('export/', views.bulk_export, name='bulk_export'),
+    path('search/', views.search, name='search'),
+    path('api/', api.resume_list, name='api_list'),
+    path('api/<uuid:resume_id>/', api.resume_detail, name='api_detail'),
     path('<uuid:resume_id>/', views.resume_detail, name='detail'),
     path('<uuid:resume_id>/edit/', views.edit_resume, name='edit'),
     path('<uuid:resume_id>/delete/', views.delete_resume, name='delete'),
+    path('<uuid:resume_id>/basics/', editor.save_basics, name='save_basics'),
+    path('<uuid:resume_id>/sections/<str:section>/', editor.create_section_row, name='create_section_row'),
+    path('<uuid:resume_id>/sections/<str:section>/order/', editor.reorder_section_rows, name='reorder_section'),
+    path('<uuid:resume_id>/sections/<str:section>/<int:row_id>/', editor.section_row, name='section_row'),
+    path('<uuid:resume_id>/clone/', views.clone_resume, name='clone'),
+    path('<uuid:resume_id>/versions/', views.resume_versions, name='versions'),
+    path('<uuid:resume_id>/versions/<int:number>/restore/', views.restore_resume_version, name='restore_version'),
     path('<uuid:resume_id>/preview/', views.preview_resume, name='preview'),
     path('<uuid:resume_id>/download/', views.download_pdf, name='download_pdf'),
+    path('<uuid:resume_id>/render/', views.render_pdf, name='render_pdf'),
+    path('jobs/<uuid:job_id>/', views.render_job_status, name='render_job_status'),
+    path('jobs/<uuid:job_id>/download/', views.render_job_download, name='render_job_download'),
 ]
@@ -1,13 +1,23 @@
 from django.http import HttpResponse
-from django.template.loader import get_template
 from django.conf import settings
+from django.core.cache import caches
+from asgiref.sync import sync_to_async
+from concurrent.futures import ProcessPoolExecutor
+from functools import cache
 from io import BytesIO
-import os
+from pathlib import Path
+import asyncio
+import hashlib
+from core.metrics import timed
+from .assets import asset_resolver
+from .pdf_engine import get_engine
 try:
     from xhtml2pdf import pisa
 except Exception:
     pisa = None
 
+PDF_TEMPLATE = 'resumes/pdf_template.html'
+
 
 def _try_generate_with_xhtml2pdf(html: str) -> bytes | None:
     if pisa is None:
@@ -21,17 +31,140 @@ def _try_generate_with_xhtml2pdf(html: str) -> bytes | None:
     return pdf
 
 
-def generate_pdf(template_src, context_dict, filename, request=None):
+def render_html(template_src, context_dict) -> str:
+    """Render the PDF template to HTML (needs the database for related sections)"""
+    return get_engine(template_src).warm().render_html(context_dict)
+
+
+def html_to_pdf(html: str) -> bytes | None:
+    """
+    Convert already-rendered HTML to PDF bytes.
+
+    This is the CPU-bound half of PDF generation and touches neither the database nor
+    the request, so it is safe to run in a worker process.
+    """
+    return _try_generate_with_xhtml2pdf(html)
+
+
+def pdf_filename(resume):
+    return f"{resume.full_name.replace(' ', '_')}_Resume.pdf"
+
+
+@cache
+def render_version():
+    """RENDER_VERSION, or a hash of the project's template files when it is not set"""
+    if settings.RENDER_VERSION:
+        return settings.RENDER_VERSION
+    digest = hashlib.sha256()
+    for directory in settings.TEMPLATES[0]['DIRS']:
+        for path in sorted(Path(directory).rglob('*.html')):
+            digest.update(path.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+def pdf_cache_key(template_src, resume):
+    """
+    Cache key for a resume's rendered PDF.
+
+    Keyed on the resume id plus its updated_at stamp, which is bumped on any save of
+    the resume or one of its sections (see resumes.signals), so stale entries are never hit,
+    and on the render version, so a deploy does not serve PDFs of the old templates.
+    """
+    version = f"{render_version()}:{template_src}:{resume.pk}:{resume.updated_at.isoformat()}"
+    return 'resume-pdf:' + hashlib.sha256(version.encode()).hexdigest()
+
+
+def get_cached_pdf(cache_key) -> bytes | None:
+    return caches[settings.PDF_CACHE_ALIAS].get(cache_key)
+
+
+async def aget_cached_pdf(cache_key) -> bytes | None:
+    return await caches[settings.PDF_CACHE_ALIAS].aget(cache_key)
+
+
+def render_pdf_bytes(template_src, context_dict, cache_key=None) -> bytes | None:
+    """
+    Render a template to PDF bytes, serving from the PDF cache when a cache_key is given.
+    """
+    cache = caches[settings.PDF_CACHE_ALIAS]
+    if cache_key is not None:
+        pdf_bytes = cache.get(cache_key)
+        if pdf_bytes is not None:
+            return pdf_bytes
+
+    with timed('pdf_html'):
+        html = render_html(template_src, context_dict)
+    if cache_key is None:
+        # No version stamp available, fall back to the content hash of the HTML
+        cache_key = 'resume-pdf:' + hashlib.sha256(html.encode()).hexdigest()
+        pdf_bytes = cache.get(cache_key)
+        if pdf_bytes is not None:
+            return pdf_bytes
+
+    with timed('pdf_convert'):
+        pdf_bytes = html_to_pdf(html)
+    if pdf_bytes:
+        cache.set(cache_key, pdf_bytes)
+    return pdf_bytes
+
+
+def generate_pdf(template_src, context_dict, filename, request=None, cache_key=None):
     """
     Generate PDF from HTML template using xhtml2pdf only.
     """
-    template = get_template(template_src)
-    html = template.render(context_dict)
+    pdf_bytes = render_pdf_bytes(template_src, context_dict, cache_key=cache_key)
+    if not pdf_bytes:
+        # A 500 is never reused by caches, so a failed render can't be revalidated with a 304 later
+        return HttpResponse('PDF generation failed with xhtml2pdf.', content_type='text/plain', status=500)
+    return pdf_response(pdf_bytes, filename)
+
+
+_pdf_executor = None
+
+
+def pdf_executor():
+    """
+    Executor for xhtml2pdf in async views.
 
-    pdf_bytes = _try_generate_with_xhtml2pdf(html)
+    A process pool of PDF_RENDER_WORKERS when configured, otherwise None (the event loop's
+    default thread pool), which keeps the loop responsive but shares the GIL.
+    """
+    global _pdf_executor
+    if _pdf_executor is None and settings.PDF_RENDER_WORKERS > 0:
+        from .jobs import worker_init
+        _pdf_executor = ProcessPoolExecutor(max_workers=settings.PDF_RENDER_WORKERS, initializer=worker_init)
+    return _pdf_executor
+
+
+async def arender_pdf_bytes(template_src, context_dict, cache_key) -> bytes | None:
+    """
+    Async render_pdf_bytes for a context whose sections are already loaded.
+
+    Template rendering runs in a worker thread and xhtml2pdf in pdf_executor(), so neither
+    blocks the event loop.
+    """
+    cache = caches[settings.PDF_CACHE_ALIAS]
+    pdf_bytes = await cache.aget(cache_key)
+    if pdf_bytes is not None:
+        return pdf_bytes
+
+    with timed('pdf_html'):
+        html = await sync_to_async(render_html, thread_sensitive=False)(template_src, context_dict)
+    with timed('pdf_convert'):
+        pdf_bytes = await asyncio.get_running_loop().run_in_executor(pdf_executor(), html_to_pdf, html)
+    if pdf_bytes:
+        await cache.aset(cache_key, pdf_bytes)
+    return pdf_bytes
+
+
+async def agenerate_pdf(template_src, context_dict, filename, cache_key):
+    pdf_bytes = await arender_pdf_bytes(template_src, context_dict, cache_key)
     if not pdf_bytes:
-        return HttpResponse('PDF generation failed with xhtml2pdf.', content_type='text/plain')
+        return HttpResponse('PDF generation failed with xhtml2pdf.', content_type='text/plain', status=500)
+    return pdf_response(pdf_bytes, filename)
 
+
+def pdf_response(pdf_bytes, filename):
     response = HttpResponse(content_type='application/pdf')
     response['Content-Disposition'] = f'attachment; filename="{filename}"'
     response.write(pdf_bytes)
@@ -40,25 +173,9 @@ def generate_pdf(template_src, context_dict, filename, request=None):
 
 def link_callback(uri, rel):
     """
-    Convert HTML URIs to absolute system paths so xhtml2pdf can access those resources
+    Convert HTML URIs to absolute system paths so xhtml2pdf can access those resources.
+
+    Lookups are memoized per process by resumes.assets; unknown static/media URIs are
+    logged and counted instead of aborting the render.
     """
-    # Use short variable names
-    sUrl = settings.STATIC_URL      # Typically /static/
-    sRoot = settings.STATIC_ROOT    # Typically /home/userX/project_static/
-    mUrl = settings.MEDIA_URL       # Typically /media/
-    mRoot = settings.MEDIA_ROOT     # Typically /home/userX/project_static/media/
-
-    # Convert URIs to absolute system paths
-    if uri.startswith(mUrl):
-        path = os.path.join(mRoot, uri.replace(mUrl, ""))
-    elif uri.startswith(sUrl):
-        path = os.path.join(sRoot, uri.replace(sUrl, ""))
-    else:
-        return uri  # Handle absolute uri (ie: http://some.tld/foo.png)
-
-    # Make sure that file exists
-    if not os.path.isfile(path):
-        raise Exception(
-            'media URI must start with %s or %s' % (sUrl, mUrl)
-        )
-    return path
+    return asset_resolver.resolve(uri, rel)
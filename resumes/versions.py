@@ -0,0 +1,163 @@
+"""
+Resume version history.
+
+A version is the resume and its sections serialized to a JSON document. To keep history
+small, only every KEYFRAME_INTERVAL-th version stores the whole document; the others store
+a patch against the version before them, holding just the changed fields and rows.
+Reading a version replays the patches since the nearest keyframe.
+"""
+import datetime
+from django.db import transaction
+from .fragments import bump_section_versions
+from .models import SECTION_RELATIONS, Project, Resume, ResumeVersion
+from .signals import suppress_resume_touch
+from .skills import sync_project_technologies, sync_resume_skills
+
+KEYFRAME_INTERVAL = 10
+RESUME_EXCLUDE = {'id', 'user', 'created_at', 'updated_at'}
+SECTION_EXCLUDE = {'id', 'resume'}
+
+
+# Serialization
+
+def _fields(model, exclude):
+    return [f for f in model._meta.concrete_fields if f.name not in exclude]
+
+
+def _dump(obj, fields):
+    data = {}
+    for f in fields:
+        value = f.value_from_object(obj)
+        data[f.name] = value.isoformat() if isinstance(value, datetime.date) else value
+    return data
+
+
+def _load(fields, data):
+    return {f.name: f.to_python(data[f.name]) for f in fields if f.name in data}
+
+
+def section_model(relation):
+    return Resume._meta.get_field(relation).related_model
+
+
+def resume_document(resume):
+    """The resume and its sections as a JSON-serializable dict (sections must be loaded)"""
+    document = {'resume': _dump(resume, _fields(Resume, RESUME_EXCLUDE))}
+    for relation in SECTION_RELATIONS:
+        fields = _fields(section_model(relation), SECTION_EXCLUDE)
+        document[relation] = [_dump(row, fields) for row in getattr(resume, relation).all()]
+    return document
+
+
+# Patches
+
+def make_patch(old, new):
+    """
+    Patch turning `old` into `new`.
+
+    Dicts are patched key by key and lists index by index, so one edited field of one
+    row is stored as just that value. Anything else is replaced whole.
+    """
+    if isinstance(old, dict) and isinstance(new, dict):
+        changed = {key: make_patch(old[key], value) for key, value in new.items() if key in old and old[key] != value}
+        added = {key: {'value': value} for key, value in new.items() if key not in old}
+        patch = {'keys': {**changed, **added}}
+        removed = [key for key in old if key not in new]
+        if removed:
+            patch['removed'] = removed
+        return patch
+    if isinstance(old, list) and isinstance(new, list):
+        items = {
+            str(i): make_patch(old[i], value) if i < len(old) else {'value': value}
+            for i, value in enumerate(new) if i >= len(old) or old[i] != value
+        }
+        return {'items': items, 'length': len(new)}
+    return {'value': new}
+
+
+def apply_patch(old, patch):
+    if 'value' in patch:
+        return patch['value']
+    if 'keys' in patch:
+        result = {key: value for key, value in old.items() if key not in patch.get('removed', ())}
+        for key, sub in patch['keys'].items():
+            result[key] = apply_patch(old.get(key), sub)
+        return result
+    result = list(old[:patch['length']])
+    for index, sub in patch['items'].items():
+        index = int(index)
+        if index < len(result):
+            result[index] = apply_patch(result[index], sub)
+        else:
+            result.append(apply_patch(None, sub))
+    return result
+
+
+# Versions
+
+def version_document(version):
+    """Rebuild the full document of a version from the nearest keyframe at or before it"""
+    chain = list(
+        ResumeVersion.objects.filter(resume_id=version.resume_id, number__lte=version.number)
+        .filter(number__gte=version.number - version.number % KEYFRAME_INTERVAL)
+        .order_by('number')
+    )
+    document = None
+    for step in chain:
+        document = step.data if step.is_keyframe else apply_patch(document, step.data)
+    return document
+
+
+def snapshot_resume(resume, label=''):
+    """
+    Record the resume's current state as a new version.
+
+    Returns the new version, or the latest one if nothing changed since it was taken.
+    """
+    resume.prefetch_sections()
+    document = resume_document(resume)
+    with transaction.atomic():
+        latest = ResumeVersion.objects.select_for_update().filter(resume=resume).first()
+        number = latest.number + 1 if latest else 0
+        if number % KEYFRAME_INTERVAL == 0:
+            if latest and version_document(latest) == document:
+                return latest
+            return ResumeVersion.objects.create(
+                resume=resume, number=number, label=label, is_keyframe=True, data=document,
+            )
+        previous = version_document(latest)
+        if previous == document:
+            return latest
+        return ResumeVersion.objects.create(
+            resume=resume, number=number, label=label, data=make_patch(previous, document),
+        )
+
+
+def restore_version(version):
+    """
+    Overwrite a resume with the content of one of its versions.
+
+    The current state is snapshotted first, so a restore can itself be undone. Both happen
+    in one transaction with the resume row locked: a failed restore leaves no snapshot
+    behind, and no concurrent save lands between the two.
+    """
+    document = version_document(version)
+    with transaction.atomic(), suppress_resume_touch():
+        resume = Resume.objects.select_for_update().get(pk=version.resume_id)
+        snapshot_resume(resume, label=f'Before restoring v{version.number}')
+        for name, value in _load(_fields(Resume, RESUME_EXCLUDE), document['resume']).items():
+            setattr(resume, name, value)
+        resume.save()
+        sync_resume_skills(resume)
+
+        for relation in SECTION_RELATIONS:
+            model = section_model(relation)
+            fields = _fields(model, SECTION_EXCLUDE)
+            model.objects.filter(resume=resume).delete()
+            rows = model.objects.bulk_create([
+                model(resume=resume, **_load(fields, row)) for row in document[relation]
+            ])
+            if model is Project:
+                sync_project_technologies(*rows)
+        bump_section_versions(resume.pk, *SECTION_RELATIONS)
+    return resume
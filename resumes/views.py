@@ -1,14 +1,28 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.http import JsonResponse, HttpResponse
+from django.http import JsonResponse, HttpResponse, HttpResponseBadRequest, StreamingHttpResponse
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.handlers.asgi import ASGIRequest
 from django.template.loader import render_to_string
-from .models import Resume
+from django.urls import reverse
+from django.views.decorators.http import require_POST
+from asgiref.sync import sync_to_async
+from core.async_helpers import aget_object_or_404, aiterate, async_login_required
+from .models import Resume, RenderJob, ResumeVersion
 from .forms import (
     ResumeForm, EducationFormSet, WorkExperienceFormSet, 
     ExtracurricularActivityFormSet, CertificationFormSet, ProjectFormSet
 )
-from .utils import generate_pdf
+from .utils import PDF_TEMPLATE, agenerate_pdf, aget_cached_pdf, pdf_cache_key, pdf_filename, pdf_response
+from .jobs import enqueue_render
+from .export import export_executor, resume_zip_stream
+from .services import duplicate_resume, save_resume
+from .versions import restore_version, snapshot_resume
+from .search import search_resumes
+from .conditional import resume_condition, revalidate_privately
+from .fragments import fragment_context
 
 
 @login_required
@@ -30,24 +44,11 @@ def create_resume(request):
             cert_formset.is_valid() and
             project_formset.is_valid()
         ):
-            resume = form.save(commit=False)
-            resume.user = request.user
-            resume.save()
-            
-            education_formset.instance = resume
-            education_formset.save()
-            
-            work_formset.instance = resume
-            work_formset.save()
-            
-            activity_formset.instance = resume
-            activity_formset.save()
-            
-            cert_formset.instance = resume
-            cert_formset.save()
-
-            project_formset.instance = resume
-            project_formset.save()
+            resume = save_resume(
+                form,
+                [education_formset, work_formset, activity_formset, cert_formset, project_formset],
+                user=request.user,
+            )
             
             messages.success(request, 'Resume created successfully!')
             return redirect('resumes:detail', resume_id=resume.id)
@@ -92,12 +93,7 @@ def edit_resume(request, resume_id):
             cert_formset.is_valid() and
             project_formset.is_valid()
         ):
-            form.save()
-            education_formset.save()
-            work_formset.save()
-            activity_formset.save()
-            cert_formset.save()
-            project_formset.save()
+            save_resume(form, [education_formset, work_formset, activity_formset, cert_formset, project_formset])
             
             messages.success(request, 'Resume updated successfully!')
             return redirect('resumes:detail', resume_id=resume.id)
@@ -122,12 +118,69 @@ def edit_resume(request, resume_id):
     return render(request, 'resumes/create_edit.html', context)
 
 
-@login_required
-def resume_detail(request, resume_id):
+async def _render_resume_page(request, template_name, resume):
+    """
+    Render a page whose sections are cached fragments.
+
+    Sections are not prefetched: a fragment that misses the cache loads its own rows while
+    rendering, so the template renders in a thread rather than on the event loop.
+    """
+    def render_page():
+        context = {'resume': resume, **fragment_context(resume.pk)}
+        return render(request, template_name, context)
+    return await sync_to_async(render_page)()
+
+
+@async_login_required
+async def resume_detail(request, resume_id):
     """View resume details"""
+    resume = await aget_object_or_404(
+        Resume.objects.prefetch_related('resume_skills'), id=resume_id, user=request.user,
+    )
+    return await _render_resume_page(request, 'resumes/detail.html', resume)
+
+
+@login_required
+@require_POST
+def clone_resume(request, resume_id):
+    """Copy a resume with all its sections and open the copy for editing"""
     resume = get_object_or_404(Resume, id=resume_id, user=request.user)
-    context = {'resume': resume}
-    return render(request, 'resumes/detail.html', context)
+    clone = duplicate_resume(resume, user=request.user)
+    messages.success(request, 'Resume duplicated. You are now editing the copy.')
+    return redirect('resumes:edit', resume_id=clone.id)
+
+
+@login_required
+def resume_versions(request, resume_id):
+    """List saved versions of a resume; POST saves the current state as a new version"""
+    resume = get_object_or_404(Resume, id=resume_id, user=request.user)
+    
+    if request.method == 'POST':
+        latest = resume.versions.first()
+        version = snapshot_resume(resume, label=request.POST.get('label', '').strip()[:100])
+        if version == latest:
+            messages.info(request, 'Nothing changed since the last saved version.')
+        else:
+            messages.success(request, f'Saved version {version.number}.')
+        return redirect('resumes:versions', resume_id=resume.id)
+    
+    context = {
+        'resume': resume,
+        'versions': resume.versions.defer('data'),
+    }
+    return render(request, 'resumes/versions.html', context)
+
+
+@login_required
+@require_POST
+def restore_resume_version(request, resume_id, number):
+    """Restore a resume to one of its saved versions"""
+    version = get_object_or_404(
+        ResumeVersion.objects.select_related('resume'), resume_id=resume_id, resume__user=request.user, number=number,
+    )
+    restore_version(version)
+    messages.success(request, f'Restored version {version.number}.')
+    return redirect('resumes:detail', resume_id=resume_id)
 
 
 @login_required
@@ -144,25 +197,117 @@ def delete_resume(request, resume_id):
     return render(request, 'resumes/delete.html', context)
 
 
-@login_required
-def preview_resume(request, resume_id):
+@async_login_required
+@resume_condition('preview')
+async def preview_resume(request, resume_id):
     """Preview resume in PDF format"""
-    resume = get_object_or_404(Resume, id=resume_id, user=request.user)
-    context = {'resume': resume}
-    return render(request, 'resumes/preview.html', context)
+    resume = await aget_object_or_404(
+        Resume.objects.prefetch_related('resume_skills'), id=resume_id, user=request.user,
+    )
+    return revalidate_privately(await _render_resume_page(request, 'resumes/preview.html', resume))
 
 
-@login_required
-def download_pdf(request, resume_id):
+@async_login_required
+@resume_condition('pdf')
+async def download_pdf(request, resume_id):
     """Download resume as PDF"""
-    resume = get_object_or_404(Resume, id=resume_id, user=request.user)
+    resume = await aget_object_or_404(Resume.objects.all(), id=resume_id, user=request.user)
+    filename = pdf_filename(resume)
+    
+    # Serve from the PDF cache if this version was rendered before
+    cache_key = pdf_cache_key(PDF_TEMPLATE, resume)
+    pdf_bytes = await aget_cached_pdf(cache_key)
+    if pdf_bytes is not None:
+        return revalidate_privately(pdf_response(pdf_bytes, filename))
     
+    # Only load the sections when we actually have to render
     context = {
-        'resume': resume,
+        'resume': await sync_to_async(resume.prefetch_sections)(),
     }
-    
-    # Generate filename
-    filename = f"{resume.full_name.replace(' ', '_')}_Resume.pdf"
-    
-    # Generate and return PDF
-    return generate_pdf('resumes/pdf_template.html', context, filename, request=request)
+    return revalidate_privately(await agenerate_pdf(PDF_TEMPLATE, context, filename, cache_key=cache_key))
+
+
+@login_required
+def bulk_export(request):
+    """Stream a ZIP archive of PDFs for the resumes listed in `ids`"""
+    params = request.POST if request.method == 'POST' else request.GET
+    ids = params.getlist('ids')
+    if not ids:
+        return HttpResponseBadRequest('No resumes selected.')
+
+    # Staff (e.g. career-fair operators) may export any resume, everyone else only their own
+    resumes = Resume.objects.all() if request.user.is_staff else Resume.objects.filter(user=request.user)
+    try:
+        resumes = resumes.filter(id__in=ids).with_sections().iterator(chunk_size=50)
+    except ValidationError:
+        return HttpResponseBadRequest('Invalid resume id.')
+
+    stream = resume_zip_stream(resumes, workers=settings.BULK_EXPORT_WORKERS, executor=export_executor())
+    if isinstance(request, ASGIRequest):
+        stream = aiterate(stream)
+    response = StreamingHttpResponse(stream, content_type='application/zip')
+    response['Content-Disposition'] = 'attachment; filename="resumes.zip"'
+    return response
+
+
+@login_required
+def search(request):
+    """Ranked full-text search over resumes (staff search everything, others their own)"""
+    query = request.GET.get('q', '').strip()
+    try:
+        limit = min(max(int(request.GET.get('limit', 20)), 1), 100)
+    except ValueError:
+        limit = 20
+    user = None if request.user.is_staff else request.user
+    results = [
+        {
+            'id': str(resume.id),
+            'title': resume.title,
+            'full_name': resume.full_name,
+            'score': round(score, 4),
+            'url': reverse('resumes:detail', args=[resume.id]),
+        }
+        for resume, score in search_resumes(query, limit=limit, user=user)
+    ]
+    return JsonResponse({'query': query, 'results': results})
+
+
+def _render_job_payload(request, job):
+    payload = {
+        'id': str(job.id),
+        'status': job.status,
+        'status_url': request.build_absolute_uri(reverse('resumes:render_job_status', args=[job.id])),
+    }
+    if job.status == RenderJob.STATUS_DONE:
+        payload['download_url'] = request.build_absolute_uri(reverse('resumes:render_job_download', args=[job.id]))
+    elif job.status in (RenderJob.STATUS_FAILED, RenderJob.STATUS_SUPERSEDED):
+        payload['error'] = job.error
+    return payload
+
+
+@login_required
+@require_POST
+def render_pdf(request, resume_id):
+    """Queue a background PDF render and return its status URL"""
+    resume = get_object_or_404(Resume, id=resume_id, user=request.user)
+    job = enqueue_render(resume)
+    status = 200 if job.status == RenderJob.STATUS_DONE else 202
+    response = JsonResponse(_render_job_payload(request, job), status=status)
+    response['Location'] = reverse('resumes:render_job_status', args=[job.id])
+    return response
+
+
+@login_required
+def render_job_status(request, job_id):
+    """Report the status of a queued PDF render"""
+    job = get_object_or_404(RenderJob.objects.defer('pdf'), id=job_id, resume__user=request.user)
+    return JsonResponse(_render_job_payload(request, job))
+
+
+@login_required
+def render_job_download(request, job_id):
+    """Serve the PDF produced by a finished render job"""
+    job = get_object_or_404(RenderJob.objects.select_related('resume'), id=job_id, resume__user=request.user)
+    if job.status != RenderJob.STATUS_DONE:
+        return JsonResponse(_render_job_payload(request, job), status=202)
+    return pdf_response(bytes(job.pdf), pdf_filename(job.resume))
@@ -51,6 +51,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.middleware.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -64,7 +65,8 @@ ROOT_URLCONF = 'rojgarpatra.urls'
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        # DjangoTemplates with render timing for core.metrics
+        'BACKEND': 'core.metrics.InstrumentedDjangoTemplates',
         'DIRS': [BASE_DIR / 'templates'],
         'APP_DIRS': True,
         'OPTIONS': {
@@ -84,12 +86,42 @@ WSGI_APPLICATION = 'rojgarpatra.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+# DB_ENGINE picks sqlite (default) or postgresql (needs psycopg). Connections are reused for
+# DB_CONN_MAX_AGE seconds (default 60) and health-checked before reuse. Under ASGI Django
+# cannot reuse connections across requests, so rojgarpatra/asgi.py defaults it to 0.
+DB_ENGINE = os.environ.get('DB_ENGINE', 'sqlite')
+_db_conn_max_age = int(os.environ.get('DB_CONN_MAX_AGE') or 60)
+
+if DB_ENGINE == 'postgresql':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.environ.get('DB_NAME') or 'rojgarpatra',
+            'USER': os.environ.get('DB_USER', ''),
+            'PASSWORD': os.environ.get('DB_PASSWORD', ''),
+            'HOST': os.environ.get('DB_HOST', ''),
+            'PORT': os.environ.get('DB_PORT', ''),
+            'CONN_MAX_AGE': _db_conn_max_age,
+            'CONN_HEALTH_CHECKS': True,
+        }
     }
-}
+else:
+    DATABASES = {
+        'default': {
+            # django.db.backends.sqlite3 with BEGIN IMMEDIATE transactions (see core.sqlite)
+            'ENGINE': 'core.sqlite',
+            'NAME': os.environ.get('DB_NAME') or BASE_DIR / 'db.sqlite3',
+            'CONN_MAX_AGE': _db_conn_max_age,
+            'CONN_HEALTH_CHECKS': True,
+        }
+    }
+
+# Milliseconds a SQLite writer waits for the lock before failing with "database is locked".
+# New SQLite connections also switch to WAL and synchronous=NORMAL (see core.db).
+SQLITE_BUSY_TIMEOUT = int(os.environ.get('SQLITE_BUSY_TIMEOUT', '5000'))
+
+# Covering indexes (Index.include) only take effect on PostgreSQL; SQLite just builds the key columns
+SILENCED_SYSTEM_CHECKS = ['models.W040']
 
 
 # Password validation
@@ -132,6 +164,22 @@ STATICFILES_DIRS = [
     BASE_DIR / 'static',
 ]
 
+# collectstatic writes content-hashed copies plus .gz/.br variants (see core.staticfiles).
+# static/css/app.css is generated from the templates by `manage.py build_css`.
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'core.staticfiles.CompressedManifestStaticFilesStorage',
+    },
+}
+
+# Serve STATIC_ROOT from Django itself, for deployments without a web server in front.
+# Hashed files are sent with Cache-Control max-age=STATIC_MAX_AGE, immutable.
+SERVE_STATIC = os.environ.get('SERVE_STATIC', 'False').lower() == 'true'
+STATIC_MAX_AGE = int(os.environ.get('STATIC_MAX_AGE', str(365 * 24 * 60 * 60)))
+
 # Media files
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
@@ -142,7 +190,7 @@ MEDIA_ROOT = BASE_DIR / 'media'
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 # Email settings
-EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
+EMAIL_BACKEND = os.environ.get('EMAIL_BACKEND', 'django.core.mail.backends.smtp.EmailBackend')
 EMAIL_HOST = 'smtp.gmail.com'
 EMAIL_PORT = 587
 EMAIL_USE_TLS = True
@@ -150,12 +198,48 @@ EMAIL_HOST_USER = os.environ.get('EMAIL_HOST_USER', '')
 EMAIL_HOST_PASSWORD = os.environ.get('EMAIL_HOST_PASSWORD', '')
 DEFAULT_FROM_EMAIL = os.environ.get('DEFAULT_FROM_EMAIL', 'noreply@rojgarpatra.com')
 
+# Outbound email queue (delivered by `manage.py send_emails`). Failed messages are retried
+# after EMAIL_OUTBOX_RETRY_DELAY seconds, doubling per attempt up to EMAIL_OUTBOX_MAX_DELAY.
+# A message still marked sending EMAIL_OUTBOX_STALE_AFTER seconds after it was claimed is
+# assumed to belong to a crashed sender and may be queued again.
+EMAIL_OUTBOX_MAX_ATTEMPTS = int(os.environ.get('EMAIL_OUTBOX_MAX_ATTEMPTS', '5'))
+EMAIL_OUTBOX_RETRY_DELAY = int(os.environ.get('EMAIL_OUTBOX_RETRY_DELAY', '60'))
+EMAIL_OUTBOX_MAX_DELAY = int(os.environ.get('EMAIL_OUTBOX_MAX_DELAY', '3600'))
+EMAIL_OUTBOX_STALE_AFTER = int(os.environ.get('EMAIL_OUTBOX_STALE_AFTER', '300'))
+
 # Login/Logout URLs
 LOGIN_URL = '/accounts/login/'
 LOGIN_REDIRECT_URL = '/dashboard/'
 LOGOUT_REDIRECT_URL = '/'
 
+# Sessions
+# SESSION_BACKEND picks where session data lives:
+# - db: the django_session table, read on every authenticated request
+# - cached_db (default): the same table behind the 'sessions' cache, so requests read the
+#   cache and only logins and session changes write through to the table
+# - signed_cookies: in a cookie signed with SECRET_KEY, with no server-side storage; a
+#   session cannot be revoked before it expires, even by logging out elsewhere
+# SESSION_CACHE_BACKEND is file (SESSION_CACHE_DIR, default) or locmem. Use locmem only with
+# a single server process, since a logout in one process does not evict the others' copies.
+_session_engines = {
+    'db': 'django.contrib.sessions.backends.db',
+    'cached_db': 'django.contrib.sessions.backends.cached_db',
+    'signed_cookies': 'django.contrib.sessions.backends.signed_cookies',
+}
+SESSION_ENGINE = _session_engines[os.environ.get('SESSION_BACKEND', 'cached_db')]
+SESSION_CACHE_ALIAS = 'sessions'
+_session_cache_backends = {
+    'locmem': ('django.core.cache.backends.locmem.LocMemCache', 'sessions'),
+    'file': (
+        'django.core.cache.backends.filebased.FileBasedCache',
+        os.environ.get('SESSION_CACHE_DIR', str(BASE_DIR / 'cache' / 'sessions')),
+    ),
+}
+_session_cache_backend, _session_cache_location = _session_cache_backends[os.environ.get('SESSION_CACHE_BACKEND', 'file')]
+
 # Messages framework
+# Flash messages travel in a cookie, so a redirect with a message does not write the session
+MESSAGE_STORAGE = 'django.contrib.messages.storage.cookie.CookieStorage'
 MESSAGE_TAGS = {
     messages.DEBUG: 'debug',
     messages.INFO: 'info',
@@ -173,3 +257,92 @@ AUTH_USER_MODEL = 'accounts.User'
 
 # PDF settings for xhtml2pdf
 STATIC_PDF_ROOT = BASE_DIR / 'static'
+
+# Identifies the templates resumes are rendered with. It is mixed into resume ETags and the
+# PDF and section fragment cache keys, so a deploy never serves pages rendered by the
+# previous one. Empty derives it from the template files; set it (e.g. to the deployed
+# commit) to also cover changes in the rendering code.
+RENDER_VERSION = os.environ.get('RENDER_VERSION', '')
+
+# Render processes shared by the bulk resume exports of each web process
+BULK_EXPORT_WORKERS = int(os.environ.get('BULK_EXPORT_WORKERS', '2'))
+
+# Per-view request metrics, exposed to staff at /metrics/ in Prometheus format. Lower
+# METRICS_SAMPLE_RATE (0-1) to record only a fraction of requests under heavy load.
+METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'True').lower() == 'true'
+METRICS_SAMPLE_RATE = float(os.environ.get('METRICS_SAMPLE_RATE', '1.0'))
+
+# Processes used to render PDFs for the async download view (0 renders in threads instead)
+PDF_RENDER_WORKERS = int(os.environ.get('PDF_RENDER_WORKERS', '0'))
+
+# Keep the resume search index up to date as resumes are saved (turn off for bulk loads
+# and run `manage.py rebuild_search_index` afterwards)
+SEARCH_INDEX_ON_SAVE = os.environ.get('SEARCH_INDEX_ON_SAVE', 'True').lower() == 'true'
+
+# Caches
+# The 'fragments' cache holds rendered resume sections for the detail and preview pages.
+# FRAGMENT_CACHE_BACKEND picks file (FRAGMENT_CACHE_DIR, default), db (run `manage.py
+# createcachetable` first) or locmem. The section version stamps live in the same cache, so
+# it must be shared by every server process for an edit to invalidate the fragment
+# everywhere; use locmem only with a single process.
+FRAGMENT_CACHE_ALIAS = 'fragments'
+FRAGMENT_CACHE_TIMEOUT = int(os.environ.get('FRAGMENT_CACHE_TIMEOUT', '86400'))
+_fragment_backends = {
+    'locmem': ('django.core.cache.backends.locmem.LocMemCache', 'resume-fragments'),
+    'file': (
+        'django.core.cache.backends.filebased.FileBasedCache',
+        os.environ.get('FRAGMENT_CACHE_DIR') or str(BASE_DIR / 'cache' / 'fragments'),
+    ),
+    'db': ('django.core.cache.backends.db.DatabaseCache', 'resume_fragment_cache'),
+}
+_fragment_backend, _fragment_location = _fragment_backends[os.environ.get('FRAGMENT_CACHE_BACKEND', 'file')]
+
+# The 'pages' cache holds the home, privacy and terms pages as rendered for anonymous
+# visitors, once per process (see core.pages). Raise PAGE_MAX_AGE to let browsers and
+# CDNs reuse them for that many seconds without revalidating.
+PAGE_CACHE_ALIAS = 'pages'
+PAGE_MAX_AGE = int(os.environ.get('PAGE_MAX_AGE', '0'))
+# Where `manage.py prerender_pages` writes those pages for the web server
+PRERENDER_ROOT = os.environ.get('PRERENDER_ROOT') or BASE_DIR / 'prerendered'
+
+# The 'pdf' cache holds rendered resume PDFs. LocMemCache evicts least-recently-used
+# entries once PDF_CACHE_MAX_ENTRIES is reached; set PDF_CACHE_DIR to share the cache
+# between worker processes on disk instead (culled once it grows past the same limit).
+PDF_CACHE_ALIAS = 'pdf'
+_pdf_cache_dir = os.environ.get('PDF_CACHE_DIR', '')
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    PDF_CACHE_ALIAS: {
+        'BACKEND': (
+            'django.core.cache.backends.filebased.FileBasedCache' if _pdf_cache_dir
+            else 'django.core.cache.backends.locmem.LocMemCache'
+        ),
+        'LOCATION': _pdf_cache_dir or 'resume-pdfs',
+        'TIMEOUT': None,
+        'OPTIONS': {
+            'MAX_ENTRIES': int(os.environ.get('PDF_CACHE_MAX_ENTRIES', '500')),
+        },
+    },
+    SESSION_CACHE_ALIAS: {
+        'BACKEND': _session_cache_backend,
+        'LOCATION': _session_cache_location,
+        'OPTIONS': {
+            'MAX_ENTRIES': int(os.environ.get('SESSION_CACHE_MAX_ENTRIES', '10000')),
+        },
+    },
+    PAGE_CACHE_ALIAS: {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'marketing-pages',
+        'TIMEOUT': None,
+    },
+    FRAGMENT_CACHE_ALIAS: {
+        'BACKEND': _fragment_backend,
+        'LOCATION': _fragment_location,
+        'TIMEOUT': FRAGMENT_CACHE_TIMEOUT,
+        'OPTIONS': {
+            'MAX_ENTRIES': int(os.environ.get('FRAGMENT_CACHE_MAX_ENTRIES', '5000')),
+        },
+    },
+}
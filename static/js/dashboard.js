@@ -78,6 +78,8 @@ function showNotification(message, type = "info") {
   }, 3000)
 }
 
+/* tw: bg-green-100 text-green-800 border-green-300 bg-red-100 text-red-800 border-red-300
+       bg-yellow-100 text-yellow-800 border-yellow-300 bg-blue-100 text-blue-800 border-blue-300 */
 function getNotificationClass(type) {
   switch (type) {
     case "success":